@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmarks for the slide layouts and the .docx report pipeline.
+
+Each case synthesizes inputs of increasing size (table rows, Gantt tasks
+by month index or by date, bullets, metric cards, line chart samples,
+slides per deck, slides read from a JSON spec file, report paragraphs /
+table rows),
+renders them, and records wall time, peak Python memory (tracemalloc),
+peak RSS growth, shape count and output bytes. Every measurement runs in
+a fresh process, so sizes don't share caches or heap.
+
+The "scale" column is the growth exponent between consecutive sizes
+(time ~ n^k): around 1 is linear, and 2 means the case has gone quadratic.
+Exponents above 1.3 are flagged.
+
+Usage:
+    python3 benchmark.py                           # every case, full sizes
+    python3 benchmark.py --quick                   # small sizes only
+    python3 benchmark.py --case table gantt --backend xml
+    python3 benchmark.py --save benchmarks/baseline.json
+    python3 benchmark.py --compare benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import io
+import json
+import math
+import multiprocessing
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+SUPERLINEAR_EXPONENT = 1.3
+
+# Regressions smaller than these are treated as noise in --compare
+MIN_SECONDS_DELTA = 0.01
+MIN_MB_DELTA = 1.0
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SPEC SYNTHESIS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _table_deck(n):
+    return {"slides": [{
+        "layout": "table",
+        "title": f"Table with {n} rows",
+        "headers": ["Deliverable", "Owner", "Status", "Due Date"],
+        "rows": [[f"Deliverable {i}", f"Team {i % 7}",
+                  ("Complete", "In Progress", "Planned")[i % 3],
+                  f"{1 + i % 28} May 2026"] for i in range(n)],
+    }]}
+
+
+def _gantt_deck(n):
+    phases = ["Development", "Integration", "Sustainment", "Deliverables"]
+    return {"slides": [{
+        "layout": "gantt",
+        "title": f"Roadmap with {n} tasks",
+        "quarters": ["Q1 2026", "Q2 2026", "Q3 2026"],
+        "months": ["Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug"],
+        "phases": phases,
+        "tasks": [(phases[i % 4], f"Task {i}", i % 7, min(6, i % 7 + i % 3),
+                   i % 11 == 0, f"{1 + i % 28} Jun 2026" if i % 2 else None)
+                  for i in range(n)],
+    }]}
+
+
+def _gantt_dates_deck(n):
+    from datetime import date, timedelta
+    phases = ["Development", "Integration", "Sustainment", "Deliverables"]
+    start = date(2026, 1, 5)
+    tasks = []
+    for i in range(n):
+        begin = start + timedelta(days=(i * 7) % 900)
+        end = begin + timedelta(days=10 + (i % 5) * 30)
+        tasks.append((phases[i % 4], f"Task {i}", begin, end, i % 11 == 0,
+                      end if i % 2 else None))
+    return {"slides": [{
+        "layout": "gantt",
+        "title": f"Portfolio with {n} dated tasks",
+        "phases": phases,
+        "tasks": tasks,
+    }]}
+
+
+def _gantt_chart_deck(n):
+    deck = _gantt_dates_deck(n)
+    deck["slides"][0]["mode"] = "chart"
+    return deck
+
+
+def _content_deck(n):
+    return {"slides": [{
+        "layout": "content",
+        "title": f"{n} bullets",
+        "bullets": [f"Bullet point number {i} with some text" for i in range(n)],
+    }]}
+
+
+def _content_native_deck(n):
+    deck = _content_deck(n)
+    deck["slides"][0]["mode"] = "native"
+    return deck
+
+
+def _metrics_deck(n):
+    return {"slides": [{
+        "layout": "metrics",
+        "title": f"{n} metrics",
+        "metrics": [{"label": f"Metric {i}", "value": f"{i}%",
+                     "detail": "+1% QoQ"} for i in range(n)],
+    }]}
+
+
+def _line_deck(n):
+    """One line chart of n per-minute samples."""
+    start = datetime(2026, 1, 1)
+    return {"slides": [{
+        "layout": "line",
+        "title": f"{n} points",
+        "x": [(start + timedelta(minutes=i)).isoformat() for i in range(n)],
+        "series": [{"name": "P95", "values": [
+            round(1 + math.sin(i / 500) + (i * 7919 % 101) / 200, 3)
+            for i in range(n)]}],
+    }]}
+
+
+def _slides_deck(n):
+    from generate_deck import DECK
+    example = DECK["slides"]
+    return {"slides": [dict(example[i % len(example)]) for i in range(n)]}
+
+
+# name -> (kind, builder, full sizes, quick sizes)
+CASES = {
+    "table":    ("deck", _table_deck,   (10, 100, 1000, 10000), (10, 100, 500)),
+    "gantt":    ("deck", _gantt_deck,   (10, 100, 1000, 5000), (10, 100, 500)),
+    "gantt_dates": ("deck", _gantt_dates_deck, (10, 100, 1000, 5000),
+                    (10, 100, 500)),
+    "gantt_chart": ("deck", _gantt_chart_deck, (10, 100, 1000, 5000),
+                    (10, 100, 500)),
+    "content":  ("deck", _content_deck, (10, 100, 1000, 5000), (10, 100, 500)),
+    "content_native": ("deck", _content_native_deck, (10, 100, 1000, 5000),
+                       (10, 100, 500)),
+    "metrics":  ("deck", _metrics_deck, (1, 10, 100, 1000), (1, 10, 100)),
+    "line":     ("deck", _line_deck, (1000, 10000, 100000, 525600),
+                 (1000, 10000, 100000)),
+    "slides":   ("deck", _slides_deck,  (1, 10, 100, 1000, 5000), (1, 10, 100)),
+    "spec_json": ("spec", _slides_deck, (1, 10, 100, 1000, 5000), (1, 10, 100)),
+    "report_paragraphs": ("report", None, (10, 100, 1000, 10000), (10, 100, 500)),
+    "report_table":      ("report", None, (10, 100, 1000, 5000), (10, 100, 500)),
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MEASUREMENT (runs in a fresh child process)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _prepare_deck(case, n, backend):
+    import generate_deck
+
+    generate_deck.render_deck({"slides": []})   # warm imports and template
+    deck = CASES[case][1](n)
+
+    def run():
+        prs = generate_deck.render_deck(deck, "dark", backend=backend)
+        buf = io.BytesIO()
+        prs.save(buf)
+        shapes = sum(len(slide.shapes) for slide in prs.slides)
+        return shapes, buf.tell()
+    return run
+
+
+def _prepare_spec(case, n, backend, workdir):
+    """Write the deck as a JSON spec; the timing covers loading it too."""
+    import generate_deck
+    from utils.deck_spec import load_spec
+
+    generate_deck.render_deck({"slides": []})   # warm imports and template
+    spec = Path(workdir) / "spec.json"
+    spec.write_text(json.dumps(CASES[case][1](n)), encoding="utf-8")
+
+    def run():
+        deck = load_spec(spec)
+        deck["slides"] = generate_deck.validated(deck["slides"])
+        prs = generate_deck.render_deck(deck, "dark", backend=backend)
+        buf = io.BytesIO()
+        prs.save(buf)
+        shapes = sum(len(slide.shapes) for slide in prs.slides)
+        return shapes, buf.tell()
+    return run
+
+
+def _prepare_report(case, n, workdir):
+    """Build an n-paragraph (or n-row table) template outside the timing."""
+    from docx import Document
+    import generate_report
+
+    doc = Document()
+    if case == "report_paragraphs":
+        for i in range(n):
+            doc.add_paragraph(f"Paragraph {i} of the template")
+        paragraph_updates = {i: f"Updated paragraph {i}" for i in range(n)}
+        table_updates = {}
+    else:
+        doc.add_table(rows=n, cols=4)
+        paragraph_updates = {}
+        table_updates = {(0, r): {0: f"Row {r}", 3: "Complete"}
+                         for r in range(n)}
+    template = Path(workdir) / "template.docx"
+    output = Path(workdir) / "output.docx"
+    doc.save(str(template))
+
+    def run():
+        generate_report.generate(template, output, paragraph_updates,
+                                 table_updates)
+        out = Document(str(output))
+        elements = len(out.paragraphs) + sum(
+            len(row.cells) for table in out.tables for row in table.rows)
+        return elements, output.stat().st_size
+    return run
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def measure(case, n, backend="pptx", repeat=1) -> dict:
+    """Time one case at size *n*; call in a fresh process (see run_case)."""
+    import contextlib
+    import os
+    import tracemalloc
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        if CASES[case][0] == "deck":
+            run = _prepare_deck(case, n, backend)
+        elif CASES[case][0] == "spec":
+            run = _prepare_spec(case, n, backend, workdir)
+        else:
+            run = _prepare_report(case, n, workdir)
+
+        rss_before = _peak_rss_mb()
+        best = math.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            shapes, nbytes = run()
+            best = min(best, time.perf_counter() - start)
+        rss_growth = _peak_rss_mb() - rss_before
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "case": case, "n": n,
+        "backend": backend if CASES[case][0] != "report" else "docx",
+        "seconds": round(best, 4),
+        "peak_mb": round(peak / 1e6, 2),
+        "rss_mb": round(max(0.0, rss_growth), 1),
+        "shapes": shapes,
+        "bytes": nbytes,
+    }
+
+
+def run_case(case, sizes, backend="pptx", repeat=1, max_seconds=60.0):
+    """Measure *case* at each size, each in its own process.
+
+    Stops early once a size takes longer than *max_seconds*, since the next
+    size up would only take longer.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    for n in sizes:
+        with ctx.Pool(1) as pool:
+            result = pool.apply(measure, (case, n, backend, repeat))
+        yield result
+        if result["seconds"] > max_seconds:
+            skipped = [s for s in sizes if s > n]
+            if skipped:
+                print(f"{'':>10}{case}: stopping after n={n} "
+                      f"({result['seconds']:.1f}s); skipped {skipped}")
+            return
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# REPORTING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _exponent(prev, cur):
+    """Growth exponent k for time ~ n^k between two measurements."""
+    if prev is None or prev["seconds"] <= 0 or cur["n"] == prev["n"]:
+        return None
+    return (math.log(max(cur["seconds"], 1e-6) / prev["seconds"])
+            / math.log(cur["n"] / prev["n"]))
+
+
+def print_header():
+    print(f"{'Case':<18} {'Backend':<7} {'n':>6} {'Seconds':>9} {'Scale':>7} "
+          f"{'PyPeak':>8} {'RSS+':>7} {'Shapes':>8} {'Bytes':>11}")
+    print("-" * 92)
+
+
+def print_row(r, prev=None):
+    k = _exponent(prev, r)
+    scale = "" if k is None else f"n^{k:.2f}"
+    flag = "  <- superlinear" if k is not None and k > SUPERLINEAR_EXPONENT else ""
+    print(f"{r['case']:<18} {r['backend']:<7} {r['n']:>6} {r['seconds']:>9.4f} "
+          f"{scale:>7} {r['peak_mb']:>6.1f}MB {r['rss_mb']:>5.1f}MB "
+          f"{r['shapes']:>8} {r['bytes']:>11,}{flag}")
+
+
+def compare(results, baseline, tolerance) -> list:
+    """Return regression messages for *results* against *baseline* results."""
+    base = {(b["case"], b["n"], b["backend"]): b for b in baseline}
+    regressions = []
+    for r in results:
+        b = base.get((r["case"], r["n"], r["backend"]))
+        if b is None:
+            continue
+        label = f"{r['case']} n={r['n']} ({r['backend']})"
+        if (r["seconds"] > b["seconds"] * (1 + tolerance)
+                and r["seconds"] - b["seconds"] > MIN_SECONDS_DELTA):
+            regressions.append(f"{label}: {b['seconds']:.4f}s -> "
+                               f"{r['seconds']:.4f}s")
+        if (r["peak_mb"] > b["peak_mb"] * (1 + tolerance)
+                and r["peak_mb"] - b["peak_mb"] > MIN_MB_DELTA):
+            regressions.append(f"{label}: peak {b['peak_mb']:.1f}MB -> "
+                               f"{r['peak_mb']:.1f}MB")
+        if r["shapes"] != b["shapes"]:
+            print(f"note: {label}: shape count {b['shapes']} -> {r['shapes']}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Scaling benchmarks for slide layouts and report generation"
+    )
+    parser.add_argument(
+        "--case", nargs="+", choices=sorted(CASES), default=None,
+        help="Cases to run (default: all)",
+    )
+    parser.add_argument(
+        "--backend", choices=("pptx", "xml"), default="pptx",
+        help="Slide backend for deck cases (default: pptx)",
+    )
+    parser.add_argument(
+        "--quick", action="store_true",
+        help="Small sizes only, for a fast check",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1,
+        help="Timed runs per size; the fastest is kept (default: 1)",
+    )
+    parser.add_argument(
+        "--max-seconds", type=float, default=60.0,
+        help="Skip a case's larger sizes once one takes longer than this "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--save", type=Path, default=None,
+        help="Write results as JSON (use as a baseline for --compare)",
+    )
+    parser.add_argument(
+        "--compare", type=Path, default=None,
+        help="Baseline JSON to compare against; exits 1 on regressions",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Allowed slowdown / memory growth vs the baseline "
+             "(default: %(default)s = 25%%)",
+    )
+    args = parser.parse_args()
+
+    results = []
+    print_header()
+    for case in args.case or CASES:
+        kind, _, full, quick = CASES[case]
+        prev = None
+        for r in run_case(case, quick if args.quick else full, args.backend,
+                          args.repeat, args.max_seconds):
+            print_row(r, prev)
+            results.append(r)
+            prev = r
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()),
+                              args.tolerance)
+        print(f"\nCompared with {args.compare} "
+              f"(tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  REGRESSION {line}")
+        if not regressions:
+            print("  no regressions")
+        sys.exit(1 if regressions else 0)
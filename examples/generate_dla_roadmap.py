@@ -8,14 +8,9 @@ Usage:
     python3 dla_ascend/generate_dla_roadmap.py --theme dark
 """
 import argparse
+import sys
 from pathlib import Path
 
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
-from pptx.enum.text import PP_ALIGN
-
 # ---------------------------------------------------------------------------
 # Layout
 # ---------------------------------------------------------------------------
@@ -23,13 +18,12 @@ SLIDE_WIDTH = 10
 TABLE_LEFT = 0.5
 TABLE_TOP = 1.0
 PHASE_COL_WIDTH = 2.0
-MONTH_COLS = 12
 CHART_WIDTH = 7.0
-MONTH_WIDTH = CHART_WIDTH / MONTH_COLS
 CHART_LEFT = TABLE_LEFT + PHASE_COL_WIDTH
 HEADER_HEIGHT = 0.35
 ROW_HEIGHT = 0.3
 BAR_HEIGHT = 0.22
+BAR_PADDING = 0.02
 
 # ---------------------------------------------------------------------------
 # Timeline
@@ -43,43 +37,44 @@ MONTHS = ["APR", "MAY", "JUN", "JUL", "AUG", "SEP",
 # ---------------------------------------------------------------------------
 THEMES = {
     "dark": {
-        "slide_bg": RGBColor(15, 23, 42),
-        "header_bg": RGBColor(30, 41, 59),
-        "header_text": RGBColor(255, 255, 255),
-        "phase_bg": RGBColor(30, 41, 59),
-        "phase_text": RGBColor(255, 255, 255),
-        "title_text": RGBColor(226, 232, 240),
-        "row_even": RGBColor(30, 41, 59),
-        "row_odd": RGBColor(51, 65, 85),
-        "bar_text": RGBColor(226, 232, 240),
+        "slide_bg": (15, 23, 42),
+        "header_bg": (30, 41, 59),
+        "header_text": (255, 255, 255),
+        "phase_bg": (30, 41, 59),
+        "phase_text": (255, 255, 255),
+        "title_text": (226, 232, 240),
+        "row_even": (30, 41, 59),
+        "row_odd": (51, 65, 85),
+        "bar_text": (226, 232, 240),
         "bar_colors": {
-            "Phase I": RGBColor(139, 92, 246),
-            "Phase II": RGBColor(56, 189, 248),
-            "Phase III": RGBColor(251, 113, 133),
-            "Other": RGBColor(148, 163, 184),
+            "Phase I": (139, 92, 246),
+            "Phase II": (56, 189, 248),
+            "Phase III": (251, 113, 133),
+            "Other": (148, 163, 184),
         },
     },
     "light": {
-        "slide_bg": RGBColor(255, 255, 255),
-        "header_bg": RGBColor(241, 245, 249),
-        "header_text": RGBColor(30, 41, 59),
-        "phase_bg": RGBColor(51, 65, 85),
-        "phase_text": RGBColor(255, 255, 255),
-        "title_text": RGBColor(15, 23, 42),
-        "row_even": RGBColor(255, 255, 255),
-        "row_odd": RGBColor(248, 250, 252),
-        "bar_text": RGBColor(30, 41, 59),
+        "slide_bg": (255, 255, 255),
+        "header_bg": (241, 245, 249),
+        "header_text": (30, 41, 59),
+        "phase_bg": (51, 65, 85),
+        "phase_text": (255, 255, 255),
+        "title_text": (15, 23, 42),
+        "row_even": (255, 255, 255),
+        "row_odd": (248, 250, 252),
+        "bar_text": (30, 41, 59),
         "bar_colors": {
-            "Phase I": RGBColor(180, 160, 220),
-            "Phase II": RGBColor(170, 200, 230),
-            "Phase III": RGBColor(230, 170, 180),
-            "Other": RGBColor(160, 160, 160),
+            "Phase I": (180, 160, 220),
+            "Phase II": (170, 200, 230),
+            "Phase III": (230, 170, 180),
+            "Other": (160, 160, 160),
         },
     },
 }
 
 # ---------------------------------------------------------------------------
-# Tasks: (phase_name, task_label, start_month_idx, end_month_idx)
+# Tasks: (phase_name, task_label, start, end)
+#   start/end are 0-based month indices into MONTHS, or dates for every task
 # ---------------------------------------------------------------------------
 TASKS = [
     ("Phase I: Scale Gov Onboarding", "Engage DLA Stakeholders on use cases", 0, 2),
@@ -105,7 +100,19 @@ def _phase_key(phase_name: str) -> str:
     return "Other"
 
 
-def _set_slide_bg(slide, color: RGBColor):
+def _rgb(value):
+    """Convert the (r, g, b) tuples in a theme (nested dicts/lists) to RGBColor."""
+    from pptx.dml.color import RGBColor
+    if isinstance(value, dict):
+        return {k: _rgb(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_rgb(v) for v in value]
+    if isinstance(value, tuple):
+        return RGBColor(*value)
+    return value
+
+
+def _set_slide_bg(slide, color):
     bg = slide.background
     fill = bg.fill
     fill.solid()
@@ -113,7 +120,20 @@ def _set_slide_bg(slide, color: RGBColor):
 
 
 def main(theme_name: str = "dark"):
-    theme = THEMES[theme_name]
+    # python-pptx is imported here so --help doesn't have to load it
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.enum.text import PP_ALIGN
+    # utils/ sits at the repo root, beside this examples/ directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from utils import gantt_layout
+
+    axis = gantt_layout.resolve_axis(
+        {"months": MONTHS, "quarters": QUARTERS}, TASKS)
+    month_cols = len(axis.labels)
+
+    theme = _rgb(THEMES[theme_name])
     bar_colors = theme["bar_colors"]
 
     prs = Presentation()
@@ -133,7 +153,7 @@ def main(theme_name: str = "dark"):
 
     # Table
     total_rows = 2 + len(TASKS)
-    total_cols = 1 + MONTH_COLS
+    total_cols = 1 + month_cols
     table_shape = slide.shapes.add_table(
         total_rows, total_cols,
         Inches(TABLE_LEFT), Inches(TABLE_TOP),
@@ -154,16 +174,14 @@ def main(theme_name: str = "dark"):
 
     # Row 0: Quarters
     table.cell(0, 0).text = ""
-    for i, q in enumerate(QUARTERS):
-        c_start = 1 + i * 3
-        c_end = 1 + (i + 1) * 3 - 1
-        table.cell(0, c_start).text = q
-        if c_end > c_start:
-            table.cell(0, c_start).merge(table.cell(0, c_end))
+    for label, first, last in axis.groups:
+        table.cell(0, 1 + first).text = label
+        if last > first:
+            table.cell(0, 1 + first).merge(table.cell(0, 1 + last))
 
     # Row 1: Months
     table.cell(1, 0).text = ""
-    for c, m in enumerate(MONTHS):
+    for c, m in enumerate(axis.labels):
         table.cell(1, 1 + c).text = m
         para = table.cell(1, 1 + c).text_frame.paragraphs[0]
         para.alignment = PP_ALIGN.CENTER
@@ -199,18 +217,19 @@ def main(theme_name: str = "dark"):
             cell.fill.fore_color.rgb = bg
 
     # Task bars
-    chart_top = TABLE_TOP + HEADER_HEIGHT * 2
-    for i, (phase_name, task_label, start_m, end_m) in enumerate(TASKS):
-        row_top = chart_top + i * ROW_HEIGHT
-        bar_top = row_top + (ROW_HEIGHT - BAR_HEIGHT) / 2
-        bar_left = CHART_LEFT + start_m * MONTH_WIDTH + 0.02
-        bar_width = (end_m - start_m + 1) * MONTH_WIDTH - 0.04
-
+    # (no milestones here: every task is a bar)
+    shapes = gantt_layout.bar_geometry(
+        axis, [(*task, False) for task in TASKS], left=CHART_LEFT,
+        top=TABLE_TOP + HEADER_HEIGHT * 2, width=CHART_WIDTH,
+        row_h=ROW_HEIGHT, bar_h=BAR_HEIGHT, bar_pad=BAR_PADDING,
+        min_bar_w=0, milestone=0,
+    )
+    for (_, left, top, width, height, phase_name), task in zip(shapes, TASKS):
+        task_label = task[1]
         color = bar_colors.get(_phase_key(phase_name), bar_colors["Other"])
         shape = slide.shapes.add_shape(
             MSO_SHAPE.ROUNDED_RECTANGLE,
-            Inches(bar_left), Inches(bar_top),
-            Inches(bar_width), Inches(BAR_HEIGHT),
+            Inches(left), Inches(top), Inches(width), Inches(height),
         )
         shape.fill.solid()
         shape.fill.fore_color.rgb = color
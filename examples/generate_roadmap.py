@@ -6,6 +6,7 @@ Usage:
     python3 generate_roadmap.py                # dark theme (default)
     python3 generate_roadmap.py --theme light
     python3 generate_roadmap.py --theme dark
+    python3 generate_roadmap.py --mode chart   # task rows as one native chart
 
 Customization:
     Edit PROGRAM, QUARTERS, MONTHS, TASKS, and PHASES below to match
@@ -14,14 +15,9 @@ Customization:
         "Update the roadmap for [program name]. Here are the tasks: ..."
 """
 import argparse
+import sys
 from pathlib import Path
 
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
-from pptx.enum.text import PP_ALIGN
-
 
 # ═══════════════════════════════════════════════════════════════════════════
 # PROGRAM DATA — Edit this section for your program
@@ -49,8 +45,10 @@ PHASES = [
     "Optional",
 ]
 
-# Tasks: (phase, task_name, start_month_idx, end_month_idx, is_milestone, due_date)
-#   - start/end month indices are 0-based into MONTHS above
+# Tasks: (phase, task_name, start, end, is_milestone, due_date)
+#   - start/end are 0-based month indices into MONTHS above, or dates
+#     ("2026-02-15", "15 Feb 2026") for every task; with dates the month
+#     and quarter columns come from the tasks and MONTHS/QUARTERS are unused
 #   - is_milestone: True renders a diamond instead of a bar
 #   - due_date: string shown in the Due Date column, or None to leave blank
 TASKS = [
@@ -80,9 +78,9 @@ HEADER_HEIGHT = 0.4
 ROW_HEIGHT = 0.38
 BAR_HEIGHT = 0.22
 BAR_PADDING = 0.03
+MIN_BAR_WIDTH = 0.25
+MILESTONE_SIZE = 0.18
 
-MONTH_COLS = len(MONTHS)
-MONTH_WIDTH = CHART_WIDTH / MONTH_COLS
 CHART_LEFT = TABLE_LEFT + PHASE_COL_WIDTH
 
 
@@ -92,18 +90,18 @@ CHART_LEFT = TABLE_LEFT + PHASE_COL_WIDTH
 
 # Five bar colors that cycle across phases. Add more if you have > 5 phases.
 _BAR_PALETTE_DARK = [
-    RGBColor(34, 197, 94),    # green
-    RGBColor(249, 115, 22),   # orange
-    RGBColor(139, 92, 246),   # violet
-    RGBColor(236, 72, 153),   # magenta
-    RGBColor(148, 163, 184),  # slate
+    (34, 197, 94),    # green
+    (249, 115, 22),   # orange
+    (139, 92, 246),   # violet
+    (236, 72, 153),   # magenta
+    (148, 163, 184),  # slate
 ]
 _BAR_PALETTE_LIGHT = [
-    RGBColor(22, 163, 74),
-    RGBColor(234, 88, 12),
-    RGBColor(124, 58, 237),
-    RGBColor(219, 39, 119),
-    RGBColor(100, 116, 139),
+    (22, 163, 74),
+    (234, 88, 12),
+    (124, 58, 237),
+    (219, 39, 119),
+    (100, 116, 139),
 ]
 
 
@@ -113,30 +111,32 @@ def _build_bar_colors(phases, palette):
 
 THEMES = {
     "dark": {
-        "slide_bg": RGBColor(15, 23, 42),
-        "header_bg": RGBColor(30, 41, 59),
-        "header_text": RGBColor(255, 255, 255),
-        "title_text": RGBColor(226, 232, 240),
-        "subtitle_text": RGBColor(148, 163, 184),
-        "period_text": RGBColor(148, 163, 184),
-        "row_even": RGBColor(30, 41, 59),
-        "row_odd": RGBColor(51, 65, 85),
-        "task_text": RGBColor(226, 232, 240),
-        "due_text": RGBColor(148, 163, 184),
-        "footer_text": RGBColor(100, 116, 139),
+        "slide_bg": (15, 23, 42),
+        "header_bg": (30, 41, 59),
+        "header_text": (255, 255, 255),
+        "title_text": (226, 232, 240),
+        "subtitle_text": (148, 163, 184),
+        "period_text": (148, 163, 184),
+        "row_even": (30, 41, 59),
+        "row_odd": (51, 65, 85),
+        "task_text": (226, 232, 240),
+        "due_text": (148, 163, 184),
+        "footer_text": (100, 116, 139),
+        "bar_palette": _BAR_PALETTE_DARK,
     },
     "light": {
-        "slide_bg": RGBColor(255, 255, 255),
-        "header_bg": RGBColor(241, 245, 249),
-        "header_text": RGBColor(30, 41, 59),
-        "title_text": RGBColor(15, 23, 42),
-        "subtitle_text": RGBColor(71, 85, 105),
-        "period_text": RGBColor(71, 85, 105),
-        "row_even": RGBColor(255, 255, 255),
-        "row_odd": RGBColor(248, 250, 252),
-        "task_text": RGBColor(30, 41, 59),
-        "due_text": RGBColor(71, 85, 105),
-        "footer_text": RGBColor(148, 163, 184),
+        "slide_bg": (255, 255, 255),
+        "header_bg": (241, 245, 249),
+        "header_text": (30, 41, 59),
+        "title_text": (15, 23, 42),
+        "subtitle_text": (71, 85, 105),
+        "period_text": (71, 85, 105),
+        "row_even": (255, 255, 255),
+        "row_odd": (248, 250, 252),
+        "task_text": (30, 41, 59),
+        "due_text": (71, 85, 105),
+        "footer_text": (148, 163, 184),
+        "bar_palette": _BAR_PALETTE_LIGHT,
     },
 }
 
@@ -145,16 +145,131 @@ THEMES = {
 # GENERATOR — You shouldn't need to edit below this line
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _set_slide_bg(slide, color: RGBColor):
+def _rgb(value):
+    """Convert the (r, g, b) tuples in a theme (nested dicts/lists) to RGBColor."""
+    from pptx.dml.color import RGBColor
+    if isinstance(value, dict):
+        return {k: _rgb(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_rgb(v) for v in value]
+    if isinstance(value, tuple):
+        return RGBColor(*value)
+    return value
+
+
+def _set_slide_bg(slide, color):
     fill = slide.background.fill
     fill.solid()
     fill.fore_color.rgb = color
 
 
-def main(theme_name: str = "dark"):
-    theme = THEMES[theme_name]
-    palette = _BAR_PALETTE_DARK if theme_name == "dark" else _BAR_PALETTE_LIGHT
-    bar_colors = _build_bar_colors(PHASES, palette)
+def _add_gantt_chart(slide, axis, shapes, bar_colors, fallback, theme):
+    """Draw the task rows as one native stacked-bar chart (--mode chart).
+
+    Each task is a category. An invisible "Start" series offsets the bars;
+    every phase is a series of its own, with a value only on its own tasks,
+    so it takes the phase's colour. Values are in month columns, taken from
+    the same bar geometry the shapes mode draws, and the plot area is
+    pinned under the month columns of the header.
+    """
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE, XL_TICK_LABEL_POSITION
+    from pptx.enum.chart import XL_TICK_MARK
+    from pptx.oxml import parse_xml
+    from pptx.util import Inches, Pt
+
+    month_cols = len(axis.labels)
+    month_width = CHART_WIDTH / month_cols
+    series = list(bar_colors)
+    if any(task[0] not in bar_colors for task in TASKS):
+        series.append("Other")
+    column = {name: i for i, name in enumerate(series)}
+
+    starts = []
+    spans = [[None] * len(TASKS) for _ in series]
+    for i, (_, left, _, width, _, phase) in enumerate(shapes):
+        starts.append(round((left - CHART_LEFT) / month_width, 4))
+        spans[column.get(phase, len(series) - 1)][i] = \
+            round(width / month_width, 4)
+
+    chart_data = CategoryChartData()
+    chart_data.categories = [task[1] for task in TASKS]
+    chart_data.add_series("Start", starts)
+    for name, values in zip(series, spans):
+        chart_data.add_series(name, values)
+    frame = slide.shapes.add_chart(
+        XL_CHART_TYPE.BAR_STACKED,
+        Inches(TABLE_LEFT), Inches(TABLE_TOP + HEADER_HEIGHT * 2),
+        Inches(PHASE_COL_WIDTH + CHART_WIDTH), Inches(len(TASKS) * ROW_HEIGHT),
+        chart_data,
+    )
+    chart = frame.chart
+    chart.has_title = False
+    chart.has_legend = False
+    chart.font.size = Pt(10)
+    chart.font.color.rgb = theme["task_text"]
+
+    plot = chart.plots[0]
+    plot.gap_width = round((ROW_HEIGHT - BAR_HEIGHT) / BAR_HEIGHT * 100)
+    plot.overlap = 100
+    for ser, name in zip(plot.series, ["Start", *series]):
+        if name == "Start":
+            ser.format.fill.background()
+        else:
+            ser.format.fill.solid()
+            ser.format.fill.fore_color.rgb = bar_colors.get(name, fallback)
+        ser.format.line.fill.background()
+
+    # task names run top to bottom, like the table rows they replace
+    categories = chart.category_axis
+    categories.reverse_order = True
+    categories.major_tick_mark = XL_TICK_MARK.NONE
+    categories.format.line.fill.background()
+
+    values = chart.value_axis
+    values.minimum_scale = 0
+    values.maximum_scale = month_cols
+    values.major_unit = 1
+    values.major_tick_mark = XL_TICK_MARK.NONE
+    values.tick_label_position = XL_TICK_LABEL_POSITION.NONE
+    values.format.line.fill.background()
+    values.has_major_gridlines = True
+    values.major_gridlines.format.line.color.rgb = theme["header_bg"]
+
+    # plot area under the month columns; no chart background or border
+    c = 'xmlns:c="http://schemas.openxmlformats.org/drawingml/2006/chart"'
+    a = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    label_width = PHASE_COL_WIDTH / (PHASE_COL_WIDTH + CHART_WIDTH)
+    chart._chartSpace.chart.plotArea.insert(0, parse_xml(
+        f'<c:layout {c}><c:manualLayout><c:layoutTarget val="inner"/>'
+        f'<c:xMode val="edge"/><c:yMode val="edge"/>'
+        f'<c:x val="{label_width:.6f}"/><c:y val="0"/>'
+        f'<c:w val="{1 - label_width:.6f}"/><c:h val="1"/>'
+        f'</c:manualLayout></c:layout>'
+    ))
+    chart._chartSpace.chart.addnext(parse_xml(
+        f'<c:spPr {c} {a}><a:noFill/><a:ln><a:noFill/></a:ln></c:spPr>'
+    ))
+
+
+def main(theme_name: str = "dark", mode: str = "shapes"):
+    # python-pptx is imported here so --help doesn't have to load it
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+    from pptx.dml.color import RGBColor
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.enum.text import PP_ALIGN
+    # utils/ sits at the repo root, beside this examples/ directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from utils import gantt_layout
+
+    axis = gantt_layout.resolve_axis(
+        {"months": MONTHS, "quarters": QUARTERS}, TASKS)
+    month_cols = len(axis.labels)
+    month_width = CHART_WIDTH / month_cols
+
+    theme = _rgb(THEMES[theme_name])
+    bar_colors = _build_bar_colors(PHASES, theme["bar_palette"])
     fallback = RGBColor(148, 163, 184)
 
     prs = Presentation()
@@ -191,16 +306,19 @@ def main(theme_name: str = "dark"):
     p.font.size = Pt(8)
     p.font.color.rgb = theme["period_text"]
 
-    # Table
-    total_rows = 2 + len(TASKS)
-    total_cols = 1 + MONTH_COLS + 1
-    due_col = total_cols - 1
+    # Table (chart mode: just the header rows, the chart draws the tasks)
+    chart_mode = mode == "chart"
+    task_rows = 0 if chart_mode else len(TASKS)
+    due_width = 0 if chart_mode else DUE_DATE_COL_WIDTH
+    total_rows = 2 + task_rows
+    total_cols = 1 + month_cols + (0 if chart_mode else 1)
+    due_col = None if chart_mode else total_cols - 1
 
     table_shape = slide.shapes.add_table(
         total_rows, total_cols,
         Inches(TABLE_LEFT), Inches(TABLE_TOP),
-        Inches(PHASE_COL_WIDTH + CHART_WIDTH + DUE_DATE_COL_WIDTH),
-        Inches(HEADER_HEIGHT * 2 + len(TASKS) * ROW_HEIGHT),
+        Inches(PHASE_COL_WIDTH + CHART_WIDTH + due_width),
+        Inches(HEADER_HEIGHT * 2 + task_rows * ROW_HEIGHT),
     )
     table = table_shape.table
 
@@ -216,30 +334,28 @@ def main(theme_name: str = "dark"):
             para.font.bold = (r == 0)
             para.alignment = PP_ALIGN.CENTER
 
-    # Row 0: Quarters (auto-merge based on count)
+    # Row 0: Quarters (merged over their months)
     table.cell(0, 0).text = "Deliverable"
-    q_start = 1
-    months_per_q = MONTH_COLS // len(QUARTERS) if QUARTERS else MONTH_COLS
-    for i, q in enumerate(QUARTERS):
-        c_start = 1 + i * months_per_q
-        c_end = min(1 + (i + 1) * months_per_q - 1, MONTH_COLS)
-        table.cell(0, c_start).text = q
-        if c_end > c_start:
-            table.cell(0, c_start).merge(table.cell(0, c_end))
-
-    table.cell(0, due_col).text = "Due Date"
-    table.cell(0, due_col).merge(table.cell(1, due_col))
+    for label, first, last in axis.groups:
+        table.cell(0, 1 + first).text = label
+        if last > first:
+            table.cell(0, 1 + first).merge(table.cell(0, 1 + last))
+
+    if due_col is not None:
+        table.cell(0, due_col).text = "Due Date"
+        table.cell(0, due_col).merge(table.cell(1, due_col))
 
     # Row 1: Months
     table.cell(1, 0).text = ""
-    for c, m in enumerate(MONTHS):
+    for c, m in enumerate(axis.labels):
         table.cell(1, 1 + c).text = m
 
     # Column widths
     table.columns[0].width = Inches(PHASE_COL_WIDTH)
-    for c in range(1, due_col):
-        table.columns[c].width = Inches(MONTH_WIDTH)
-    table.columns[due_col].width = Inches(DUE_DATE_COL_WIDTH)
+    for c in range(1, 1 + month_cols):
+        table.columns[c].width = Inches(month_width)
+    if due_col is not None:
+        table.columns[due_col].width = Inches(DUE_DATE_COL_WIDTH)
 
     # Data rows
     for row in range(2, total_rows):
@@ -250,7 +366,7 @@ def main(theme_name: str = "dark"):
             if c == 0:
                 cell.text = task[1]
             elif c == due_col and task[5]:
-                cell.text = task[5]
+                cell.text = gantt_layout.due_text(task[5])
             cell.fill.solid()
             cell.fill.fore_color.rgb = bg
             if c == 0:
@@ -265,37 +381,23 @@ def main(theme_name: str = "dark"):
                 para.alignment = PP_ALIGN.RIGHT
 
     # Task bars
-    chart_top = TABLE_TOP + HEADER_HEIGHT * 2
-    for i, task in enumerate(TASKS):
-        phase, _, start_m, end_m, is_milestone, _ = task
-        color = bar_colors.get(phase, fallback)
-        row_top = chart_top + i * ROW_HEIGHT
-        center_y = row_top + ROW_HEIGHT / 2
-
-        if is_milestone:
-            size = 0.18
-            center_x = CHART_LEFT + (start_m + 0.5) * MONTH_WIDTH
-            shape = slide.shapes.add_shape(
-                MSO_SHAPE.DIAMOND,
-                Inches(center_x - size / 2), Inches(center_y - size / 2),
-                Inches(size), Inches(size),
-            )
-            shape.fill.solid()
-            shape.fill.fore_color.rgb = color
-            shape.line.fill.background()
-        else:
-            bar_top = row_top + (ROW_HEIGHT - BAR_HEIGHT) / 2
-            bar_left = CHART_LEFT + start_m * MONTH_WIDTH + BAR_PADDING
-            span = end_m - start_m + 1
-            bar_width = max(0.25, span * MONTH_WIDTH - 2 * BAR_PADDING)
-
+    shapes = gantt_layout.bar_geometry(
+        axis, TASKS, left=CHART_LEFT, top=TABLE_TOP + HEADER_HEIGHT * 2,
+        width=CHART_WIDTH, row_h=ROW_HEIGHT, bar_h=BAR_HEIGHT,
+        bar_pad=BAR_PADDING, min_bar_w=MIN_BAR_WIDTH,
+        milestone=MILESTONE_SIZE,
+    )
+    if chart_mode:
+        _add_gantt_chart(slide, axis, shapes, bar_colors, fallback, theme)
+    else:
+        for prst, left, top, width, height, phase in shapes:
             shape = slide.shapes.add_shape(
-                MSO_SHAPE.ROUNDED_RECTANGLE,
-                Inches(bar_left), Inches(bar_top),
-                Inches(bar_width), Inches(BAR_HEIGHT),
+                MSO_SHAPE.DIAMOND if prst == "diamond"
+                else MSO_SHAPE.ROUNDED_RECTANGLE,
+                Inches(left), Inches(top), Inches(width), Inches(height),
             )
             shape.fill.solid()
-            shape.fill.fore_color.rgb = color
+            shape.fill.fore_color.rgb = bar_colors.get(phase, fallback)
             shape.line.fill.background()
 
     # Footer
@@ -311,7 +413,8 @@ def main(theme_name: str = "dark"):
     out_dir = Path(__file__).resolve().parent / "output"
     out_dir.mkdir(exist_ok=True)
     safe_name = PROGRAM["name"].replace(" ", "_")
-    out_path = out_dir / f"{safe_name}_Roadmap_{theme_name}.pptx"
+    suffix = "_chart" if chart_mode else ""
+    out_path = out_dir / f"{safe_name}_Roadmap{suffix}_{theme_name}.pptx"
     prs.save(str(out_path))
     print(f"Created {out_path}")
 
@@ -324,5 +427,10 @@ if __name__ == "__main__":
         "--theme", choices=["dark", "light"], default="dark",
         help="Color theme (default: dark)",
     )
+    parser.add_argument(
+        "--mode", choices=["shapes", "chart"], default="shapes",
+        help="Draw task bars as shapes over the table, or as one native "
+             "stacked-bar chart (default: shapes)",
+    )
     args = parser.parse_args()
-    main(args.theme)
+    main(args.theme, args.mode)
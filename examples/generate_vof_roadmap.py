@@ -9,100 +9,102 @@ Usage:
     python3 vof/generate_vof_roadmap.py --theme dark
 """
 import argparse
+import sys
 from pathlib import Path
 
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
-from pptx.enum.text import PP_ALIGN
-
-# ---------------------------------------------------------------------------
-# Timeline
-# ---------------------------------------------------------------------------
-QUARTERS = ["Q1 2026", "Q2 2026", "Q3 2026"]
-MONTHS = ["Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug"]
-
 # ---------------------------------------------------------------------------
 # Layout
 # ---------------------------------------------------------------------------
 TABLE_LEFT = 0.5
 TABLE_TOP = 1.08
 PHASE_COL_WIDTH = 2.7
-MONTH_COLS = len(MONTHS)
 CHART_WIDTH = 5.6
-MONTH_WIDTH = CHART_WIDTH / MONTH_COLS
 CHART_LEFT = TABLE_LEFT + PHASE_COL_WIDTH
 DUE_DATE_COL_WIDTH = 1.1
 HEADER_HEIGHT = 0.4
 ROW_HEIGHT = 0.38
 BAR_HEIGHT = 0.22
 BAR_PADDING = 0.03
+MIN_BAR_WIDTH = 0.25
+MILESTONE_SIZE = 0.18
 
 # ---------------------------------------------------------------------------
 # Themes
 # ---------------------------------------------------------------------------
 THEMES = {
     "dark": {
-        "slide_bg": RGBColor(15, 23, 42),
-        "header_bg": RGBColor(30, 41, 59),
-        "header_text": RGBColor(255, 255, 255),
-        "title_text": RGBColor(226, 232, 240),
-        "subtitle_text": RGBColor(148, 163, 184),
-        "period_text": RGBColor(148, 163, 184),
-        "row_even": RGBColor(30, 41, 59),
-        "row_odd": RGBColor(51, 65, 85),
-        "task_text": RGBColor(226, 232, 240),
-        "due_text": RGBColor(148, 163, 184),
-        "footer_text": RGBColor(100, 116, 139),
+        "slide_bg": (15, 23, 42),
+        "header_bg": (30, 41, 59),
+        "header_text": (255, 255, 255),
+        "title_text": (226, 232, 240),
+        "subtitle_text": (148, 163, 184),
+        "period_text": (148, 163, 184),
+        "row_even": (30, 41, 59),
+        "row_odd": (51, 65, 85),
+        "task_text": (226, 232, 240),
+        "due_text": (148, 163, 184),
+        "footer_text": (100, 116, 139),
         "bar_colors": {
-            "App Maturity": RGBColor(34, 197, 94),
-            "Data & Integration": RGBColor(249, 115, 22),
-            "Platform Sustainment": RGBColor(139, 92, 246),
-            "Program Deliverables": RGBColor(236, 72, 153),
-            "Optional / Growth": RGBColor(148, 163, 184),
+            "App Maturity": (34, 197, 94),
+            "Data & Integration": (249, 115, 22),
+            "Platform Sustainment": (139, 92, 246),
+            "Program Deliverables": (236, 72, 153),
+            "Optional / Growth": (148, 163, 184),
         },
     },
     "light": {
-        "slide_bg": RGBColor(255, 255, 255),
-        "header_bg": RGBColor(241, 245, 249),
-        "header_text": RGBColor(30, 41, 59),
-        "title_text": RGBColor(15, 23, 42),
-        "subtitle_text": RGBColor(71, 85, 105),
-        "period_text": RGBColor(71, 85, 105),
-        "row_even": RGBColor(255, 255, 255),
-        "row_odd": RGBColor(248, 250, 252),
-        "task_text": RGBColor(30, 41, 59),
-        "due_text": RGBColor(71, 85, 105),
-        "footer_text": RGBColor(148, 163, 184),
+        "slide_bg": (255, 255, 255),
+        "header_bg": (241, 245, 249),
+        "header_text": (30, 41, 59),
+        "title_text": (15, 23, 42),
+        "subtitle_text": (71, 85, 105),
+        "period_text": (71, 85, 105),
+        "row_even": (255, 255, 255),
+        "row_odd": (248, 250, 252),
+        "task_text": (30, 41, 59),
+        "due_text": (71, 85, 105),
+        "footer_text": (148, 163, 184),
         "bar_colors": {
-            "App Maturity": RGBColor(22, 163, 74),
-            "Data & Integration": RGBColor(234, 88, 12),
-            "Platform Sustainment": RGBColor(124, 58, 237),
-            "Program Deliverables": RGBColor(219, 39, 119),
-            "Optional / Growth": RGBColor(100, 116, 139),
+            "App Maturity": (22, 163, 74),
+            "Data & Integration": (234, 88, 12),
+            "Platform Sustainment": (124, 58, 237),
+            "Program Deliverables": (219, 39, 119),
+            "Optional / Growth": (100, 116, 139),
         },
     },
 }
 
 # ---------------------------------------------------------------------------
-# Tasks: (phase, task, start_m, end_m, is_milestone, due_date)
+# Tasks: (phase, task, start, end, is_milestone, due_date)
+# Month and quarter columns are derived from the task dates.
 # ---------------------------------------------------------------------------
 TASKS = [
-    ("App Maturity", "IR Review & INTEL Agent v0→v1", 0, 1, False, "1 Mar 2026"),
-    ("Data & Integration", "Complete ServiceNow data connection", 0, 3, False, "TBD"),
-    ("Data & Integration", "New data connections (OP3 optional)", 4, 6, False, None),
-    ("Platform Sustainment", "Platform licenses, updates & 9-app sustainment", 0, 6, False, None),
-    ("Program Deliverables", "OP2 PoC Plan", 0, 0, True, "20 Feb 2026"),
-    ("Program Deliverables", "OP2 Closeout & Dataset Transition", 2, 3, False, "14 May 2026"),
-    ("Program Deliverables", "OP3 Closeout & Dataset Transition", 5, 6, False, "14 Aug 2026"),
-    ("Program Deliverables", "Monthly MTR / MFR", 0, 6, False, "7 Feb 2026"),
-    ("Optional / Growth", "Scoping for new applications", 4, 6, False, None),
-    ("Optional / Growth", "Up to 3 new apps (CLIN 0013)", 5, 6, False, "14 Aug 2026"),
+    ("App Maturity", "IR Review & INTEL Agent v0→v1", "2026-02-01", "2026-03-31", False, "1 Mar 2026"),
+    ("Data & Integration", "Complete ServiceNow data connection", "2026-02-01", "2026-05-31", False, "TBD"),
+    ("Data & Integration", "New data connections (OP3 optional)", "2026-06-01", "2026-08-31", False, None),
+    ("Platform Sustainment", "Platform licenses, updates & 9-app sustainment", "2026-02-01", "2026-08-31", False, None),
+    ("Program Deliverables", "OP2 PoC Plan", "2026-02-20", "2026-02-20", True, "20 Feb 2026"),
+    ("Program Deliverables", "OP2 Closeout & Dataset Transition", "2026-04-01", "2026-05-31", False, "14 May 2026"),
+    ("Program Deliverables", "OP3 Closeout & Dataset Transition", "2026-07-01", "2026-08-31", False, "14 Aug 2026"),
+    ("Program Deliverables", "Monthly MTR / MFR", "2026-02-01", "2026-08-31", False, "7 Feb 2026"),
+    ("Optional / Growth", "Scoping for new applications", "2026-06-01", "2026-08-31", False, None),
+    ("Optional / Growth", "Up to 3 new apps (CLIN 0013)", "2026-07-01", "2026-08-31", False, "14 Aug 2026"),
 ]
 
 
-def _set_slide_bg(slide, color: RGBColor):
+def _rgb(value):
+    """Convert the (r, g, b) tuples in a theme (nested dicts/lists) to RGBColor."""
+    from pptx.dml.color import RGBColor
+    if isinstance(value, dict):
+        return {k: _rgb(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_rgb(v) for v in value]
+    if isinstance(value, tuple):
+        return RGBColor(*value)
+    return value
+
+
+def _set_slide_bg(slide, color):
     bg = slide.background
     fill = bg.fill
     fill.solid()
@@ -110,7 +112,20 @@ def _set_slide_bg(slide, color: RGBColor):
 
 
 def main(theme_name: str = "dark"):
-    theme = THEMES[theme_name]
+    # python-pptx is imported here so --help doesn't have to load it
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.enum.text import PP_ALIGN
+    # utils/ sits at the repo root, beside this examples/ directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from utils import gantt_layout
+
+    axis = gantt_layout.resolve_axis({}, TASKS)
+    month_cols = len(axis.labels)
+    month_width = CHART_WIDTH / month_cols
+
+    theme = _rgb(THEMES[theme_name])
     bar_colors = theme["bar_colors"]
     fallback_bar = bar_colors["Optional / Growth"]
 
@@ -150,7 +165,7 @@ def main(theme_name: str = "dark"):
 
     # Table
     total_rows = 2 + len(TASKS)
-    total_cols = 1 + MONTH_COLS + 1
+    total_cols = 1 + month_cols + 1
     due_col = total_cols - 1
     table_shape = slide.shapes.add_table(
         total_rows, total_cols,
@@ -173,22 +188,20 @@ def main(theme_name: str = "dark"):
             para.alignment = PP_ALIGN.CENTER
 
     table.cell(0, 0).text = "Deliverable"
-    table.cell(0, 1).text = QUARTERS[0]
-    table.cell(0, 1).merge(table.cell(0, 2))
-    table.cell(0, 3).text = QUARTERS[1]
-    table.cell(0, 3).merge(table.cell(0, 4))
-    table.cell(0, 5).text = QUARTERS[2]
-    table.cell(0, 5).merge(table.cell(0, 7))
+    for label, first, last in axis.groups:
+        table.cell(0, 1 + first).text = label
+        if last > first:
+            table.cell(0, 1 + first).merge(table.cell(0, 1 + last))
     table.cell(0, due_col).text = "Due Date"
     table.cell(0, due_col).merge(table.cell(1, due_col))
 
     table.cell(1, 0).text = ""
-    for c, m in enumerate(MONTHS):
+    for c, m in enumerate(axis.labels):
         table.cell(1, 1 + c).text = m
 
     table.columns[0].width = Inches(PHASE_COL_WIDTH)
     for c in range(1, due_col):
-        table.columns[c].width = Inches(MONTH_WIDTH)
+        table.columns[c].width = Inches(month_width)
     table.columns[due_col].width = Inches(DUE_DATE_COL_WIDTH)
 
     # Data rows
@@ -200,7 +213,7 @@ def main(theme_name: str = "dark"):
             if c == 0:
                 cell.text = task[1]
             elif c == due_col and task[5]:
-                cell.text = task[5]
+                cell.text = gantt_layout.due_text(task[5])
             cell.fill.solid()
             cell.fill.fore_color.rgb = bg
             if c == 0:
@@ -215,38 +228,21 @@ def main(theme_name: str = "dark"):
                 para.alignment = PP_ALIGN.RIGHT
 
     # Task bars
-    chart_top = TABLE_TOP + HEADER_HEIGHT * 2
-    for i, task in enumerate(TASKS):
-        phase, _, start_m, end_m, is_milestone, _ = task
-        color = bar_colors.get(phase, fallback_bar)
-        row_top = chart_top + i * ROW_HEIGHT
-        center_y = row_top + ROW_HEIGHT / 2
-
-        if is_milestone:
-            size = 0.18
-            center_x = CHART_LEFT + (start_m + 0.5) * MONTH_WIDTH
-            shape = slide.shapes.add_shape(
-                MSO_SHAPE.DIAMOND,
-                Inches(center_x - size / 2), Inches(center_y - size / 2),
-                Inches(size), Inches(size),
-            )
-            shape.fill.solid()
-            shape.fill.fore_color.rgb = color
-            shape.line.fill.background()
-        else:
-            bar_top = row_top + (ROW_HEIGHT - BAR_HEIGHT) / 2
-            bar_left = CHART_LEFT + start_m * MONTH_WIDTH + BAR_PADDING
-            span = end_m - start_m + 1
-            bar_width = max(0.25, span * MONTH_WIDTH - 2 * BAR_PADDING)
-
-            shape = slide.shapes.add_shape(
-                MSO_SHAPE.ROUNDED_RECTANGLE,
-                Inches(bar_left), Inches(bar_top),
-                Inches(bar_width), Inches(BAR_HEIGHT),
-            )
-            shape.fill.solid()
-            shape.fill.fore_color.rgb = color
-            shape.line.fill.background()
+    shapes = gantt_layout.bar_geometry(
+        axis, TASKS, left=CHART_LEFT, top=TABLE_TOP + HEADER_HEIGHT * 2,
+        width=CHART_WIDTH, row_h=ROW_HEIGHT, bar_h=BAR_HEIGHT,
+        bar_pad=BAR_PADDING, min_bar_w=MIN_BAR_WIDTH,
+        milestone=MILESTONE_SIZE,
+    )
+    for prst, left, top, width, height, phase in shapes:
+        shape = slide.shapes.add_shape(
+            MSO_SHAPE.DIAMOND if prst == "diamond"
+            else MSO_SHAPE.ROUNDED_RECTANGLE,
+            Inches(left), Inches(top), Inches(width), Inches(height),
+        )
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = bar_colors.get(phase, fallback_bar)
+        shape.line.fill.background()
 
     # Footer
     footer = slide.shapes.add_textbox(
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Render many deck specs in one run across a pool of worker processes.
+
+Each worker imports python-pptx and reads the base template once, then
+renders every deck it is handed from an in-memory copy of that template —
+no per-deck interpreter start, import, or template read.
+
+A deck spec is a ``.json``, ``.yaml`` or ``.toml`` file holding a DECK dict,
+or a ``.py`` file that defines ``DECK`` (the same shape as the one in
+generate_deck.py); see utils/deck_spec.py. Slides are checked against the
+slide schemas as they render, so a bad spec fails with the slide at fault.
+
+Usage:
+    python3 generate_batch.py specs/                    # every spec in a folder
+    python3 generate_batch.py a.json b.py --theme dark light
+    python3 generate_batch.py specs/ --workers 8 --out output/batch
+    python3 generate_batch.py specs/ --report output/batch_report.json
+    python3 generate_batch.py specs/ --check            # validate, no render
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from utils.deck_spec import SPEC_SUFFIXES, load_spec
+
+
+def collect_specs(paths) -> list:
+    """Expand directories into their spec files, keeping explicit files as-is."""
+    specs = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            specs.extend(sorted(
+                f for f in p.iterdir()
+                if f.suffix.lower() in SPEC_SUFFIXES and not f.name.startswith("_")
+            ))
+        else:
+            specs.append(p)
+    return specs
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# WORKER
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _init_worker():
+    """Warm a worker: import the generator and cache the base template bytes."""
+    import generate_deck
+    generate_deck._base_template()
+
+
+def render_spec(spec_path, theme_names=("dark",), out_dir=None) -> dict:
+    """Render one spec in each theme and return a result record (never raises)."""
+    import generate_deck
+
+    theme_names = list(theme_names)
+    result = {"spec": str(spec_path), "themes": theme_names, "ok": False}
+    t0 = time.perf_counter()
+    try:
+        deck = load_spec(spec_path)
+        deck["slides"] = generate_deck.validated(deck["slides"])
+        t1 = time.perf_counter()
+        if len(theme_names) == 1:
+            prs = generate_deck.render_deck(deck, theme_names[0])
+            t2 = time.perf_counter()
+            out_path = generate_deck.output_path(deck, theme_names[0], out_dir)
+            prs.save(str(out_path))
+            outputs = [str(out_path)]
+        else:
+            rendered = generate_deck.render_themes(deck, theme_names)
+            t2 = time.perf_counter()
+            outputs = []
+            for name, data in rendered.items():
+                out_path = generate_deck.output_path(deck, name, out_dir)
+                out_path.write_bytes(data)
+                outputs.append(str(out_path))
+        t3 = time.perf_counter()
+    except Exception as exc:  # report per-deck failures, keep the batch going
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        result["seconds"] = round(time.perf_counter() - t0, 4)
+        return result
+
+    result.update(
+        ok=True,
+        outputs=outputs,
+        load_s=round(t1 - t0, 4),
+        render_s=round(t2 - t1, 4),
+        save_s=round(t3 - t2, 4),
+        seconds=round(t3 - t0, 4),
+    )
+    return result
+
+
+def run_batch(spec_paths, theme_names=("dark",), out_dir=None,
+              workers: int = None) -> list:
+    """Render *spec_paths* on a process pool, returning results in input order."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    spec_paths = list(spec_paths)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(spec_paths) or 1))
+
+    results = [None] * len(spec_paths)
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(render_spec, p, theme_names, out_dir): i
+            for i, p in enumerate(spec_paths)
+        }
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                results[i] = fut.result()
+            except Exception as exc:  # worker died (e.g. killed, OOM)
+                results[i] = {"spec": str(spec_paths[i]),
+                              "themes": list(theme_names),
+                              "ok": False, "seconds": 0.0,
+                              "error": f"{type(exc).__name__}: {exc}"}
+    return results
+
+
+def check_specs(spec_paths) -> int:
+    """Validate every spec without rendering; print problems, return their count."""
+    from generate_deck import validate_deck
+
+    total = 0
+    for path in spec_paths:
+        try:
+            problems = validate_deck(load_spec(path))
+        except Exception as exc:
+            problems = [f"{type(exc).__name__}: {exc}"]
+        for problem in problems:
+            print(f"{path}: {problem}")
+        total += len(problems)
+    print(f"{len(spec_paths)} spec(s) checked, {total} problem(s)")
+    return total
+
+
+def print_report(results, wall_s: float):
+    print(f"\n{'Status':<6}  {'Seconds':>8}  Spec")
+    print("-" * 60)
+    for r in results:
+        status = "ok" if r["ok"] else "FAIL"
+        print(f"{status:<6}  {r['seconds']:>8.3f}  {r['spec']}")
+        if not r["ok"]:
+            print(f"{'':<16}{r['error']}")
+
+    ok = sum(r["ok"] for r in results)
+    busy = sum(r["seconds"] for r in results)
+    print("-" * 60)
+    print(f"{ok}/{len(results)} decks rendered in {wall_s:.2f}s wall "
+          f"({busy:.2f}s render time across workers)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Render many deck specs in parallel"
+    )
+    parser.add_argument(
+        "specs", nargs="+",
+        help="Spec files (.json / .yaml / .toml / .py) or directories "
+             "containing them",
+    )
+    parser.add_argument(
+        "--theme", nargs="+", default=["dark"],
+        help="Color theme(s) (default: dark). Several themes render each "
+             "deck once and re-skin it per theme.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--out", type=Path, default=None,
+        help="Output directory (default: output/)",
+    )
+    parser.add_argument(
+        "--report", type=Path, default=None,
+        help="Also write per-deck results as JSON to this path",
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="Validate specs against the slide schemas without rendering",
+    )
+    args = parser.parse_args()
+
+    specs = collect_specs(args.specs)
+    if not specs:
+        sys.exit("No deck specs found")
+
+    if args.check:
+        sys.exit(1 if check_specs(specs) else 0)
+
+    start = time.perf_counter()
+    results = run_batch(specs, args.theme, args.out, args.workers)
+    wall = time.perf_counter() - start
+    print_report(results, wall)
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(results, indent=2))
+        print(f"Report written to {args.report}")
+
+    if not all(r["ok"] for r in results):
+        sys.exit(1)
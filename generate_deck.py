@@ -3,27 +3,50 @@
 Generate a styled PowerPoint deck for any Scale AI presentation.
 
 Supports multiple slide layouts — title, section, content, two-column,
-metrics, table, and gantt — all rendered in Scale styling with dark
-and light themes.
+metrics, table, gantt, line and bar charts, and image — all rendered in
+Scale styling with dark and light themes.
 
 Usage:
     python3 generate_deck.py                # dark theme (default)
     python3 generate_deck.py --theme light
+    python3 generate_deck.py --theme dark light   # render once, both themes
+    python3 generate_deck.py --cache              # reuse unchanged slides
+    python3 generate_deck.py --backend xml        # direct XML fast path
+    python3 generate_deck.py --stream             # one slide in memory at once
+    python3 generate_deck.py --check              # validate DECK, no render
+    python3 generate_deck.py --spec deck.yaml     # render a spec file
+    python3 generate_deck.py --watch              # re-render on every save
+    python3 generate_deck.py --profile            # per-slide timings + trace
+    python3 generate_deck.py --format html        # browser-ready SVG slides
 
 Customization:
-    Edit the DECK definition below, or ask Cursor:
+    Edit the DECK definition below, pass a JSON / YAML / TOML spec file with
+    --spec, or ask Cursor:
 
         "Build me a deck with a title slide, 3 content slides, and a
          metrics slide. Here's the content: ..."
 """
 import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import time
+from functools import lru_cache, partial
+from collections import deque
+from itertools import chain, islice, repeat, zip_longest
 from pathlib import Path
 
-from pptx import Presentation
-from pptx.util import Inches, Pt, Emu
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+# python-pptx, lxml and the rendering helpers in utils/ are imported where
+# they are first needed, so --help, --check and other paths that don't
+# render start without loading them (utils/startup_report.py checks this).
+# Only what themes and validation need at import is loaded here, plus the
+# small text_metrics, which sizes text on nearly every slide.
+from utils.themes import THEME_KEYS, compile_theme, load_themes
+from utils import deck_spec, gantt_layout, table_sources, text_metrics
+from utils.text_metrics import (TEXT_INSET, fit_columns, fit_size, line_count,
+                                text_width)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -135,79 +158,150 @@ DECK = {
 # THEMES
 # ═══════════════════════════════════════════════════════════════════════════
 
-_BAR_PALETTE_DARK = [
-    RGBColor(34, 197, 94),
-    RGBColor(249, 115, 22),
-    RGBColor(139, 92, 246),
-    RGBColor(236, 72, 153),
-    RGBColor(56, 189, 248),
-    RGBColor(251, 191, 36),
-    RGBColor(148, 163, 184),
-]
-
-_BAR_PALETTE_LIGHT = [
-    RGBColor(22, 163, 74),
-    RGBColor(234, 88, 12),
-    RGBColor(124, 58, 237),
-    RGBColor(219, 39, 119),
-    RGBColor(14, 165, 233),
-    RGBColor(217, 119, 6),
-    RGBColor(100, 116, 139),
-]
-
-THEMES = {
-    "dark": {
-        "slide_bg":       RGBColor(15, 23, 42),
-        "title_text":     RGBColor(241, 245, 249),
-        "subtitle_text":  RGBColor(148, 163, 184),
-        "body_text":      RGBColor(226, 232, 240),
-        "muted_text":     RGBColor(100, 116, 139),
-        "header_bg":      RGBColor(30, 41, 59),
-        "header_text":    RGBColor(255, 255, 255),
-        "row_even":       RGBColor(30, 41, 59),
-        "row_odd":        RGBColor(51, 65, 85),
-        "card_bg":        RGBColor(30, 41, 59),
-        "card_border":    RGBColor(51, 65, 85),
-        "accent":         RGBColor(99, 102, 241),
-        "divider":        RGBColor(51, 65, 85),
-        "bullet_color":   RGBColor(99, 102, 241),
-    },
-    "light": {
-        "slide_bg":       RGBColor(255, 255, 255),
-        "title_text":     RGBColor(15, 23, 42),
-        "subtitle_text":  RGBColor(71, 85, 105),
-        "body_text":      RGBColor(30, 41, 59),
-        "muted_text":     RGBColor(148, 163, 184),
-        "header_bg":      RGBColor(241, 245, 249),
-        "header_text":    RGBColor(30, 41, 59),
-        "row_even":       RGBColor(255, 255, 255),
-        "row_odd":        RGBColor(248, 250, 252),
-        "card_bg":        RGBColor(248, 250, 252),
-        "card_border":    RGBColor(226, 232, 240),
-        "accent":         RGBColor(79, 70, 229),
-        "divider":        RGBColor(226, 232, 240),
-        "bullet_color":   RGBColor(79, 70, 229),
-    },
-}
+# Every file in themes/ is a theme (see utils/themes.py); each is validated
+# and compiled to ready-made colour fragments once, at import.
+THEMES_DIR = Path(__file__).resolve().parent / "themes"
+THEMES = load_themes([THEMES_DIR], {})
 
 
-# ═══════════════════════════════════════════════════════════════════════════
-# SLIDE RENDERERS — You shouldn't need to edit below this line
-# ═══════════════════════════════════════════════════════════════════════════
+def resolve_theme(theme) -> dict:
+    """A compiled theme from a THEMES name, a Theme, or a raw colour dict."""
+    if isinstance(theme, str):
+        return THEMES[theme]
+    return compile_theme(getattr(theme, "name", "custom"), theme)
+
+
+OUTPUT_DIR = Path(__file__).resolve().parent / "output"
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "slides"
+IMAGE_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "images"
 
 W = 10     # slide width in inches
 H = 7.5    # slide height in inches
 MARGIN = 0.7
 
+# Gantt table and bar geometry in inches: a task-name column, the chart's
+# time columns and a due-date column, under two header rows.
+GANTT_GEOMETRY = {
+    "left": 0.5, "top": 1.08,
+    "name_w": 2.7, "chart_w": 5.6, "due_w": 1.1,
+    "header_h": 0.4, "row_h": 0.38,
+    "bar_h": 0.22, "bar_pad": 0.03, "min_bar_w": 0.25, "milestone": 0.18,
+}
+
+# Rendering modes a slide can pick with its "mode" key; the first is the
+# default. Bullet lists draw a dot shape and a textbox per item ("shapes")
+# or one textbox of natively bulleted paragraphs ("native"). A Gantt draws
+# an autoshape per task over the table ("shapes") or all task rows as one
+# native stacked-bar chart ("chart"). Bar charts stand their bars upright
+# ("column") or run them across, categories top to bottom ("bar").
+LAYOUT_MODES = {
+    "content": ("shapes", "native"),
+    "two_column": ("shapes", "native"),
+    "gantt": ("shapes", "chart"),
+    "bar": ("column", "bar"),
+}
+
+# Height of one line of text, as a multiple of its font size
+LINE_HEIGHT = 1.2
+
+# Text that would overflow its box shrinks, but not below this (points)
+MIN_FONT_SIZE = 8
+
+# Table header and body text sizes in points
+TABLE_TEXT_SIZES = (12, 11)
+
+# Top and bottom inset of a table cell's text, in inches (marT/marB default)
+TABLE_CELL_MARGIN = 0.05
+
+# List layouts: (first item top, pitch, item height) in inches. The renderers
+# place items with these; paginate() derives how many fit above PAGE_BOTTOM.
+LIST_GEOMETRY = {
+    "content": (1.4, 0.55, 0.4),
+    "two_column": (2.0, 0.48, 0.35),
+    "table": (1.4, 0.45, 0.45),    # per table row, header row included
+    "gantt": (GANTT_GEOMETRY["top"] + 2 * GANTT_GEOMETRY["header_h"],
+              GANTT_GEOMETRY["row_h"], GANTT_GEOMETRY["row_h"]),   # per task
+}
+PAGE_BOTTOM = H - MARGIN
+
+# Image layout: picture area top with and without a title, and the caption
+# line's height and gap below the picture, in inches
+IMAGE_GEOMETRY = {"top": 1.4, "untitled_top": 0.5, "caption_h": 0.45,
+                  "caption_gap": 0.1}
+
+# Slides read ahead of rendering, so the pictures of image slides among them
+# are prepared in the background (see _prefetch_images)
+IMAGE_PREFETCH = 16
+
+# Points each chart series keeps (a slide's "points" key overrides): line
+# charts by LTTB, bar charts one bar per bucket, metric card sparklines by
+# LTTB (see utils/chart_series.py)
+CHART_POINTS = {"line": 500, "bar": 60, "trend": 60}
+
+CONTINUED_TITLE = "{title} (cont.)"
+
+
+# Paragraph alignment, as OOXML algn values
+ALIGN_LEFT = "l"
+ALIGN_CENTER = "ctr"
+ALIGN_RIGHT = "r"
+
+WHITE = (255, 255, 255)
+
+# Custom table styles written into every deck, coloured from the theme (see
+# _install_table_styles); _add_table(style=...) picks one by key.
+TABLE_STYLE_IDS = {
+    "table": "{5CA1E7AB-0001-4C6E-9A5B-3D2E1F0A7B01}",
+    "gantt": "{5CA1E7AB-0002-4C6E-9A5B-3D2E1F0A7B02}",
+}
+
+# MSO_SHAPE member for each prst geometry name used by the renderers
+_AUTO_SHAPES = {
+    "rect": "RECTANGLE",
+    "roundRect": "ROUNDED_RECTANGLE",
+    "ellipse": "OVAL",
+    "diamond": "DIAMOND",
+}
+
+
+# SlideXml and DisplayList, which the drawing helpers draw into as well as
+# python-pptx slides; imported on first use (see _targets)
+_TARGETS = None
+
+
+def _targets() -> tuple:
+    global _TARGETS
+    from utils.display_list import DisplayList
+    from utils.pptx_xml import SlideXml
+    _TARGETS = (SlideXml, DisplayList)
+    return _TARGETS
+
 
 def _set_bg(slide, color):
+    SlideXml, DisplayList = _TARGETS or _targets()
+    if isinstance(slide, (SlideXml, DisplayList)):
+        slide.set_bg(color)
+        return
+    from pptx.dml.color import RGBColor
     fill = slide.background.fill
     fill.solid()
-    fill.fore_color.rgb = color
+    fill.fore_color.rgb = RGBColor(*color)
 
 
 def _add_text(slide, left, top, width, height, text, *,
-              size=12, bold=False, color=None, align=PP_ALIGN.LEFT):
+              size=12, bold=False, color=None, align=ALIGN_LEFT, shrink=False):
+    """Add a one-paragraph textbox. With *shrink*, a *text* too wide for the
+    box is set in the largest size that fits (down to MIN_FONT_SIZE)."""
+    SlideXml, DisplayList = _TARGETS or _targets()
+    if shrink:
+        size = _fit_size(text, width, size, bold)
+    if isinstance(slide, (SlideXml, DisplayList)):
+        slide.add_text(left, top, width, height, text, size=size, bold=bold,
+                       color=color, align=align)
+        return None
+    from pptx.dml.color import RGBColor
+    from pptx.enum.text import PP_ALIGN
+    from pptx.util import Inches, Pt
     box = slide.shapes.add_textbox(Inches(left), Inches(top),
                                    Inches(width), Inches(height))
     p = box.text_frame.paragraphs[0]
@@ -215,28 +309,400 @@ def _add_text(slide, left, top, width, height, text, *,
     p.font.size = Pt(size)
     p.font.bold = bold
     if color:
-        p.font.color.rgb = color
-    p.alignment = align
+        p.font.color.rgb = RGBColor(*color)
+    p.alignment = PP_ALIGN.from_xml(align)
     return box
 
 
+def _fit_size(text, width, size, bold=False):
+    """Font size for *text* in a box (or cell) *width* inches wide."""
+    return fit_size(text, width - 2 * TEXT_INSET, size, bold=bold,
+                    min_size=min(size, MIN_FONT_SIZE))
+
+
+def _add_bullets(slide, left, top, width, height, items, *, size, color,
+                 bullet_color, indent, hanging, pitch):
+    """Add one textbox with each of *items* as a natively bulleted paragraph.
+
+    Text starts *indent* inches in from *left*, with the bullet *hanging*
+    inches before it. Paragraphs are spaced *pitch* inches apart, assuming
+    one line each (textboxes don't wrap).
+    """
+    SlideXml, DisplayList = _TARGETS or _targets()
+    if isinstance(slide, DisplayList):
+        slide.add_bullets(left, top, width, height, items, size=size,
+                          color=color, bullet_color=bullet_color,
+                          indent=indent, hanging=hanging, pitch=pitch)
+        return None
+    from utils.pptx_xml import bullet_list_style
+    lst_style = bullet_list_style(
+        size=size, color=color, bullet_color=bullet_color, indent=indent,
+        hanging=hanging, space_after=pitch * 72 - size * LINE_HEIGHT,
+    )
+    if isinstance(slide, SlideXml):
+        slide.add_bullets(left, top, width, height, items, lst_style)
+        return None
+    from pptx.oxml import parse_xml
+    from pptx.oxml.ns import nsdecls, qn
+    from pptx.util import Inches
+    box = slide.shapes.add_textbox(Inches(left), Inches(top),
+                                   Inches(width), Inches(height))
+    frame = box.text_frame
+    tx_body = frame._txBody
+    tx_body.replace(tx_body.find(qn("a:lstStyle")), parse_xml(
+        lst_style.replace("<a:lstStyle", "<a:lstStyle %s" % nsdecls("a"), 1)))
+    for i, item in enumerate(items):
+        p = frame.paragraphs[0] if i == 0 else frame.add_paragraph()
+        p.text = item
+    return box
+
+
+def _add_shape(slide, prst, left, top, width, height, *,
+               fill, line=None, line_width=None):
+    """Add a solid-filled autoshape; *prst* is "rect", "roundRect", "ellipse"
+    or "diamond". Without *line* the outline is hidden."""
+    SlideXml, DisplayList = _TARGETS or _targets()
+    if isinstance(slide, (SlideXml, DisplayList)):
+        slide.add_shape(prst, left, top, width, height,
+                        fill=fill, line=line, line_width=line_width)
+        return None
+    from pptx.dml.color import RGBColor
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.util import Inches, Pt
+    shape = slide.shapes.add_shape(
+        getattr(MSO_SHAPE, _AUTO_SHAPES[prst]),
+        Inches(left), Inches(top), Inches(width), Inches(height),
+    )
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = RGBColor(*fill)
+    if line is None:
+        shape.line.fill.background()
+    else:
+        shape.line.color.rgb = RGBColor(*line)
+        if line_width:
+            shape.line.width = Pt(line_width)
+    return shape
+
+
+def _add_table(slide, left, top, width, height, col_widths, rows, merges=(),
+               style="table"):
+    """Add a table from a grid of ``(text, fmt)`` cells.
+
+    *style* is a TABLE_STYLE_IDS key. The table style colours the header row,
+    the banded body rows and the body text, so *fmt* only carries what it
+    can't: any of fill, size, bold, color and align (ALIGN_*). *text* is the
+    cell text, or None to leave the cell untouched. Share one fmt dict
+    between all cells with the same formatting; each distinct dict is built
+    once and copied. *merges* is a sequence of ``((row, col), (row, col))``
+    corner pairs.
+    """
+    SlideXml, DisplayList = _TARGETS or _targets()
+    if isinstance(slide, DisplayList):
+        slide.add_table(left, top, width, height, col_widths, rows, merges,
+                        style)
+        return None
+    style_id = TABLE_STYLE_IDS[style]
+    if isinstance(slide, SlideXml):
+        slide.add_table(left, top, width, height, col_widths, rows, merges,
+                        style_id)
+        return None
+
+    from copy import deepcopy
+    from pptx.oxml.ns import qn
+    from pptx.table import _Cell
+    from pptx.util import Inches
+    table_shape = slide.shapes.add_table(
+        len(rows), len(col_widths),
+        Inches(left), Inches(top), Inches(width), Inches(height),
+    )
+    table = table_shape.table
+    tbl = table._tbl
+    tbl.tblPr.find(qn("a:tableStyleId")).text = style_id
+    for c, w in enumerate(col_widths):
+        table.columns[c].width = Inches(w)
+
+    # One pass over the rows (table.cell() re-walks the row list on every
+    # call). The first cell with each fmt is formatted through python-pptx;
+    # later ones get copies of its pPr and tcPr.
+    formatted = {}
+    for tr, row in zip(tbl.tr_lst, rows):
+        for tc, (text, fmt) in zip(tr.tc_lst, row):
+            if text is not None:
+                _Cell(tc, table).text = text
+            key = id(fmt)
+            if key not in formatted:
+                _format_cell(_Cell(tc, table), fmt)
+                ppr, tcpr = tc.txBody.p_lst[0].pPr, tc.tcPr
+                formatted[key] = (ppr, tcpr if len(tcpr) else None)
+                continue
+            ppr, tcpr = formatted[key]
+            if ppr is not None:
+                tc.txBody.p_lst[0].insert(0, deepcopy(ppr))
+            if tcpr is not None:
+                tc.replace(tc.tcPr, deepcopy(tcpr))
+
+    for (r0, c0), (r1, c1) in merges:
+        table.cell(r0, c0).merge(table.cell(r1, c1))
+    return table_shape
+
+
+def _add_chart(slide, left, top, width, height, chart_type, categories,
+               series, *, colors=None, min_value=None, max_value=None,
+               label_width=None, axes=True, style=None):
+    """Add a native category or XY chart.
+
+    *chart_type* is an XL_CHART_TYPE member name such as "BAR_STACKED";
+    *series* is a sequence of ``(name, values)`` pairs, one value per
+    category. For "XY_..." types *categories* are the x values the series
+    share, and the x axis spans them exactly. *colors* gives each series
+    its fill, or its line in line and XY charts (None hides the series).
+    *min_value* and *max_value* fix the value axis range; with only
+    *max_value* it runs from 0. *label_width* pins the plot area to the
+    right of that share of the chart's width, leaving the rest for category
+    labels. With *axes* False only the series are drawn: no axes,
+    gridlines, legend or background, as for a sparkline. The chart lives in
+    its own part with the data embedded as a workbook; *style*, if given,
+    is called with the new Chart for any further formatting.
+    """
+    SlideXml, DisplayList = _TARGETS or _targets()
+    if isinstance(slide, DisplayList):
+        slide.add_chart(left, top, width, height, chart_type, categories,
+                        series, colors, min_value, max_value, label_width,
+                        axes, style)
+        return None
+    from pptx.chart.data import CategoryChartData, XyChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+    xl_type = getattr(XL_CHART_TYPE, chart_type)
+    if chart_type.startswith("XY_"):
+        chart_data = XyChartData()
+        for name, values in series:
+            points = chart_data.add_series(name)
+            for x, y in zip(categories, values):
+                points.add_data_point(x, y)
+    else:
+        chart_data = CategoryChartData()
+        chart_data.categories = categories
+        for name, values in series:
+            chart_data.add_series(name, values)
+
+    def format_chart(chart):
+        _format_chart(chart, chart_type, categories, colors, min_value,
+                      max_value, label_width, axes)
+        if style is not None:
+            style(chart)
+
+    if isinstance(slide, SlideXml):
+        def add_part(slide_part):
+            rid = slide_part.add_chart_part(xl_type, chart_data)
+            format_chart(slide_part.related_part(rid).chart)
+            return rid
+        slide.add_chart(left, top, width, height, add_part)
+        return None
+    from pptx.util import Inches
+    frame = slide.shapes.add_chart(
+        xl_type, Inches(left), Inches(top), Inches(width), Inches(height),
+        chart_data,
+    )
+    format_chart(frame.chart)
+    return frame
+
+
+def _format_chart(chart, chart_type, categories, colors, min_value,
+                  max_value, label_width, axes):
+    """Apply _add_chart's series colours, value range, plot area and axes.
+
+    An XY chart's x axis spans its x values exactly.
+    """
+    from pptx.dml.color import RGBColor
+    from pptx.oxml import parse_xml
+    from pptx.util import Pt
+
+    if colors is not None:
+        lines = chart_type.startswith(("LINE", "XY_"))
+        for ser, color in zip(chart.plots[0].series, colors):
+            if lines:
+                if color is None:
+                    ser.format.line.fill.background()
+                else:
+                    ser.format.line.color.rgb = RGBColor(*color)
+                    ser.format.line.width = Pt(2)
+                continue
+            if color is None:
+                ser.format.fill.background()
+            else:
+                ser.format.fill.solid()
+                ser.format.fill.fore_color.rgb = RGBColor(*color)
+            ser.format.line.fill.background()
+    if max_value is not None or min_value is not None:
+        chart.value_axis.minimum_scale = min_value or 0
+        if max_value is not None:
+            chart.value_axis.maximum_scale = max_value
+    if chart_type.startswith("XY_") and categories:
+        chart.category_axis.minimum_scale = min(categories)
+        chart.category_axis.maximum_scale = max(categories)
+    if label_width is not None:
+        c = 'xmlns:c="http://schemas.openxmlformats.org/drawingml/2006/chart"'
+        chart._chartSpace.chart.plotArea.insert(0, parse_xml(
+            f'<c:layout {c}><c:manualLayout><c:layoutTarget val="inner"/>'
+            f'<c:xMode val="edge"/><c:yMode val="edge"/>'
+            f'<c:x val="{label_width:.6f}"/><c:y val="0"/>'
+            f'<c:w val="{1 - label_width:.6f}"/><c:h val="1"/>'
+            f'</c:manualLayout></c:layout>'
+        ))
+    if not axes:
+        chart.has_title = False
+        chart.has_legend = False
+        for axis in (chart.category_axis, chart.value_axis):
+            axis.visible = False
+            axis.has_major_gridlines = False
+        _clear_chart_background(chart)
+
+
+def _clear_chart_background(chart):
+    """Let the slide show through the chart area."""
+    from pptx.oxml import parse_xml
+    c = 'xmlns:c="http://schemas.openxmlformats.org/drawingml/2006/chart"'
+    a = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    chart._chartSpace.chart.addnext(parse_xml(
+        f'<c:spPr {c} {a}><a:noFill/><a:ln><a:noFill/></a:ln></c:spPr>'
+    ))
+
+
+def _add_picture(slide, left, top, width, height, source):
+    """Add a picture of *source* (an image_cache.ImageSource).
+
+    The image is downscaled and recompressed for this size by the image
+    cache first. Identical pictures share one image part per deck.
+    """
+    SlideXml, DisplayList = _TARGETS or _targets()
+    if isinstance(slide, DisplayList):
+        slide.add_picture(left, top, width, height, source)
+        return None
+    image = image_cache().get(source, width, height)
+    descr = f"image.{image.ext}"
+    if isinstance(slide, SlideXml):
+        slide.add_picture(left, top, width, height, descr,
+                          lambda slide_part: _image_part(slide_part, image)[1])
+        return None
+    from pptx.util import Inches
+    image_part, rid = _image_part(slide.part, image)
+    shapes = slide.shapes
+    pic = shapes._add_pic_from_image_part(
+        image_part, rid, Inches(left), Inches(top), Inches(width),
+        Inches(height))
+    return shapes._shape_factory(pic)
+
+
+def _image_part(slide_part, image):
+    """(ImagePart, rId) of *image* (a PreparedImage), related to *slide_part*.
+
+    Image parts are looked up by hash in a table kept on the package itself
+    (python-pptx's own lookup walks every part in the package per picture).
+    The table holds parts weakly, so a picture's blob is freed with the last
+    slide using it: stream_deck() drops each slide once written, and its
+    writer dedupes the images it has written by hash alone.
+    """
+    import weakref
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.opc.packuri import PackURI
+    from pptx.parts.image import Image, ImagePart
+
+    package = slide_part.package
+    parts = package.__dict__.get("_images_by_sha1")
+    if parts is None:
+        parts = package._images_by_sha1 = weakref.WeakValueDictionary()
+        # part names are never reused, as in LiveDeck: one may already be
+        # the target of a saved relationship
+        package._image_count = sum(
+            1 for part in package.iter_parts()
+            if part.partname.startswith("/ppt/media/image"))
+    blob = Image.from_blob(image.data)
+    part = parts.get(blob.sha1)
+    if part is None:
+        package._image_count += 1
+        part = parts[blob.sha1] = ImagePart(
+            PackURI(f"/ppt/media/image{package._image_count}.{blob.ext}"),
+            blob.content_type, package, blob.blob, blob.filename)
+    return part, slide_part.relate_to(part, RT.IMAGE)
+
+
+_IMAGES = None
+
+
+def image_cache():
+    """The ImageCache image slides are prepared through (on disk under
+    IMAGE_CACHE_DIR); replace it with set_image_cache()."""
+    global _IMAGES
+    if _IMAGES is None:
+        from utils.image_cache import ImageCache
+        _IMAGES = ImageCache(IMAGE_CACHE_DIR)
+    return _IMAGES
+
+
+def set_image_cache(cache):
+    global _IMAGES
+    _IMAGES = cache
+
+
+def _format_cell(cell, fmt):
+    from pptx.dml.color import RGBColor
+    from pptx.enum.text import PP_ALIGN
+    from pptx.util import Pt
+    if fmt.get("fill") is not None:
+        cell.fill.solid()
+        cell.fill.fore_color.rgb = RGBColor(*fmt["fill"])
+    p = cell.text_frame.paragraphs[0]
+    if fmt.get("size") is not None:
+        p.font.size = Pt(fmt["size"])
+    if fmt.get("bold") is not None:
+        p.font.bold = fmt["bold"]
+    if fmt.get("color") is not None:
+        p.font.color.rgb = RGBColor(*fmt["color"])
+    if fmt.get("align") is not None:
+        p.alignment = PP_ALIGN.from_xml(fmt["align"])
+
+
+def table_style_colors(theme) -> dict:
+    """Colours of each TABLE_STYLE_IDS style in *theme*, as table_style() takes them."""
+    colors = {"header_fill": theme["header_bg"],
+              "header_text": theme["header_text"],
+              "body_text": theme["body_text"]}
+    return {
+        "table": dict(colors, bands=(theme["row_even"], theme["row_odd"])),
+        # the Gantt's month row is the first banded row, so its task rows
+        # start on the second band
+        "gantt": dict(colors, bands=(theme["row_odd"], theme["row_even"])),
+    }
+
+
+def _install_table_styles(prs, theme):
+    """Write the TABLE_STYLE_IDS styles, in *theme*'s colours, into *prs*."""
+    from utils.pptx_xml import set_table_styles, table_style
+    styles = table_style_colors(theme)
+    set_table_styles(prs, [
+        table_style(TABLE_STYLE_IDS["table"], "Scale Table", **styles["table"]),
+        table_style(TABLE_STYLE_IDS["gantt"], "Scale Gantt", **styles["gantt"]),
+    ])
+
+
+def _add_title_divider(slide, theme):
+    _add_shape(slide, "rect", MARGIN, 1.15, W - 2 * MARGIN, 0.02,
+               fill=theme["divider"])
+
+
 def _render_title(slide, data, theme):
     _set_bg(slide, theme["slide_bg"])
 
     # Accent bar
-    bar = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE,
-        Inches(MARGIN), Inches(2.8), Inches(1.2), Inches(0.06),
-    )
-    bar.fill.solid()
-    bar.fill.fore_color.rgb = theme["accent"]
-    bar.line.fill.background()
+    _add_shape(slide, "rect", MARGIN, 2.8, 1.2, 0.06, fill=theme["accent"])
 
     _add_text(slide, MARGIN, 3.0, W - 2 * MARGIN, 1.2,
-              data["title"], size=36, bold=True, color=theme["title_text"])
+              data["title"], size=36, bold=True, color=theme["title_text"],
+              shrink=True)
     if data.get("subtitle"):
         _add_text(slide, MARGIN, 4.2, W - 2 * MARGIN, 0.5,
-                  data["subtitle"], size=16, color=theme["subtitle_text"])
+                  data["subtitle"], size=16, color=theme["subtitle_text"],
+                  shrink=True)
 
 
 def _render_section(slide, data, theme):
@@ -244,65 +710,53 @@ def _render_section(slide, data, theme):
 
     _add_text(slide, MARGIN, 2.8, W - 2 * MARGIN, 1.0,
               data["title"], size=32, bold=True,
-              color=RGBColor(255, 255, 255), align=PP_ALIGN.LEFT)
+              color=WHITE, align=ALIGN_LEFT, shrink=True)
 
-    bar = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE,
-        Inches(MARGIN), Inches(3.8), Inches(1.5), Inches(0.05),
-    )
-    bar.fill.solid()
-    bar.fill.fore_color.rgb = RGBColor(255, 255, 255)
-    bar.line.fill.background()
+    _add_shape(slide, "rect", MARGIN, 3.8, 1.5, 0.05,
+               fill=WHITE)
 
 
 def _render_content(slide, data, theme):
     _set_bg(slide, theme["slide_bg"])
 
     _add_text(slide, MARGIN, 0.5, W - 2 * MARGIN, 0.6,
-              data["title"], size=28, bold=True, color=theme["title_text"])
+              data["title"], size=28, bold=True, color=theme["title_text"],
+              shrink=True)
 
     # Divider line under title
-    line = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE,
-        Inches(MARGIN), Inches(1.15), Inches(W - 2 * MARGIN), Inches(0.02),
-    )
-    line.fill.solid()
-    line.fill.fore_color.rgb = theme["divider"]
-    line.line.fill.background()
+    _add_title_divider(slide, theme)
 
     bullets = data.get("bullets", [])
-    top = 1.4
+    top, pitch, text_h = LIST_GEOMETRY["content"]
+    if data.get("mode") == "native":
+        if bullets:
+            # text and bullet land where the textboxes and dots would
+            _add_bullets(slide, MARGIN, top, W - 2 * MARGIN,
+                         (len(bullets) - 1) * pitch + text_h, bullets, size=16, color=theme["body_text"],
+                         bullet_color=theme["bullet_color"],
+                         indent=0.35, hanging=0.4, pitch=pitch)
+        return
     for bullet in bullets:
         # Bullet dot
-        dot = slide.shapes.add_shape(
-            MSO_SHAPE.OVAL,
-            Inches(MARGIN + 0.05), Inches(top + 0.12),
-            Inches(0.12), Inches(0.12),
-        )
-        dot.fill.solid()
-        dot.fill.fore_color.rgb = theme["bullet_color"]
-        dot.line.fill.background()
+        _add_shape(slide, "ellipse", MARGIN + 0.05, top + 0.12, 0.12, 0.12,
+                   fill=theme["bullet_color"])
 
-        _add_text(slide, MARGIN + 0.35, top, W - 2 * MARGIN - 0.35, 0.4,
+        _add_text(slide, MARGIN + 0.35, top, W - 2 * MARGIN - 0.35, text_h,
                   bullet, size=16, color=theme["body_text"])
-        top += 0.55
+        top += pitch
 
 
 def _render_two_column(slide, data, theme):
     _set_bg(slide, theme["slide_bg"])
 
     _add_text(slide, MARGIN, 0.5, W - 2 * MARGIN, 0.6,
-              data["title"], size=28, bold=True, color=theme["title_text"])
+              data["title"], size=28, bold=True, color=theme["title_text"],
+              shrink=True)
 
-    line = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE,
-        Inches(MARGIN), Inches(1.15), Inches(W - 2 * MARGIN), Inches(0.02),
-    )
-    line.fill.solid()
-    line.fill.fore_color.rgb = theme["divider"]
-    line.line.fill.background()
+    _add_title_divider(slide, theme)
 
     col_w = (W - 2 * MARGIN - 0.5) / 2
+    first_top, pitch, text_h = LIST_GEOMETRY["two_column"]
     for col_idx, (title_key, bullets_key) in enumerate([
         ("left_title", "left_bullets"),
         ("right_title", "right_bullets"),
@@ -312,37 +766,36 @@ def _render_two_column(slide, data, theme):
         # Column header
         _add_text(slide, x, 1.4, col_w, 0.5,
                   data.get(title_key, ""), size=18, bold=True,
-                  color=theme["accent"])
-
-        top = 2.0
-        for bullet in data.get(bullets_key, []):
-            dot = slide.shapes.add_shape(
-                MSO_SHAPE.OVAL,
-                Inches(x + 0.05), Inches(top + 0.1),
-                Inches(0.1), Inches(0.1),
-            )
-            dot.fill.solid()
-            dot.fill.fore_color.rgb = theme["bullet_color"]
-            dot.line.fill.background()
+                  color=theme["accent"], shrink=True)
+
+        bullets = data.get(bullets_key, [])
+        if data.get("mode") == "native":
+            if bullets:
+                _add_bullets(slide, x, first_top, col_w,
+                             (len(bullets) - 1) * pitch + text_h, bullets,
+                             size=14, color=theme["body_text"],
+                             bullet_color=theme["bullet_color"],
+                             indent=0.3, hanging=0.35, pitch=pitch)
+            continue
 
-            _add_text(slide, x + 0.3, top, col_w - 0.3, 0.35,
+        top = first_top
+        for bullet in bullets:
+            _add_shape(slide, "ellipse", x + 0.05, top + 0.1, 0.1, 0.1,
+                       fill=theme["bullet_color"])
+
+            _add_text(slide, x + 0.3, top, col_w - 0.3, text_h,
                       bullet, size=14, color=theme["body_text"])
-            top += 0.48
+            top += pitch
 
 
 def _render_metrics(slide, data, theme):
     _set_bg(slide, theme["slide_bg"])
 
     _add_text(slide, MARGIN, 0.5, W - 2 * MARGIN, 0.6,
-              data["title"], size=28, bold=True, color=theme["title_text"])
+              data["title"], size=28, bold=True, color=theme["title_text"],
+              shrink=True)
 
-    line = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE,
-        Inches(MARGIN), Inches(1.15), Inches(W - 2 * MARGIN), Inches(0.02),
-    )
-    line.fill.solid()
-    line.fill.fore_color.rgb = theme["divider"]
-    line.line.fill.background()
+    _add_title_divider(slide, theme)
 
     metrics = data.get("metrics", [])
     count = len(metrics)
@@ -352,229 +805,507 @@ def _render_metrics(slide, data, theme):
     gap = 0.3
     total_gap = gap * (count - 1)
     card_w = (W - 2 * MARGIN - total_gap) / count
-    card_h = 2.2
+    trends = any(m.get("trend") for m in metrics)
+    card_h = 3.3 if trends else 2.2
     card_top = 2.0
+    palette = theme["bar_palette"]
 
     for i, m in enumerate(metrics):
         x = MARGIN + i * (card_w + gap)
 
         # Card background
-        card = slide.shapes.add_shape(
-            MSO_SHAPE.ROUNDED_RECTANGLE,
-            Inches(x), Inches(card_top),
-            Inches(card_w), Inches(card_h),
-        )
-        card.fill.solid()
-        card.fill.fore_color.rgb = theme["card_bg"]
-        card.line.color.rgb = theme["card_border"]
-        card.line.width = Pt(1)
+        _add_shape(slide, "roundRect", x, card_top, card_w, card_h,
+                   fill=theme["card_bg"], line=theme["card_border"],
+                   line_width=1)
 
         # Accent bar at top of card
-        accent = slide.shapes.add_shape(
-            MSO_SHAPE.RECTANGLE,
-            Inches(x), Inches(card_top),
-            Inches(card_w), Inches(0.06),
-        )
-        accent.fill.solid()
-        accent.fill.fore_color.rgb = _BAR_PALETTE_DARK[i % len(_BAR_PALETTE_DARK)] \
-            if theme is THEMES["dark"] else _BAR_PALETTE_LIGHT[i % len(_BAR_PALETTE_LIGHT)]
-        accent.line.fill.background()
+        _add_shape(slide, "rect", x, card_top, card_w, 0.06,
+                   fill=palette[i % len(palette)])
 
         # Value
         _add_text(slide, x + 0.2, card_top + 0.3, card_w - 0.4, 0.8,
-                  m["value"], size=32, bold=True,
-                  color=theme["title_text"], align=PP_ALIGN.CENTER)
+                  str(m["value"]), size=32, bold=True,
+                  color=theme["title_text"], align=ALIGN_CENTER, shrink=True)
 
         # Label
         _add_text(slide, x + 0.2, card_top + 1.1, card_w - 0.4, 0.4,
-                  m["label"], size=13, bold=True,
-                  color=theme["subtitle_text"], align=PP_ALIGN.CENTER)
+                  str(m["label"]), size=13, bold=True,
+                  color=theme["subtitle_text"], align=ALIGN_CENTER,
+                  shrink=True)
 
         # Detail
         if m.get("detail"):
             _add_text(slide, x + 0.2, card_top + 1.55, card_w - 0.4, 0.35,
-                      m["detail"], size=11,
-                      color=theme["muted_text"], align=PP_ALIGN.CENTER)
+                      str(m["detail"]), size=11,
+                      color=theme["muted_text"], align=ALIGN_CENTER,
+                      shrink=True)
+
+        # Sparkline of the trend behind the value
+        if m.get("trend"):
+            _add_sparkline(slide, x + 0.2, card_top + 2.05, card_w - 0.4,
+                           1.0, m["trend"], palette[i % len(palette)])
+
+
+def _add_sparkline(slide, left, top, width, height, values, color):
+    """A bare line chart of *values*, LTTB-downsampled, filling its box."""
+    from utils import chart_series
+    values = list(values)
+    xs = [float(i) for i in range(len(values))]
+    keep = chart_series.lttb(xs, values, CHART_POINTS["trend"])
+    values = [values[i] for i in keep]
+    low, high = min(values), max(values)
+    if low == high:
+        low, high = low - 1, high + 1
+    _add_chart(slide, left, top, width, height,
+               "XY_SCATTER_LINES_NO_MARKERS", [xs[i] for i in keep],
+               [("Trend", values)], colors=[color], min_value=low,
+               max_value=high, axes=False)
 
 
 def _render_table(slide, data, theme):
     _set_bg(slide, theme["slide_bg"])
 
     _add_text(slide, MARGIN, 0.5, W - 2 * MARGIN, 0.6,
-              data["title"], size=28, bold=True, color=theme["title_text"])
+              data["title"], size=28, bold=True, color=theme["title_text"],
+              shrink=True)
 
+    # a source or generator of rows, when laid out directly rather than
+    # through paginate(), is read in whole
+    data = _read_source(data)
     headers = data.get("headers", [])
     rows = data.get("rows", [])
     if not headers:
         return
 
-    n_cols = len(headers)
     n_rows = 1 + len(rows)
     tbl_w = W - 2 * MARGIN
-    tbl_top = 1.4
-
-    table_shape = slide.shapes.add_table(
-        n_rows, n_cols,
-        Inches(MARGIN), Inches(tbl_top),
-        Inches(tbl_w), Inches(0.45 * n_rows),
-    )
-    table = table_shape.table
-
-    col_w = tbl_w / n_cols
-    for c in range(n_cols):
-        table.columns[c].width = Inches(col_w)
-
-    # Header row
-    for c, h in enumerate(headers):
-        cell = table.cell(0, c)
-        cell.text = h
-        cell.fill.solid()
-        cell.fill.fore_color.rgb = theme["header_bg"]
-        p = cell.text_frame.paragraphs[0]
-        p.font.size = Pt(12)
-        p.font.bold = True
-        p.font.color.rgb = theme["header_text"]
-
-    # Data rows
-    for r, row_data in enumerate(rows):
-        bg = theme["row_odd"] if r % 2 == 1 else theme["row_even"]
-        for c, val in enumerate(row_data):
-            cell = table.cell(r + 1, c)
-            cell.text = str(val)
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = bg
-            p = cell.text_frame.paragraphs[0]
-            p.font.size = Pt(11)
-            p.font.color.rgb = theme["body_text"]
+    tbl_top, row_h, _ = LIST_GEOMETRY["table"]
+    col_widths = data.get("col_widths") or table_col_widths(headers, rows,
+                                                             tbl_w)
+
+    # header and row-band colours come from the "table" table style
+    header_size, body_size = TABLE_TEXT_SIZES
+    header_fmt = {"size": header_size}
+    body_fmt = {"size": body_size}
+    cells = [[(str(h), header_fmt) for h in headers]]
+    cells += [[(str(val), body_fmt) for val in row_data] for row_data in rows]
+
+    _add_table(slide, MARGIN, tbl_top, tbl_w, row_h * n_rows,
+               col_widths, cells)
+
+
+def _bind_source(data: dict) -> dict:
+    """A table slide with its "source" opened as headers and lazy rows.
+
+    The slide's own "headers", if any, relabel the source's columns.
+    """
+    headers, rows = table_sources.open_source(data["source"])
+    if data.get("headers"):
+        if len(data["headers"]) != len(headers):
+            raise ValueError(
+                f"slide '{data['title']}': {len(data['headers'])} headers "
+                f"for {len(headers)} source columns")
+        headers = data["headers"]
+    bound = {key: value for key, value in data.items() if key != "source"}
+    bound.update(headers=headers, rows=rows)
+    return bound
+
+
+def _read_source(data: dict) -> dict:
+    """A table slide with every row of its "source", or of a generator of
+    rows, read in, for a slide that isn't paginated."""
+    bound = _bind_source(data) if "source" in data else dict(data)
+    bound["rows"] = list(bound.get("rows", []))
+    return bound
+
+
+def table_col_widths(headers, rows, total=W - 2 * MARGIN) -> list:
+    """Table column widths in inches, sized to each column's widest cell.
+
+    Spare width is shared out in proportion; when the content doesn't fit,
+    the widest columns give way (see text_metrics.fit_columns).
+    """
+    header_size, body_size = TABLE_TEXT_SIZES
+    # header text is bold through the table style
+    natural = [text_width(str(h), header_size, bold=True) for h in headers]
+    n_cols = len(natural)
+    for row in rows:
+        for c, val in enumerate(row[:n_cols]):
+            width = text_width(str(val), body_size)
+            if width > natural[c]:
+                natural[c] = width
+    return fit_columns([w + 2 * TEXT_INSET for w in natural], total)
+
+
+def _gantt_header(axis, theme, due=True):
+    """The two header rows of a Gantt table, as (cells, merges)."""
+    columns = axis.labels
+    total_cols = 1 + len(columns) + due
+
+    # Groups (quarters, merged across their months) over time columns. The
+    # "gantt" table style colours the group row and bands the task rows;
+    # the column row is the style's first body row, so it is coloured here.
+    hdr_fmts = [
+        {"size": 12, "align": ALIGN_CENTER},
+        {"fill": theme["header_bg"], "size": 12,
+         "color": theme["header_text"], "align": ALIGN_CENTER},
+    ]
+    group_row = [None] * total_cols
+    column_row = [None] * total_cols
+    group_row[0] = "Deliverable"
+    column_row[0] = ""
+    merges = []
+    for label, first, last in axis.groups:
+        group_row[1 + first] = label
+        if last > first:
+            merges.append(((0, 1 + first), (0, 1 + last)))
+    if due:
+        group_row[-1] = "Due Date"
+        merges.append(((0, total_cols - 1), (1, total_cols - 1)))
+    for c, label in enumerate(columns):
+        column_row[1 + c] = label
+
+    cells = [
+        [(text, hdr_fmts[0]) for text in group_row],
+        [(text, hdr_fmts[1]) for text in column_row],
+    ]
+    return cells, merges
 
 
 def _render_gantt(slide, data, theme):
     _set_bg(slide, theme["slide_bg"])
 
-    months = data.get("months", [])
-    quarters = data.get("quarters", [])
-    phases = data.get("phases", [])
-    tasks = data.get("tasks", [])
+    g = GANTT_GEOMETRY
+    tasks = list(data.get("tasks", []))
+    axis = gantt_layout.resolve_axis(data, tasks)
+    columns = axis.labels
 
-    palette = _BAR_PALETTE_DARK if theme is THEMES["dark"] else _BAR_PALETTE_LIGHT
+    palette = theme["bar_palette"]
+    phases = data.get("phases", [])
     bar_colors = {ph: palette[i % len(palette)] for i, ph in enumerate(phases)}
-    fallback = RGBColor(148, 163, 184)
-
-    tbl_left = 0.5
-    tbl_top = 1.08
-    phase_w = 2.7
-    chart_w = 5.6
-    due_w = 1.1
-    hdr_h = 0.4
-    row_h = 0.38
-    bar_h = 0.22
-    bar_pad = 0.03
-    month_w = chart_w / len(months) if months else 1
-    chart_left = tbl_left + phase_w
+    fallback = (148, 163, 184)
+
+    col_w = g["chart_w"] / len(columns) if columns else 1
 
     if data.get("subtitle"):
-        _add_text(slide, tbl_left, 0.15, 9, 0.3,
+        _add_text(slide, g["left"], 0.15, 9, 0.3,
                   data["subtitle"], size=9, color=theme["subtitle_text"])
 
-    _add_text(slide, tbl_left, 0.4, 9, 0.55,
-              data["title"], size=26, bold=True, color=theme["title_text"])
-
-    total_rows = 2 + len(tasks)
-    total_cols = 1 + len(months) + 1
-    due_col = total_cols - 1
+    _add_text(slide, g["left"], 0.4, 9, 0.55,
+              data["title"], size=26, bold=True, color=theme["title_text"],
+              shrink=True)
 
-    table_shape = slide.shapes.add_table(
-        total_rows, total_cols,
-        Inches(tbl_left), Inches(tbl_top),
-        Inches(phase_w + chart_w + due_w),
-        Inches(hdr_h * 2 + len(tasks) * row_h),
+    shapes = gantt_layout.bar_geometry(
+        axis, tasks, left=g["left"] + g["name_w"],
+        top=g["top"] + g["header_h"] * 2, width=g["chart_w"],
+        row_h=g["row_h"], bar_h=g["bar_h"], bar_pad=g["bar_pad"],
+        min_bar_w=g["min_bar_w"], milestone=g["milestone"],
     )
-    table = table_shape.table
 
-    for r in range(2):
-        for c in range(total_cols):
-            cell = table.cell(r, c)
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = theme["header_bg"]
-            p = cell.text_frame.paragraphs[0]
-            p.font.color.rgb = theme["header_text"]
-            p.font.size = Pt(12)
-            p.font.bold = (r == 0)
-            p.alignment = PP_ALIGN.CENTER
-
-    table.cell(0, 0).text = "Deliverable"
-    if quarters:
-        mpq = len(months) // len(quarters) if quarters else len(months)
-        for i, q in enumerate(quarters):
-            cs = 1 + i * mpq
-            ce = min(1 + (i + 1) * mpq - 1, len(months))
-            table.cell(0, cs).text = q
-            if ce > cs:
-                table.cell(0, cs).merge(table.cell(0, ce))
-
-    table.cell(0, due_col).text = "Due Date"
-    table.cell(0, due_col).merge(table.cell(1, due_col))
-
-    table.cell(1, 0).text = ""
-    for c, m in enumerate(months):
-        table.cell(1, 1 + c).text = m
-
-    table.columns[0].width = Inches(phase_w)
-    for c in range(1, due_col):
-        table.columns[c].width = Inches(month_w)
-    table.columns[due_col].width = Inches(due_w)
-
-    for row in range(2, total_rows):
-        task = tasks[row - 2]
-        bg = theme["row_odd"] if (row - 2) % 2 == 1 else theme["row_even"]
-        for c in range(total_cols):
-            cell = table.cell(row, c)
-            if c == 0:
-                cell.text = task[1]
-            elif c == due_col and task[5]:
-                cell.text = task[5]
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = bg
-            if c == 0:
-                p = cell.text_frame.paragraphs[0]
-                p.font.size = Pt(10)
-                p.font.color.rgb = theme["body_text"]
-                p.alignment = PP_ALIGN.LEFT
-            elif c == due_col:
-                p = cell.text_frame.paragraphs[0]
-                p.font.size = Pt(10)
-                p.font.color.rgb = theme["muted_text"]
-                p.alignment = PP_ALIGN.RIGHT
-
-    chart_top = tbl_top + hdr_h * 2
-    for i, task in enumerate(tasks):
-        phase, _, start_m, end_m, is_milestone, _ = task
-        color = bar_colors.get(phase, fallback)
-        row_top = chart_top + i * row_h
-        cy = row_top + row_h / 2
-
-        if is_milestone:
-            sz = 0.18
-            cx = chart_left + (start_m + 0.5) * month_w
-            shape = slide.shapes.add_shape(
-                MSO_SHAPE.DIAMOND,
-                Inches(cx - sz / 2), Inches(cy - sz / 2),
-                Inches(sz), Inches(sz),
-            )
-            shape.fill.solid()
-            shape.fill.fore_color.rgb = color
-            shape.line.fill.background()
-        else:
-            bt = row_top + (row_h - bar_h) / 2
-            bl = chart_left + start_m * month_w + bar_pad
-            bw = max(0.25, (end_m - start_m + 1) * month_w - 2 * bar_pad)
-            shape = slide.shapes.add_shape(
-                MSO_SHAPE.ROUNDED_RECTANGLE,
-                Inches(bl), Inches(bt), Inches(bw), Inches(bar_h),
-            )
-            shape.fill.solid()
-            shape.fill.fore_color.rgb = color
-            shape.line.fill.background()
+    if data.get("mode") == "chart":
+        cells, merges = _gantt_header(axis, theme, due=False)
+        _add_table(slide, g["left"], g["top"], g["name_w"] + g["chart_w"],
+                   g["header_h"] * 2, [g["name_w"]] + [col_w] * len(columns),
+                   cells, merges, style="gantt")
+        if tasks:
+            _add_gantt_chart(slide, tasks, shapes, axis, phases, bar_colors,
+                             fallback, theme)
+        return
+
+    # Task rows: name | empty time cells (bars drawn on top) | due date
+    cells, merges = _gantt_header(axis, theme)
+    name_fmts = {}   # one shared fmt per (shrunk) name size
+    month_fmt = {}
+    due_fmt = {"size": 10, "color": theme["muted_text"], "align": ALIGN_RIGHT}
+    for task in tasks:
+        size = _fit_size(task[1], g["name_w"], 10)
+        name_fmt = name_fmts.setdefault(size, {"size": size})
+        cells.append(
+            [(task[1], name_fmt)]
+            + [(None, month_fmt)] * len(columns)
+            + [(gantt_layout.due_text(task[5]), due_fmt)]
+        )
+
+    _add_table(slide, g["left"], g["top"],
+               g["name_w"] + g["chart_w"] + g["due_w"],
+               g["header_h"] * 2 + len(tasks) * g["row_h"],
+               [g["name_w"]] + [col_w] * len(columns) + [g["due_w"]],
+               cells, merges, style="gantt")
+
+    for prst, left, top, width, height, phase in shapes:
+        _add_shape(slide, prst, left, top, width, height,
+                   fill=bar_colors.get(phase, fallback))
+
+
+def _add_gantt_chart(slide, tasks, shapes, axis, phases, bar_colors,
+                     fallback, theme):
+    """Draw the task rows of a "chart" mode Gantt as one stacked-bar chart.
+
+    Each task is a category. An invisible "Start" series offsets the bars;
+    every phase is a series of its own, so it takes the phase's colour,
+    with a value only on its own tasks. Values are in time columns, taken
+    from the same bar geometry the shapes mode draws.
+    """
+    g = GANTT_GEOMETRY
+    n_cols = len(axis.labels) or 1
+    col_w = g["chart_w"] / n_cols
+    chart_left = g["left"] + g["name_w"]
+    series = list(phases)
+    if any(task[0] not in bar_colors for task in tasks):
+        series.append("Other")
+    column = {name: i for i, name in enumerate(series)}
+
+    starts = []
+    spans = [[None] * len(tasks) for _ in series]
+    for i, (task, shape) in enumerate(zip(tasks, shapes)):
+        _, left, _, width, _, phase = shape
+        starts.append(round((left - chart_left) / col_w, 4))
+        spans[column.get(phase, len(series) - 1)][i] = round(width / col_w, 4)
+
+    # the plot area sits under the header's time columns, leaving the task
+    # name column for the category labels
+    _add_chart(slide, g["left"], g["top"] + g["header_h"] * 2,
+               g["name_w"] + g["chart_w"], len(tasks) * g["row_h"],
+               "BAR_STACKED", [task[1] for task in tasks],
+               [("Start", starts), *zip(series, spans)],
+               colors=[None] + [bar_colors.get(name, fallback)
+                                for name in series],
+               max_value=n_cols,
+               label_width=g["name_w"] / (g["name_w"] + g["chart_w"]),
+               # a partial rather than a closure, so display lists can hash it
+               style=partial(_style_gantt_chart, theme=theme))
+
+
+def _style_gantt_chart(chart, theme):
+    from pptx.dml.color import RGBColor
+    from pptx.enum.chart import XL_TICK_LABEL_POSITION, XL_TICK_MARK
+    from pptx.util import Pt
+
+    g = GANTT_GEOMETRY
+    chart.has_title = False
+    chart.has_legend = False
+    chart.font.size = Pt(10)
+    chart.font.color.rgb = RGBColor(*theme["body_text"])
+
+    plot = chart.plots[0]
+    plot.gap_width = round((g["row_h"] - g["bar_h"]) / g["bar_h"] * 100)
+    plot.overlap = 100
+
+    # task names run top to bottom, like the table rows they replace
+    categories = chart.category_axis
+    categories.reverse_order = True
+    categories.major_tick_mark = XL_TICK_MARK.NONE
+    categories.format.line.fill.background()
+
+    values = chart.value_axis
+    values.major_unit = 1
+    values.major_tick_mark = XL_TICK_MARK.NONE
+    values.tick_label_position = XL_TICK_LABEL_POSITION.NONE
+    values.format.line.fill.background()
+    values.has_major_gridlines = True
+    values.major_gridlines.format.line.color.rgb = RGBColor(*theme["divider"])
+
+    _clear_chart_background(chart)
+
+
+def _chart_title(slide, data, theme) -> float:
+    """Draw a chart slide's background, title and subtitle; returns the
+    top of the chart below them."""
+    _set_bg(slide, theme["slide_bg"])
+    _add_text(slide, MARGIN, 0.5, W - 2 * MARGIN, 0.6,
+              data["title"], size=28, bold=True, color=theme["title_text"],
+              shrink=True)
+    _add_title_divider(slide, theme)
+    if not data.get("subtitle"):
+        return 1.4
+    _add_text(slide, MARGIN, 1.3, W - 2 * MARGIN, 0.4,
+              data["subtitle"], size=14, color=theme["subtitle_text"],
+              shrink=True)
+    return 1.8
+
+
+def _chart_data(data) -> tuple:
+    """(x list or None, [(name, values), ...], points per series) of a line
+    or bar slide."""
+    series = [(s.get("name") or f"Series {i}", list(s.get("values", [])))
+              for i, s in enumerate(data.get("series", []), 1)]
+    n = max((len(values) for _, values in series), default=0)
+    for name, values in series:
+        if len(values) != n:
+            raise ValueError(f"slide '{data['title']}': series '{name}' has "
+                             f"{len(values)} values, expected {n}")
+    x = data.get("x")
+    if x is not None:
+        x = list(x)
+        if len(x) != n:
+            raise ValueError(f"slide '{data['title']}': {len(x)} x values "
+                             f"for {n} points")
+    return x, series, n
+
+
+def _render_line(slide, data, theme):
+    from utils import chart_series
+    top = _chart_title(slide, data, theme)
+    x, series, n = _chart_data(data)
+    if not n:
+        return
+
+    # keep the LTTB points of every series, at shared x values
+    x = chart_series.x_values(x, n)
+    xs = x.values if x.kind != "label" else [float(i) for i in range(n)]
+    keep = chart_series.downsample(
+        xs, [values for _, values in series],
+        int(data.get("points", CHART_POINTS["line"])))
+    categories = [x.values[i] for i in keep]
+    series = [(name, [values[i] for i in keep]) for name, values in series]
+    low, high = chart_series.value_range(
+        min(min(values) for _, values in series),
+        max(max(values) for _, values in series))
+
+    palette = theme["bar_palette"]
+    x_format = None
+    if x.kind == "date":
+        x_format = chart_series.date_format(categories[-1] - categories[0])[0]
+    _add_chart(slide, MARGIN, top, W - 2 * MARGIN, PAGE_BOTTOM - top,
+               "LINE" if x.kind == "label" else "XY_SCATTER_LINES_NO_MARKERS",
+               categories, series,
+               colors=[palette[i % len(palette)] for i in range(len(series))],
+               min_value=low, max_value=high,
+               style=partial(_style_series_chart, theme=theme,
+                             legend=len(series) > 1, x_format=x_format))
+
+
+def _render_bar(slide, data, theme):
+    from utils import chart_series
+    top = _chart_title(slide, data, theme)
+    x, series, n = _chart_data(data)
+    if not n:
+        return
+
+    # one bar per bucket of consecutive points, labelled by its first x
+    # (only those, and the last, are parsed)
+    spans = chart_series.buckets(
+        n, int(data.get("points", CHART_POINTS["bar"])))
+    how = data.get("aggregate", "mean")
+    series = [(name, chart_series.aggregate(values, spans, how))
+              for name, values in series]
+    picks = [start for start, _ in spans] + [n - 1]
+    x = chart_series.x_values(
+        picks if x is None else [x[i] for i in picks], len(picks))
+    starts = x.values[:-1]
+    if x.kind == "date":
+        fmt = chart_series.date_format(x.values[-1] - x.values[0])[1]
+        categories = [chart_series.date_label(v, fmt) for v in starts]
+    elif x.kind == "number":
+        categories = [f"{v:g}" for v in starts]
+    else:
+        categories = starts
+    low, high = chart_series.value_range(
+        min(0, *(min(values) for _, values in series)),
+        max(0, *(max(values) for _, values in series)))
+
+    palette = theme["bar_palette"]
+    across = data.get("mode") == "bar"
+    _add_chart(slide, MARGIN, top, W - 2 * MARGIN, PAGE_BOTTOM - top,
+               "BAR_CLUSTERED" if across else "COLUMN_CLUSTERED",
+               categories, series,
+               colors=[palette[i % len(palette)] for i in range(len(series))],
+               min_value=low, max_value=high,
+               style=partial(_style_series_chart, theme=theme,
+                             legend=len(series) > 1, reverse=across))
+
+
+def _style_series_chart(chart, theme, legend=False, x_format=None,
+                        reverse=False):
+    from pptx.dml.color import RGBColor
+    from pptx.enum.chart import XL_LEGEND_POSITION, XL_TICK_MARK
+    from pptx.util import Pt
+
+    chart.has_title = False
+    chart.font.size = Pt(10)
+    chart.font.color.rgb = RGBColor(*theme["body_text"])
+    chart.has_legend = legend
+    if legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+
+    for axis in (chart.category_axis, chart.value_axis):
+        axis.major_tick_mark = XL_TICK_MARK.NONE
+        axis.format.line.color.rgb = RGBColor(*theme["divider"])
+    chart.category_axis.has_major_gridlines = False
+    chart.value_axis.has_major_gridlines = True
+    chart.value_axis.major_gridlines.format.line.color.rgb = \
+        RGBColor(*theme["divider"])
+    if x_format is not None:
+        labels = chart.category_axis.tick_labels
+        labels.number_format = x_format
+        labels.number_format_is_linked = False
+    # bars run top to bottom in category order, as in a table
+    if reverse:
+        chart.category_axis.reverse_order = True
+    _clear_chart_background(chart)
+
+
+def _image_boxes(data, source) -> tuple:
+    """(picture box, caption box or None) of an image slide, in inches.
+
+    The picture keeps its aspect ratio, as large as fits the area below
+    the title (or the top margin) and above the caption, centred in it.
+    The caption sits just under the picture.
+    """
+    g = IMAGE_GEOMETRY
+    top = g["top"] if data.get("title") else g["untitled_top"]
+    bottom = PAGE_BOTTOM
+    if data.get("caption"):
+        bottom -= g["caption_h"] + g["caption_gap"]
+    area_w, area_h = W - 2 * MARGIN, bottom - top
+    scale = min(area_w / source.width, area_h / source.height)
+    width, height = source.width * scale, source.height * scale
+    left = MARGIN + (area_w - width) / 2
+    top += (area_h - height) / 2
+    caption = None
+    if data.get("caption"):
+        caption = (MARGIN, top + height + g["caption_gap"], area_w,
+                   g["caption_h"])
+    return (left, top, width, height), caption
+
+
+def _render_image(slide, data, theme):
+    _set_bg(slide, theme["slide_bg"])
+
+    if data.get("title"):
+        _add_text(slide, MARGIN, 0.5, W - 2 * MARGIN, 0.6,
+                  data["title"], size=28, bold=True, color=theme["title_text"],
+                  shrink=True)
+        _add_title_divider(slide, theme)
+
+    source = image_cache().source(data["image"])
+    box, caption = _image_boxes(data, source)
+    _add_picture(slide, *box, source)
+    if caption:
+        _add_text(slide, *caption, data["caption"], size=14,
+                  color=theme["subtitle_text"], align=ALIGN_CENTER,
+                  shrink=True)
+
+
+def _prefetch_images(slides):
+    """Yield *slides* IMAGE_PREFETCH slides behind reading them.
+
+    Reading ahead hands the pictures of upcoming image slides to the image
+    cache's thread pool, so they are decoded and recompressed in parallel
+    while earlier slides render.
+    """
+    ahead = deque()
+    for data in slides:
+        if data.get("layout") == "image" and "image" in data:
+            cache = image_cache()
+            source = cache.source(data["image"])
+            box, _ = _image_boxes(data, source)
+            cache.submit(source, box[2], box[3])
+        ahead.append(data)
+        if len(ahead) > IMAGE_PREFETCH:
+            yield ahead.popleft()
+    yield from ahead
 
 
 RENDERERS = {
@@ -585,40 +1316,1277 @@ RENDERERS = {
     "metrics": _render_metrics,
     "table": _render_table,
     "gantt": _render_gantt,
+    "line": _render_line,
+    "bar": _render_bar,
+    "image": _render_image,
+}
+
+
+# Keys each layout reads, as deck_spec schemas ("!" marks required keys).
+# Every layout also takes "layout" and "paginate", and "mode" where
+# LAYOUT_MODES lists modes for it.
+SLIDE_SCHEMAS = {
+    "title": {"title": "text!", "subtitle": "text"},
+    "section": {"title": "text!"},
+    "content": {"title": "text!", "bullets": ["text"]},
+    "two_column": {"title": "text!", "left_title": "text",
+                   "left_bullets": ["text"], "right_title": "text",
+                   "right_bullets": ["text"]},
+    "metrics": {"title": "text!",
+                "metrics": [{"label": "scalar!", "value": "scalar!",
+                             "detail": "scalar", "trend": ["number"]}]},
+    "table": {"title": "text!", "headers": ["scalar"], "rows": [["scalar"]],
+              "col_widths": ["number"], "source": "source"},
+    "gantt": {"title": "text!", "subtitle": "text", "quarters": ["text"],
+              "months": ["text"], "phases": ["text"], "tasks": ["task"],
+              "start": "date", "end": "date",
+              "scale": gantt_layout.SCALES},
+    "line": {"title": "text!", "subtitle": "text", "x": ["scalar"],
+             "series": [{"name": "text", "values": ["number"]}],
+             "points": "number"},
+    "bar": {"title": "text!", "subtitle": "text", "x": ["scalar"],
+            "series": [{"name": "text", "values": ["number"]}],
+            "points": "number", "aggregate": "aggregate"},
+    "image": {"title": "text", "image": "text!", "caption": "text"},
+}
+
+
+def _check_task(task):
+    if isinstance(task, (str, dict)) or not isinstance(task, (list, tuple)) \
+            or len(task) != 6:
+        return ("tasks are (phase, name, start, end, is_milestone, "
+                "due_date)")
+    problem = gantt_layout.span_problem(task[2], task[3])
+    if problem:
+        return f"task '{task[1]}': {problem}"
+
+
+def _check_table(slide):
+    if "source" in slide and "rows" in slide:
+        return "give either 'rows' or a 'source', not both"
+
+
+def _check_aggregate(how):
+    # chart_series is loaded only for slides that name an aggregate
+    from utils.chart_series import AGGREGATES
+    if how not in AGGREGATES:
+        return f"'{how}' is not one of {', '.join(AGGREGATES)}"
+
+
+def _check_gantt(slide):
+    tasks = slide.get("tasks")
+    if isinstance(tasks, (list, tuple)):
+        return gantt_layout.tasks_problem(tasks)
+
+
+# Checks across a slide's keys, run once its schema passes
+SLIDE_CHECKS = {
+    "table": _check_table,
+    "gantt": _check_gantt,
+}
+
+_VALIDATORS = {}
+
+
+def _slide_validator(layout: str):
+    """The compiled schema for *layout*, compiled on first use."""
+    validator = _VALIDATORS.get(layout)
+    if validator is None:
+        schema = dict(SLIDE_SCHEMAS[layout], layout=tuple(RENDERERS),
+                      paginate="bool")
+        if layout in LAYOUT_MODES:
+            schema["mode"] = LAYOUT_MODES[layout]
+        validator = _VALIDATORS[layout] = deck_spec.compile_schema(
+            schema, {"task": _check_task, "aggregate": _check_aggregate,
+                     "source": table_sources.source_problem})
+    return validator
+
+
+def validate_slide(slide, n: int = 1) -> list:
+    """Problems with slide number *n*, checked against its layout's schema.
+
+    Lists given as generators are accepted without checking their items,
+    so validating never consumes them.
+    """
+    if not isinstance(slide, dict):
+        return [f"slide {n}: expected a dict, got {type(slide).__name__}"]
+    layout = slide.get("layout", "content")
+    if layout not in RENDERERS:
+        return [f"slide {n}: unknown layout '{layout}'"]
+    problems = _slide_validator(layout)(slide)
+    if not problems and layout in SLIDE_CHECKS:
+        problem = SLIDE_CHECKS[layout](slide)
+        problems = [problem] if problem else []
+    return [f"slide {n} ({layout}): {problem}" for problem in problems]
+
+
+def filename_problem(name) -> str:
+    """What is wrong with a deck's ``filename``, or None.
+
+    Output paths are built from it, so it must be a bare file name: no
+    path separators, no "..", no control characters.
+    """
+    if not isinstance(name, str) or not name.strip():
+        return "filename: expected non-empty text"
+    if "/" in name or "\\" in name or ".." in name:
+        return f"filename '{name}': path separators and '..' are not allowed"
+    if any(ord(ch) < 32 or ord(ch) == 127 for ch in name):
+        return f"filename {name!r}: control characters are not allowed"
+    return None
+
+
+def validate_deck(deck: dict) -> list:
+    """Return a list of problems that would stop *deck* rendering correctly.
+
+    Each slide is checked against SLIDE_SCHEMAS without importing
+    python-pptx, so it is cheap enough to run before every render. Slides
+    that are a generator are consumed; use validated() to check them on
+    the way into rendering instead.
+    """
+    if not isinstance(deck, dict) or "slides" not in deck:
+        return ["deck must be a dict with a 'slides' list"]
+    problems = []
+    if "filename" in deck:
+        problem = filename_problem(deck["filename"])
+        if problem:
+            problems.append(problem)
+    if not isinstance(deck.get("base_dir", ""), str):
+        problems.append("base_dir: expected text")
+    for n, slide in enumerate(deck["slides"], 1):
+        problems.extend(validate_slide(slide, n))
+    return problems
+
+
+def validated(slides):
+    """Yield *slides*, raising ValueError at the first invalid one."""
+    for n, slide in enumerate(slides, 1):
+        problems = validate_slide(slide, n)
+        if problems:
+            raise ValueError("; ".join(problems))
+        yield slide
+
+
+def _with_base(data, base: Path):
+    """*data* with the relative path of its table source or image read
+    from *base*."""
+    if not isinstance(data, dict):
+        return data
+    if data.get("layout") == "image" and isinstance(data.get("image"), str):
+        return dict(data, image=str(base / data["image"]))
+    source = data.get("source")
+    if isinstance(source, dict):
+        for kind in table_sources.SOURCE_KINDS:
+            if isinstance(source.get(kind), str):
+                return dict(data, source=dict(source, **{
+                    kind: str(base / source[kind])}))
+    return data
+
+
+def deck_slides(deck: dict):
+    """The slides of *deck*, with relative file paths resolved.
+
+    Data files named by a slide are read relative to the deck's
+    ``base_dir`` (load_spec() sets it to the spec file's directory), or
+    to the working directory when it has none.
+    """
+    base = deck.get("base_dir")
+    if not base:
+        return deck["slides"]
+    base = Path(base)
+    return (_with_base(data, base) for data in deck["slides"])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PAGINATION — split long lists into continuation slides
+# ═══════════════════════════════════════════════════════════════════════════
+
+def page_capacity(layout: str) -> int:
+    """How many items of a LIST_GEOMETRY layout fit above PAGE_BOTTOM."""
+    top, pitch, item_h = LIST_GEOMETRY[layout]
+    # the epsilon keeps an item ending exactly on PAGE_BOTTOM on the page
+    return max(1, int((PAGE_BOTTOM - top - item_h) / pitch + 1e-9) + 1)
+
+
+def _chunks(items, size):
+    """Consecutive lists of up to *size* items; *items* may be any iterable."""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _fits(items, capacity) -> bool:
+    return isinstance(items, (list, tuple)) and len(items) <= capacity
+
+
+def _continuation(data: dict, page: int, **changes) -> dict:
+    title = data["title"] if page == 0 else CONTINUED_TITLE.format(title=data["title"])
+    return dict(data, title=title, **changes)
+
+
+def _split_list(data: dict, key: str, capacity: int):
+    items = data.get(key, [])
+    if _fits(items, capacity):
+        yield data
+        return
+    page = -1
+    for page, chunk in enumerate(_chunks(items, capacity)):
+        yield _continuation(data, page, **{key: chunk})
+    if page < 0:
+        yield dict(data, **{key: []})
+
+
+def _paginate_content(data):
+    return _split_list(data, "bullets", page_capacity("content"))
+
+
+def _row_height(row, widths, size, bold=False) -> float:
+    """Height of a table row, in inches, once its cells' text wraps to
+    *widths* (of the text, inside the cell insets): a row grows past
+    LIST_GEOMETRY's pitch for more lines."""
+    _, row_h, _ = LIST_GEOMETRY["table"]
+    lines = max(map(line_count, map(str, row), repeat(size), widths,
+                    repeat(bold)), default=1)
+    return max(row_h, lines * size * LINE_HEIGHT / 72 + 2 * TABLE_CELL_MARGIN)
+
+
+def _table_pages(headers, rows, col_widths):
+    """Consecutive lists of *rows* that fit below the header row on a page.
+
+    Each row is as tall as its most wrapped cell, so a page holds fewer
+    rows of long text; one forward pass, and *rows* may be a generator.
+    """
+    header_size, body_size = TABLE_TEXT_SIZES
+    top, _, _ = LIST_GEOMETRY["table"]
+    widths = [w - 2 * TEXT_INSET for w in col_widths]
+    # the epsilon keeps a row ending exactly on PAGE_BOTTOM on the page
+    room = PAGE_BOTTOM - top - _row_height(headers, widths, header_size,
+                                           bold=True) + 1e-9
+    page, used = [], 0.0
+    for row in rows:
+        height = _row_height(row, widths, body_size)
+        if page and used + height > room:
+            yield page
+            page, used = [], 0.0
+        page.append(row)
+        used += height
+    if page:
+        yield page
+
+
+def _paginate_table(data):
+    # The header row repeats on every page, and every page gets the column
+    # widths of the whole table (of its first page, when rows stream in,
+    # as they do from a "source"). Rows are measured in those widths, so a
+    # page ends early when cells wrap onto several lines.
+    if "source" in data:
+        data = _bind_source(data)
+    capacity = page_capacity("table") - 1
+    rows = data.get("rows", [])
+    if not data.get("headers"):
+        yield from _split_list(data, "rows", capacity)
+        return
+    widths = data.get("col_widths")
+    if widths is None:
+        sample = rows
+        if not isinstance(rows, (list, tuple)):
+            rows = iter(rows)
+            sample = list(islice(rows, capacity))
+            rows = chain(sample, rows)
+        widths = table_col_widths(data["headers"], sample)
+    pages = _table_pages(data["headers"], rows, widths)
+    if isinstance(rows, (list, tuple)):
+        first = next(pages, [])
+        if len(first) == len(rows):
+            yield data
+            return
+        pages = chain([first], pages)
+    page = -1
+    for page, chunk in enumerate(pages):
+        yield _continuation(data, page, rows=chunk, col_widths=widths)
+    if page < 0:
+        yield dict(data, rows=[], col_widths=widths)
+
+
+def _paginate_two_column(data):
+    capacity = page_capacity("two_column")
+    left = data.get("left_bullets", [])
+    right = data.get("right_bullets", [])
+    if _fits(left, capacity) and _fits(right, capacity):
+        yield data
+        return
+    pages = zip_longest(_chunks(left, capacity), _chunks(right, capacity),
+                        fillvalue=[])
+    for page, (left_chunk, right_chunk) in enumerate(pages):
+        yield _continuation(data, page, left_bullets=left_chunk,
+                            right_bullets=right_chunk)
+
+
+def _paginate_gantt(data):
+    capacity = page_capacity("gantt")
+    tasks = data.get("tasks", [])
+    if _fits(tasks, capacity):
+        yield data
+        return
+    # every page keeps the time axis the whole roadmap would have had
+    tasks = list(tasks)
+    pinned = gantt_layout.pin_axis(data, tasks)
+    for page, chunk in enumerate(_chunks(tasks, capacity)):
+        yield _continuation(data, page, tasks=chunk, **pinned)
+
+
+_PAGINATORS = {
+    "content": _paginate_content,
+    "two_column": _paginate_two_column,
+    "table": _paginate_table,
+    "gantt": _paginate_gantt,
 }
 
 
-def main(theme_name: str = "dark"):
-    theme = THEMES[theme_name]
+def paginate(slides):
+    """Yield *slides* with overflowing lists split into continuation slides.
+
+    Bullet lists, two-column lists, table rows and Gantt tasks that would
+    run past PAGE_BOTTOM are cut into pages of a fixed capacity, worked out
+    from LIST_GEOMETRY, in one forward pass. Continuation pages repeat the
+    title (with CONTINUED_TITLE), for tables the header row, and for Gantt
+    charts the time axis of the whole roadmap. Both
+    *slides* and the lists in it may be generators. Set ``"paginate":
+    False`` on a slide to leave it as is.
+    """
+    for data in slides:
+        paginator = _PAGINATORS.get(data.get("layout", "content"))
+        if not data.get("paginate", True) and \
+                data.get("layout") == "table":
+            # read here, not in the renderer, so the slide cache key is
+            # made from the rows rather than the name of their file or
+            # the address of their generator
+            yield _read_source(data)
+        elif paginator is None or not data.get("paginate", True):
+            yield data
+        else:
+            yield from paginator(data)
+
+
+TEMPLATE_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "templates"
+
+_BASE_TEMPLATE = None
+
+
+def _template_path() -> Path:
+    import pptx
+    return TEMPLATE_CACHE_DIR / f"base-pptx{pptx.__version__}-{W}x{H}.pptx"
+
+
+def _build_base_template() -> bytes:
+    """Build the base template: python-pptx's default deck, resized to W x H,
+    repacked uncompressed so each load skips inflating its parts."""
+    import zipfile
+    from pptx import Presentation
+    from pptx.util import Inches
 
     prs = Presentation()
     prs.slide_width = Inches(W)
     prs.slide_height = Inches(H)
-
-    for slide_data in DECK["slides"]:
+    src = io.BytesIO()
+    prs.save(src)
+    out = io.BytesIO()
+    with zipfile.ZipFile(src) as zin, \
+            zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zout:
+        for info in zin.infolist():
+            zout.writestr(info.filename, zin.read(info))
+    return out.getvalue()
+
+
+def _base_template() -> bytes:
+    """Return the base template as .pptx bytes, built once per machine.
+
+    The built template is kept under .cache/templates, keyed by python-pptx
+    version and slide size; later processes read that file instead of
+    rebuilding it. Within a process the bytes are held in memory.
+    """
+    global _BASE_TEMPLATE
+    if _BASE_TEMPLATE is None:
+        path = _template_path()
+        try:
+            _BASE_TEMPLATE = path.read_bytes()
+        except OSError:
+            _BASE_TEMPLATE = _build_base_template()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_bytes(_BASE_TEMPLATE)
+                os.replace(tmp, path)
+            except OSError:
+                pass  # read-only checkout: rebuild per process instead
+    return _BASE_TEMPLATE
+
+
+def new_presentation():
+    """Return an empty 10 x 7.5 in presentation cloned from the base template."""
+    from pptx import Presentation
+    return Presentation(io.BytesIO(_base_template()))
+
+
+BACKENDS = ("pptx", "xml")
+FORMATS = ("pptx", "html")
+
+
+def _add_slide(prs, layout):
+    """Append a slide; equivalent to ``prs.slides.add_slide(layout)``.
+
+    python-pptx scans every existing slide relationship and slide id on each
+    add, which makes building an n-slide deck O(n^2). Slides here are only
+    ever appended, so the new rId and slide id can be taken directly.
+    """
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.opc.packuri import PackURI
+    from pptx.parts.slide import SlidePart
+
+    prs_part = prs.part
+    sld_id_lst = prs.element.get_or_add_sldIdLst()
+    count = len(sld_id_lst)
+    slide_part = SlidePart.new(PackURI(f"/ppt/slides/slide{count + 1}.xml"),
+                               prs_part.package, layout.part)
+    # a brand-new part can't already be related, so skip get_or_add's search
+    rid = prs_part.rels._add_relationship(RT.SLIDE, slide_part)
+    slide = slide_part.slide
+    slide.shapes.clone_layout_placeholders(layout)
+    # ids are allocated in ascending order, so the last one is the highest
+    sld_id_lst._add_sldId(id=sld_id_lst[-1].id + 1 if count else 256, rId=rid)
+    return slide
+
+
+def emit(display, slide):
+    """Draw a laid-out *display* list into a python-pptx slide or SlideXml."""
+    from utils.display_list import (
+        BULLETS, CHART, OP_NAMES, PICTURE, TABLE, TEXT,
+    )
+    if display.background is not None:
+        _set_bg(slide, display.background)
+    for op, left, top, width, height, args in display:
+        if op == TEXT:
+            text, size, bold, color, align = args
+            _add_text(slide, left, top, width, height, text, size=size,
+                      bold=bold, color=color, align=align)
+        elif op == BULLETS:
+            items, size, color, bullet_color, indent, hanging, pitch = args
+            _add_bullets(slide, left, top, width, height, items, size=size,
+                         color=color, bullet_color=bullet_color,
+                         indent=indent, hanging=hanging, pitch=pitch)
+        elif op == TABLE:
+            _add_table(slide, left, top, width, height, *args)
+        elif op == PICTURE:
+            _add_picture(slide, left, top, width, height, *args)
+        elif op == CHART:
+            (chart_type, categories, series, colors, min_value, max_value,
+             label_width, axes, style) = args
+            _add_chart(slide, left, top, width, height, chart_type,
+                       list(categories), series, colors=colors,
+                       min_value=min_value, max_value=max_value,
+                       label_width=label_width, axes=axes, style=style)
+        else:
+            fill, line, line_width = args
+            _add_shape(slide, OP_NAMES[op], left, top, width, height,
+                       fill=fill, line=line, line_width=line_width)
+
+
+@lru_cache(maxsize=None)
+def _drawer(renderer):
+    """*renderer* as a layout pass into a DisplayList followed by emit()."""
+    from utils.display_list import DisplayList
+
+    def draw(slide, slide_data, theme):
+        display = DisplayList()
+        renderer(display, slide_data, theme)
+        emit(display, slide)
+    return draw
+
+
+def _render_slide(slide, renderer, slide_data, theme, backend):
+    """Render into *slide*; returns the slide object to use afterwards."""
+    if backend == "xml":
+        from utils.pptx_xml import SlideXml
+        builder = SlideXml()
+        renderer(builder, slide_data, theme)
+        return builder.apply(slide)
+    renderer(slide, slide_data, theme)
+    return slide
+
+
+def _build_slide(slide, renderer, slide_data, theme, cache, version, backend):
+    """Render or cache-splice one slide; returns (slide, "render" | "cache")."""
+    if cache is None:
+        return _render_slide(slide, renderer, slide_data, theme, backend), "render"
+
+    key = cache.key(slide_data, theme, version)
+    xml = cache.get(key)
+    if xml is not None:
+        return _splice_slide_xml(slide, xml), "cache"
+    slide = _render_slide(slide, renderer, slide_data, theme, backend)
+    if _is_self_contained(slide):
+        cache.put(key, slide.part.blob)
+    return slide, "render"
+
+
+def _iter_rendered(prs, deck: dict, theme: dict, cache=None, backend="pptx",
+                   profiler=None):
+    """Render each slide of *deck* into *prs*, yielding slides as they finish.
+
+    Overflowing slides are split by paginate() on the way in, so one slide
+    dict may yield several slides.
+    """
+    version = renderer_version() if cache else None
+    blank = prs.slide_layouts[6]
+    _install_table_styles(prs, theme)
+
+    for index, slide_data in enumerate(
+            _prefetch_images(paginate(deck_slides(deck)))):
         layout = slide_data.get("layout", "content")
         renderer = RENDERERS.get(layout)
         if not renderer:
             print(f"Warning: unknown layout '{layout}', skipping")
             continue
-        slide = prs.slides.add_slide(prs.slide_layouts[6])
-        renderer(slide, slide_data, theme)
+        renderer = _drawer(renderer)
+        slide = _add_slide(prs, blank)
+
+        if profiler is None:
+            yield _build_slide(slide, renderer, slide_data, theme, cache,
+                               version, backend)[0]
+            continue
+
+        with profiler.slide(index, layout) as record:
+            slide, record["source"] = _build_slide(
+                slide, profiler.wrap(layout, renderer), slide_data, theme,
+                cache, version, backend,
+            )
+            record["slide"] = slide
+        yield slide
+
+
+def _span(profiler, name, **args):
+    """profiler.span(), or a no-op context when not profiling."""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.span(name, **args)
+
+
+def render_deck(deck: dict, theme="dark", cache=None, backend="pptx",
+                profiler=None):
+    """Render every slide in *deck* and return the presentation (unsaved).
+
+    *theme* is a THEMES key or a theme dict. With a SlideCache, unchanged
+    slides are spliced in from cached XML instead of being re-rendered.
+    *backend* "xml" emits shape XML directly instead of going through the
+    python-pptx object model; the resulting slides are identical. A
+    DeckProfiler, if given, records each slide's timings.
+    """
+    theme = resolve_theme(theme)
+    prs = new_presentation()
+    for _ in _iter_rendered(prs, deck, theme, cache, backend, profiler):
+        pass
+    return prs
+
+
+def stream_deck(deck: dict, out_path, theme="dark", cache=None,
+                backend="pptx", profiler=None,
+                compression: str = "deflate") -> int:
+    """Render *deck* straight into *out_path*, one slide in memory at a time.
+
+    ``deck["slides"]`` may be any iterable, including a generator. Returns
+    the number of slides written.
+    """
+    from utils.package_optimize import COMPRESSION
+    from utils.pptx_stream import PptxStreamWriter
+    theme = resolve_theme(theme)
+    prs = new_presentation()
+    method, level = COMPRESSION[compression]
+    with PptxStreamWriter(out_path, prs, method, level) as writer:
+        for slide in _iter_rendered(prs, deck, theme, cache, backend,
+                                    profiler):
+            with _span(profiler, "write"):
+                writer.write_slide(slide)
+        with _span(profiler, "save", path=out_path):
+            writer.close()
+    return writer.slide_count
+
+
+def layout_slide(slide_data: dict, theme="dark"):
+    """Lay out one (already paginated) slide into a DisplayList without
+    rendering it."""
+    from utils.display_list import DisplayList
+    display = DisplayList()
+    RENDERERS[slide_data.get("layout", "content")](
+        display, slide_data, resolve_theme(theme))
+    return display
+
+
+def layout_deck(deck: dict, theme="dark") -> list:
+    """Lay out every slide of *deck*, paginated, as a list of DisplayLists.
+
+    Nothing is rendered and python-pptx is never imported. Identical slides
+    are laid out once and share one DisplayList; unknown layouts are
+    skipped.
+    """
+    return list(_iter_layouts(deck, resolve_theme(theme)))
+
+
+def _iter_layouts(deck: dict, theme: dict):
+    from utils.display_list import DisplayList
+    done = {}
+    for slide_data in _prefetch_images(paginate(deck_slides(deck))):
+        layout = slide_data.get("layout", "content")
+        if layout not in RENDERERS:
+            print(f"Warning: unknown layout '{layout}', skipping")
+            continue
+        key = _slide_key(slide_data)
+        if key not in done:
+            done[key] = display = DisplayList()
+            RENDERERS[layout](display, slide_data, theme)
+        yield done[key]
+
+
+def write_html(deck: dict, out_path, theme="dark") -> int:
+    """Write *deck* as one self-contained HTML page of SVG slides.
+
+    Slides are laid out as for the deck and drawn by utils/html_export.py,
+    without python-pptx. Returns the number of slides written.
+    """
+    from utils import html_export
+    theme = resolve_theme(theme)
+    return html_export.write_html(
+        _iter_layouts(deck, theme), out_path, theme, table_style_colors(theme),
+        title=deck.get("filename", "Deck"), size=(W, H),
+        picture=lambda source, w, h: image_cache().get(source, w, h))
+
+
+def verify_backends(deck: dict, theme="dark") -> list:
+    """Render *deck* with both backends; return indices of slides that differ.
+
+    Slides are compared as canonical XML (C14N), so attribute order and
+    serialization details don't count as differences.
+    """
+    from lxml import etree
+    slides = list(deck["slides"])
+    deck = dict(deck, slides=slides)
+    reference = render_deck(deck, theme, backend="pptx")
+    direct = render_deck(deck, theme, backend="xml")
+    return [
+        i for i, (a, b) in enumerate(zip(reference.slides, direct.slides))
+        if etree.tostring(a.element, method="c14n")
+        != etree.tostring(b.element, method="c14n")
+    ]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SLIDE CACHE — splice unchanged slides from rendered XML
+# ═══════════════════════════════════════════════════════════════════════════
+
+RENDERER_VERSION = "1"   # bump to invalidate every cached slide
+
+_RENDERER_FINGERPRINT = None
+
+
+def renderer_version() -> str:
+    """Return RENDERER_VERSION plus a hash of this module's code and geometry.
+
+    Editing any renderer or layout constant changes the fingerprint, so
+    stale slides are never served; editing DECK does not.
+    """
+    global _RENDERER_FINGERPRINT
+    if _RENDERER_FINGERPRINT is None:
+        import hashlib
+        import inspect
+        from utils import chart_series, display_list
+        h = hashlib.sha256()
+        for name, obj in sorted(globals().items()):
+            if inspect.isfunction(obj) and obj.__module__ == __name__:
+                h.update(inspect.getsource(obj).encode("utf-8"))
+        h.update(repr((W, H, MARGIN, LIST_GEOMETRY, GANTT_GEOMETRY,
+                       LINE_HEIGHT, MIN_FONT_SIZE, TABLE_TEXT_SIZES,
+                       PAGE_BOTTOM, CONTINUED_TITLE)).encode("utf-8"))
+        for module in (chart_series, display_list, gantt_layout,
+                       text_metrics):
+            h.update(inspect.getsource(module).encode("utf-8"))
+        _RENDERER_FINGERPRINT = f"{RENDERER_VERSION}:{h.hexdigest()[:16]}"
+    return _RENDERER_FINGERPRINT
+
+
+def _is_self_contained(slide) -> bool:
+    """True when the slide references nothing but its layout (no media/charts)."""
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    return all(rel.reltype == RT.SLIDE_LAYOUT
+               for rel in slide.part.rels.values())
 
-    out_dir = Path(__file__).resolve().parent / "output"
-    out_dir.mkdir(exist_ok=True)
-    filename = DECK.get("filename", "Deck")
-    out_path = out_dir / f"{filename}_{theme_name}.pptx"
-    prs.save(str(out_path))
-    print(f"Created {out_path}")
+
+def _splice_slide_xml(slide, xml: bytes):
+    """Swap a freshly added slide's XML for cached slide XML; returns the slide."""
+    from pptx.oxml import parse_xml
+    from utils.pptx_xml import replace_slide_element
+    return replace_slide_element(slide, parse_xml(xml))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MULTI-THEME — render once, re-skin per theme
+# ═══════════════════════════════════════════════════════════════════════════
+
+_SRGB_VAL = re.compile(rb'(<a:srgbClr val=")([0-9A-Fa-f]{6})(")')
+
+
+def _sentinel_theme(palette_len: int) -> dict:
+    """Return a theme where every key and palette slot has a unique colour.
+
+    Rendering with it lets each colour in the output XML be traced back to
+    the theme key that produced it, even where real themes share values
+    (e.g. dark header_bg == row_even == card_bg).
+    """
+    theme = {k: (0x0B, 0xAD, i) for i, k in enumerate(sorted(THEME_KEYS))}
+    theme["bar_palette"] = [(0x0B, 0xAE, i) for i in range(palette_len)]
+    return compile_theme("sentinel", theme)
+
+
+def _color_map(sentinel: dict, theme: dict) -> dict:
+    from utils.pptx_xml import hex_color
+    cmap = {
+        hex_color(sentinel[k]).encode(): hex_color(theme[k]).encode()
+        for k in sentinel if k != "bar_palette"
+    }
+    for src, dst in zip(sentinel["bar_palette"], theme["bar_palette"]):
+        cmap[hex_color(src).encode()] = hex_color(dst).encode()
+    return cmap
+
+
+def reskin(src, dst, color_map: dict):
+    """Copy the .pptx *src* to *dst*, rewriting srgbClr values in XML parts.
+
+    *src* and *dst* are paths or binary file objects; parts are processed
+    one at a time, so memory use doesn't grow with deck size.
+    """
+    import zipfile
+
+    def swap(m):
+        return m.group(1) + color_map.get(m.group(2), m.group(2)) + m.group(3)
+
+    with zipfile.ZipFile(src) as zin, \
+            zipfile.ZipFile(dst, "w", zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            blob = zin.read(info)
+            if info.filename.endswith(".xml"):
+                blob = _SRGB_VAL.sub(swap, blob)
+            zout.writestr(info, blob)
+
+
+def _theme_groups(theme_names) -> dict:
+    """Group theme names by bar-palette length (palette cycling depends on it)."""
+    groups = {}
+    for name in theme_names:
+        groups.setdefault(len(THEMES[name]["bar_palette"]), []).append(name)
+    return groups
+
+
+def render_themes(deck: dict, theme_names, cache=None, backend="pptx",
+                  profiler=None) -> dict:
+    """Render *deck* once and return {theme_name: pptx bytes} for each theme.
+
+    Slides are laid out a single time with a sentinel theme; each requested
+    theme is then produced by swapping colour values in the saved XML.
+    """
+    groups = _theme_groups(theme_names)
+    if len(groups) > 1:
+        deck = dict(deck, slides=list(deck["slides"]))
+
+    rendered = {}
+    for palette_len, names in groups.items():
+        sentinel = _sentinel_theme(palette_len)
+        buf = io.BytesIO()
+        prs = render_deck(deck, sentinel, cache, backend, profiler)
+        with _span(profiler, "save"):
+            prs.save(buf)
+        for name in names:
+            out = io.BytesIO()
+            with _span(profiler, "reskin", theme=name):
+                reskin(buf, out, _color_map(sentinel, THEMES[name]))
+            rendered[name] = out.getvalue()
+    return rendered
+
+
+def stream_themes(deck: dict, theme_names, out_dir=None, cache=None,
+                  backend="pptx", profiler=None) -> list:
+    """Streaming counterpart of render_themes(), writing one file per theme.
+
+    The sentinel deck is streamed to a temporary file and each theme is
+    re-skinned from it part by part.
+    """
+    groups = _theme_groups(theme_names)
+    if len(groups) > 1 and not isinstance(deck["slides"], (list, tuple)):
+        raise ValueError(
+            "themes with different bar_palette lengths need two layout passes; "
+            "pass slides as a list or stream those themes separately"
+        )
+
+    paths = []
+    for palette_len, names in groups.items():
+        sentinel = _sentinel_theme(palette_len)
+        tmp = output_path(deck, f"_sentinel{palette_len}", out_dir)
+        try:
+            stream_deck(deck, tmp, sentinel, cache, backend, profiler)
+            for name in names:
+                out_path = output_path(deck, name, out_dir)
+                with _span(profiler, "reskin", theme=name):
+                    reskin(tmp, out_path, _color_map(sentinel, THEMES[name]))
+                paths.append(out_path)
+        finally:
+            tmp.unlink(missing_ok=True)
+    return paths
+
+
+def output_path(deck: dict, theme_name: str, out_dir: Path = None) -> Path:
+    out_dir = Path(out_dir) if out_dir else OUTPUT_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    filename = deck.get("filename", "Deck")
+    problem = filename_problem(filename)
+    if problem:
+        raise ValueError(problem)
+    return out_dir / f"{filename}_{theme_name}.pptx"
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# WATCH MODE — keep the deck in memory and re-render only edited slides
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _slide_key(slide_data: dict) -> str:
+    return json.dumps(slide_data, sort_keys=True, separators=(",", ":"),
+                      default=str)
+
+
+class LiveDeck:
+    """A presentation held in memory and updated slide by slide.
+
+    update() takes the deck's slides again, paginates them, and matches
+    each page against the slides already rendered by content: unchanged
+    pages keep their slide (wherever they moved to), new or edited pages
+    are rendered, and pages that disappeared are dropped.
+    """
+
+    def __init__(self, theme: dict, cache=None, backend="pptx"):
+        self.theme = theme
+        self.cache = cache
+        self.backend = backend
+        self.prs = new_presentation()
+        _install_table_styles(self.prs, theme)
+        self._blank = self.prs.slide_layouts[6]
+        self._version = renderer_version() if cache else None
+        self._slides = []    # (content key, sldId element) in deck order
+        self._parts = 0      # slide parts ever added, for unique part names
+
+    def update(self, slides) -> dict:
+        """Bring the presentation in line with *slides*; returns counts."""
+        from pptx.opc.packuri import PackURI
+
+        sld_id_lst = self.prs.element.get_or_add_sldIdLst()
+        previous = {}
+        for key, sld_id in self._slides:
+            previous.setdefault(key, []).append(sld_id)
+
+        current, rendered = [], 0
+        for slide_data in _prefetch_images(paginate(slides)):
+            key = _slide_key(slide_data)
+            if previous.get(key):
+                current.append((key, previous[key].pop(0)))
+                continue
+            layout = slide_data.get("layout", "content")
+            renderer = RENDERERS.get(layout)
+            if not renderer:
+                print(f"Warning: unknown layout '{layout}', skipping")
+                continue
+            slide = _add_slide(self.prs, self._blank)
+            # _add_slide names parts by slide count, which can repeat once
+            # slides have been removed; relationship targets are fixed at
+            # the first save, so existing parts are never renamed
+            self._parts += 1
+            slide.part.partname = PackURI(f"/ppt/slides/slide{self._parts}.xml")
+            _build_slide(slide, _drawer(renderer), slide_data, self.theme,
+                         self.cache, self._version, self.backend)
+            current.append((key, sld_id_lst[-1]))
+            rendered += 1
+
+        removed = 0
+        for stale in previous.values():
+            for sld_id in stale:
+                self.prs.part.drop_rel(sld_id.rId)
+                sld_id_lst.remove(sld_id)
+                removed += 1
+
+        # put the slides in deck order, renumbering their ids to match
+        # (_add_slide expects the last id to be the highest)
+        for sld_id in list(sld_id_lst):
+            sld_id_lst.remove(sld_id)
+        for n, (_, sld_id) in enumerate(current):
+            sld_id.id = 256 + n
+            sld_id_lst.append(sld_id)
+        self._slides = current
+        return {"slides": len(current), "rendered": rendered,
+                "kept": len(current) - rendered, "removed": removed}
+
+
+def watch(spec_path, theme_names=("dark",), cache=None, backend="pptx", *,
+          compression: str = "deflate", optimize: bool = False,
+          formats=("pptx",), preview: bool = False):
+    """Render the deck in *spec_path*, then re-render it on every save.
+
+    The process stays warm between saves and keeps one LiveDeck per
+    bar-palette length, so only slides whose content changed are rendered
+    again before the file(s) are re-saved. Several themes share one
+    sentinel-theme render and are re-skinned, as in render_themes().
+    Renderer code is not reloaded; restart to pick up changes to it.
+
+    *compression*, *optimize* and *formats* apply to every save as they do
+    in main(), and *preview* redraws the thumbnails of each .pptx. An HTML
+    page is laid out in full on each save.
+    """
+    from utils.file_watch import FileWatcher
+
+    spec_path = Path(spec_path)
+    live = {}
+    for palette_len, names in _theme_groups(theme_names).items():
+        if len(names) == 1:
+            live[tuple(names)] = (LiveDeck(THEMES[names[0]], cache, backend),
+                                  None)
+        else:
+            sentinel = _sentinel_theme(palette_len)
+            live[tuple(names)] = (LiveDeck(sentinel, cache, backend),
+                                  sentinel)
+
+    def rebuild():
+        start = time.perf_counter()
+        try:
+            deck = deck_spec.load_spec(spec_path)
+            slides = list(deck_slides(deck))
+        except Exception as exc:   # a half-written spec; wait for the next save
+            print(f"{spec_path}: {type(exc).__name__}: {exc}")
+            return
+        problems = validate_deck(dict(deck, slides=slides))
+        if problems:
+            for problem in problems:
+                print(f"{spec_path}: {problem}")
+            print("Not updated; fix the spec and save again")
+            return
+        outputs = []
+        counts = None
+        for names, (deck_live, sentinel) in live.items():
+            if "pptx" not in formats:
+                break
+            counts = deck_live.update(slides)
+            buf = io.BytesIO()
+            deck_live.prs.save(buf)
+            if sentinel is None:
+                out_path = output_path(deck, names[0])
+                _finish_output(out_path, compression, optimize, buf.getvalue())
+                outputs.append(out_path)
+                continue
+            for name in names:
+                out_path = output_path(deck, name)
+                reskin(buf, out_path, _color_map(sentinel, THEMES[name]))
+                _finish_output(out_path, compression, optimize)
+                outputs.append(out_path)
+        if preview:
+            from utils.slide_preview import save_previews
+            for out_path in outputs:
+                save_previews(out_path)
+        if "html" in formats:
+            for name in theme_names:
+                out_path = output_path(deck, name).with_suffix(".html")
+                write_html(dict(deck, slides=slides), out_path, name)
+                outputs.append(out_path)
+        note = "" if counts is None else (
+            f" ({counts['rendered']} rendered, {counts['kept']} unchanged, "
+            f"{counts['removed']} removed)")
+        print(f"Updated {', '.join(map(str, outputs))} in "
+              f"{time.perf_counter() - start:.2f}s{note}")
+
+    with FileWatcher([spec_path]) as watcher:
+        rebuild()
+        print(f"Watching {spec_path} ({watcher.method}); Ctrl+C to stop")
+        try:
+            while True:
+                if watcher.wait():
+                    rebuild()
+        except KeyboardInterrupt:
+            pass
+
+
+def _finish_output(out_path: Path, compression: str, optimize: bool,
+                   data: bytes = None, profiler=None):
+    """Write *data* (pptx bytes) to *out_path*, or rewrite the file already
+    there, at *compression*; prune and compact it too if *optimize*.
+
+    Returns the optimize_package() report, or None if the bytes were
+    written as they are.
+    """
+    if not optimize and compression == "deflate":
+        if data is not None:
+            out_path.write_bytes(data)
+        return None
+    from utils.package_optimize import optimize_package
+    with _span(profiler, "optimize", path=out_path):
+        return optimize_package(out_path if data is None else data, out_path,
+                                compression=compression, prune=optimize,
+                                compact=optimize)
+
+
+def main(theme_names=("dark",), deck: dict = None, cache=None,
+         backend: str = "pptx", stream: bool = False, profiler=None,
+         compression: str = "deflate", optimize: bool = False,
+         formats=("pptx",)):
+    from utils.package_optimize import format_report, save_presentation
+    deck = deck or DECK
+    if isinstance(theme_names, str):
+        theme_names = [theme_names]
+
+    outputs = []   # (path, note, optimize_package report or None)
+    if "html" in formats and (len(formats) > 1 or len(theme_names) > 1):
+        # each output lays the slides out again
+        deck = dict(deck, slides=list(deck["slides"]))
+    if "pptx" in formats:
+        if stream and len(theme_names) == 1:
+            out_path = output_path(deck, theme_names[0])
+            count = stream_deck(deck, out_path, theme_names[0], cache,
+                                backend, profiler, compression)
+            # already written at *compression*; only --optimize rewrites it
+            report = _finish_output(out_path, compression, True, None,
+                                    profiler) if optimize else None
+            outputs.append((out_path, f" ({count} slides, streamed)",
+                            report))
+        elif stream:
+            for out_path in stream_themes(deck, theme_names, None, cache,
+                                          backend, profiler):
+                report = _finish_output(out_path, compression, optimize, None,
+                                        profiler)
+                outputs.append((out_path, " (streamed)", report))
+        elif len(theme_names) == 1:
+            out_path = output_path(deck, theme_names[0])
+            prs = render_deck(deck, theme_names[0], cache, backend, profiler)
+            report = None
+            with _span(profiler, "save", path=out_path):
+                if optimize:
+                    buf = io.BytesIO()
+                    prs.save(buf)
+                else:
+                    save_presentation(prs, out_path, compression)
+            if optimize:
+                report = _finish_output(out_path, compression, True,
+                                        buf.getvalue(), profiler)
+            outputs.append((out_path, "", report))
+        else:
+            for name, data in render_themes(deck, theme_names, cache, backend,
+                                            profiler).items():
+                out_path = output_path(deck, name)
+                report = _finish_output(out_path, compression, optimize, data,
+                                        profiler)
+                outputs.append((out_path, "", report))
+
+    if "html" in formats:
+        for name in theme_names:
+            out_path = output_path(deck, name).with_suffix(".html")
+            with _span(profiler, "html", path=out_path):
+                count = write_html(deck, out_path, name)
+            outputs.append((out_path, f" ({count} slides)", None))
+
+    for out_path, note, report in outputs:
+        print(f"Created {out_path}{note}")
+        if report is not None:
+            print(f"  {'optimized' if optimize else 'recompressed'}: "
+                  f"{format_report(report)}")
+    if cache is not None:
+        print(cache.summary())
+    return [out_path for out_path, _, _ in outputs]
 
 
 if __name__ == "__main__":
+    from utils.package_optimize import COMPRESSION
+    from utils.slide_cache import DEFAULT_MAX_BYTES
+
     parser = argparse.ArgumentParser(
         description="Generate a styled Scale AI slide deck"
     )
     parser.add_argument(
-        "--theme", choices=["dark", "light"], default="dark",
-        help="Color theme (default: dark)",
+        "--theme", nargs="+", default=["dark"], metavar="THEME",
+        help=f"Color theme(s): {', '.join(sorted(THEMES))} or one from "
+             "--theme-file (default: dark). Several themes render the deck "
+             "once and re-skin it per theme.",
+    )
+    parser.add_argument(
+        "--theme-file", nargs="+", type=Path, default=[], metavar="FILE",
+        help="Load extra themes from these files or directories "
+             "(.json / .toml / .yaml, named by file stem)",
+    )
+    parser.add_argument(
+        "--cache", nargs="?", type=Path, const=CACHE_DIR, default=None,
+        metavar="DIR",
+        help=f"Reuse unchanged slides from an on-disk cache (default dir: {CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        metavar="MB", help="Slide cache size cap in MB (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--backend", choices=BACKENDS, default="pptx",
+        help="pptx: python-pptx object model (default); xml: emit shape XML "
+             "directly (faster, identical output)",
+    )
+    parser.add_argument(
+        "--verify-backend", action="store_true",
+        help="Render with both backends and check the slides are identical",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Write each slide to the output file as soon as it is rendered "
+             "(one slide in memory at a time, for very large decks)",
+    )
+    parser.add_argument(
+        "--spec", type=Path, default=None, metavar="FILE",
+        help="Render this deck spec (.json, .yaml, .toml or .py) instead of "
+             "DECK; JSON specs are read slide by slide",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Stay running and re-render edited slides whenever the spec "
+             "(or DECK in this file) is saved",
+    )
+    parser.add_argument(
+        "--optimize", action="store_true",
+        help="Shrink the output: drop unused layouts and parts, strip "
+             "redundant XML and merge identical runs (opens the same)",
+    )
+    parser.add_argument(
+        "--compression", choices=list(COMPRESSION), default="deflate",
+        help="Zip compression of the output: stored (fastest to write), "
+             "fast, deflate (default) or max (smallest)",
+    )
+    parser.add_argument(
+        "--format", nargs="+", choices=FORMATS, default=["pptx"],
+        dest="formats", metavar="FORMAT",
+        help="Output format(s): pptx (default) and/or html, one "
+             "self-contained page of SVG slides that opens in any browser",
+    )
+    parser.add_argument(
+        "--preview", action="store_true",
+        help="Also draw PNG thumbnails and a contact sheet of each deck "
+             "into output/<deck>_preview/ (Pillow, no office suite needed)",
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="Validate the deck against the slide schemas without rendering",
+    )
+    parser.add_argument(
+        "--profile", nargs="?", type=Path, const=True, default=None,
+        metavar="TRACE",
+        help="Time every slide and renderer, print the slowest slides and "
+             "write a Chrome/Perfetto trace (default: output/<deck>_trace.json)",
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=10, metavar="N",
+        help="Slowest slides to list with --profile (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--profile-renderer", choices=sorted(RENDERERS), default=None,
+        metavar="LAYOUT",
+        help="Also run cProfile around this layout's renderer only "
+             "(implies --profile)",
     )
     args = parser.parse_args()
-    main(args.theme)
+
+    if args.theme_file:
+        try:
+            load_themes(args.theme_file, THEMES)
+        except (OSError, ValueError) as exc:
+            parser.error(str(exc))
+    unknown = [name for name in args.theme if name not in THEMES]
+    if unknown:
+        parser.error(f"unknown theme(s) {', '.join(unknown)}; choose from "
+                     f"{', '.join(sorted(THEMES))}")
+
+    deck = DECK
+    if args.spec:
+        try:
+            deck = deck_spec.load_spec(args.spec)
+        except (OSError, ValueError) as exc:
+            parser.error(f"{args.spec}: {exc}")
+
+    if args.check:
+        count = problems = 0
+        for count, slide in enumerate(deck["slides"], 1):
+            for problem in validate_slide(slide, count):
+                print(problem)
+                problems += 1
+        print(f"{count} slides, {problems} problem(s)")
+        raise SystemExit(1 if problems else 0)
+    if args.spec:
+        # spec slides are checked one by one as they stream into rendering
+        deck = dict(deck, slides=validated(deck["slides"]))
+
+    if args.verify_backend:
+        deck = dict(deck, slides=list(deck["slides"]))
+        failed = False
+        for name in args.theme:
+            diff = verify_backends(deck, name)
+            if diff:
+                failed = True
+                print(f"{name}: slides differ between backends: "
+                      f"{', '.join(str(i + 1) for i in diff)}")
+            else:
+                print(f"{name}: xml backend matches pptx backend")
+        raise SystemExit(1 if failed else 0)
+
+    cache = None
+    if args.cache:
+        from utils.slide_cache import SlideCache
+        cache = SlideCache(args.cache, args.cache_size * 1024 * 1024)
+    if args.watch:
+        if args.stream or args.profile or args.profile_renderer:
+            parser.error("--watch can't be combined with --stream or --profile")
+        watch(args.spec or Path(__file__), args.theme, cache, args.backend,
+              compression=args.compression, optimize=args.optimize,
+              formats=args.formats, preview=args.preview)
+        raise SystemExit(0)
+    profiler = None
+    if args.profile or args.profile_renderer:
+        from utils.deck_profile import DeckProfiler
+        profiler = DeckProfiler(args.profile_renderer)
+
+    try:
+        paths = main(args.theme, deck, cache=cache, backend=args.backend,
+                     stream=args.stream, profiler=profiler,
+                     compression=args.compression, optimize=args.optimize,
+                     formats=args.formats)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+
+    if args.preview:
+        from utils.slide_preview import save_previews
+        for out_path in (p for p in paths if p.suffix == ".pptx"):
+            start = time.perf_counter()
+            with _span(profiler, "preview", path=out_path):
+                slides, sheet = save_previews(out_path)
+            print(f"Previews of {len(slides)} slides in {sheet.parent} "
+                  f"({time.perf_counter() - start:.2f}s)")
+
+    if profiler is not None:
+        print()
+        print(profiler.summary(args.profile_top))
+        trace = args.profile if isinstance(args.profile, Path) else \
+            output_path(deck, "trace").with_suffix(".json")
+        profiler.write_trace(trace)
+        print(f"\nTrace written to {trace} (open in https://ui.perfetto.dev)")
+        if args.profile_renderer:
+            stats = trace.with_name(f"{trace.stem}_{args.profile_renderer}.prof")
+            if profiler.write_cprofile(stats):
+                print(f"\ncProfile of {args.profile_renderer} renderer "
+                      f"(full stats in {stats}):")
+                print(profiler.cprofile_summary())
+            else:
+                print(f"\n{args.profile_renderer} renderer never ran "
+                      f"(no such slides, or all served from cache)")
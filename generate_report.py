@@ -7,6 +7,7 @@ Usage:
     python3 generate_report.py
     python3 generate_report.py --template templates/my_template.docx
     python3 generate_report.py --output output/Feb_2026_MSR.docx
+    python3 generate_report.py --optimize --compression max
 
 Customization:
     1. Place your MSR template in templates/
@@ -15,10 +16,14 @@ Customization:
        "Update the MSR for reporting period 15 Feb - 14 Mar 2026 with these highlights: ..."
 """
 import argparse
+import io
 import shutil
 from pathlib import Path
 
-from docx import Document
+from utils.package_optimize import COMPRESSION, format_report, optimize_package
+
+# python-docx is imported inside the functions that read documents, so
+# --help starts without loading it.
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -52,6 +57,8 @@ TABLE_UPDATES = {
 
 def inspect_template(template_path: Path):
     """Print all paragraphs and tables with indices for easy mapping."""
+    from docx import Document
+
     doc = Document(str(template_path))
 
     print(f"\n{'='*60}")
@@ -73,25 +80,58 @@ def inspect_template(template_path: Path):
             print(f"  Row {r_idx}: {cells}")
 
 
-def generate(template_path: Path, output_path: Path):
+def generate(template_path: Path, output_path: Path,
+             paragraph_updates: dict = None, table_updates: dict = None,
+             optimize: bool = False, compression: str = "deflate"):
+    """Copy the template to *output_path* and apply the updates (by default
+    PARAGRAPH_UPDATES and TABLE_UPDATES above).
+
+    With *optimize*, the saved document is pruned and compacted by
+    utils.package_optimize; *compression* sets the zip compression.
+    """
+    from docx import Document
+
+    if paragraph_updates is None:
+        paragraph_updates = PARAGRAPH_UPDATES
+    if table_updates is None:
+        table_updates = TABLE_UPDATES
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
     shutil.copy(str(template_path), str(output_path))
     doc = Document(str(output_path))
 
-    for idx, text in PARAGRAPH_UPDATES.items():
-        if idx < len(doc.paragraphs):
-            doc.paragraphs[idx].text = text
-
-    for (t_idx, r_idx), col_updates in TABLE_UPDATES.items():
-        if t_idx < len(doc.tables):
-            table = doc.tables[t_idx]
-            if r_idx < len(table.rows):
+    # doc.paragraphs, doc.tables and table.rows rebuild their lists on every
+    # access, so take each once rather than per update.
+    paragraphs = doc.paragraphs
+    for idx, text in paragraph_updates.items():
+        if idx < len(paragraphs):
+            paragraphs[idx].text = text
+
+    tables = doc.tables
+    table_rows = {}
+    for (t_idx, r_idx), col_updates in table_updates.items():
+        if t_idx < len(tables):
+            if t_idx not in table_rows:
+                table_rows[t_idx] = list(tables[t_idx].rows)
+            rows = table_rows[t_idx]
+            if r_idx < len(rows):
+                cells = rows[r_idx].cells
                 for c_idx, text in col_updates.items():
-                    if c_idx < len(table.rows[r_idx].cells):
-                        table.rows[r_idx].cells[c_idx].text = text
-
-    doc.save(str(output_path))
+                    if c_idx < len(cells):
+                        cells[c_idx].text = text
+
+    if not optimize and compression == "deflate":
+        doc.save(str(output_path))
+        print(f"Created {output_path}")
+        return
+    buf = io.BytesIO()
+    doc.save(buf)
+    report = optimize_package(buf.getvalue(), output_path,
+                              compression=compression, prune=optimize,
+                              compact=optimize)
     print(f"Created {output_path}")
+    print(f"  {'optimized' if optimize else 'recompressed'}: "
+          f"{format_report(report)}")
 
 
 if __name__ == "__main__":
@@ -110,9 +150,20 @@ if __name__ == "__main__":
         "--inspect", action="store_true",
         help="Print template structure (paragraphs and tables) without generating",
     )
+    parser.add_argument(
+        "--optimize", action="store_true",
+        help="Shrink the output: strip revision ids and proofing marks and "
+             "merge identically formatted runs (opens the same)",
+    )
+    parser.add_argument(
+        "--compression", choices=list(COMPRESSION), default="deflate",
+        help="Zip compression of the output: stored, fast, deflate "
+             "(default) or max",
+    )
     args = parser.parse_args()
 
     if args.inspect:
         inspect_template(args.template)
     else:
-        generate(args.template, args.output)
+        generate(args.template, args.output, optimize=args.optimize,
+                 compression=args.compression)
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Long-lived local render service: deck specs in, .pptx out.
+
+Keeps a pool of warm worker processes (python-pptx imported, base template
+loaded) behind a small HTTP API, served on a Unix socket or on localhost.
+Requests beyond the worker count wait in a bounded queue; identical
+requests that arrive while one is already rendering share its result.
+
+API:
+    POST /render   {"deck": {...DECK...}, "theme": "dark" | ["dark", "light"],
+                    "backend": "xml", "return": "bytes" | "path"}
+                   -> .pptx bytes (one theme), or JSON {"paths": {theme: path}}
+    GET  /health   -> JSON counters (queued, coalesced, rejected, ...)
+
+Usage:
+    python3 render_server.py --socket /tmp/slides.sock
+    python3 render_server.py --port 8765 --workers 4 --max-queue 32
+    python3 render_server.py --socket /tmp/slides.sock --cache
+    python3 render_server.py --port 8765 --data-root ~/decks
+
+    curl --unix-socket /tmp/slides.sock -X POST http://localhost/render \\
+         -H 'Content-Type: application/json' \\
+         -d '{"deck": {"slides": [{"layout": "title", "title": "Hi"}]}}' -o hi.pptx
+
+From Python:
+    from render_server import render_remote
+    data = render_remote(DECK, "light", socket_path="/tmp/slides.sock")
+"""
+import argparse
+import hashlib
+import http.client
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_TIMEOUT = 120
+
+PPTX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# WORKER
+# ═══════════════════════════════════════════════════════════════════════════
+
+_WORKER_CACHE = None
+
+
+def _init_worker(cache_dir=None, cache_bytes=None):
+    """Warm a worker like generate_batch does, plus an optional slide cache."""
+    global _WORKER_CACHE
+    from generate_batch import _init_worker as warm
+    warm()
+    if cache_dir is not None:
+        from utils.slide_cache import SlideCache
+        _WORKER_CACHE = SlideCache(cache_dir, cache_bytes)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _render_job(deck, theme_names, backend, out_dir):
+    """Render *deck* in each theme; return {theme: bytes}, or {theme: path}
+    when *out_dir* is given (files are written by the worker)."""
+    import generate_deck
+
+    if len(theme_names) == 1:
+        prs = generate_deck.render_deck(deck, theme_names[0], _WORKER_CACHE,
+                                        backend)
+        buf = io.BytesIO()
+        prs.save(buf)
+        rendered = {theme_names[0]: buf.getvalue()}
+    else:
+        rendered = generate_deck.render_themes(deck, theme_names,
+                                               _WORKER_CACHE, backend)
+    if out_dir is None:
+        return rendered
+
+    paths = {}
+    for name, data in rendered.items():
+        out_path = generate_deck.output_path(deck, name, out_dir)
+        out_path.write_bytes(data)
+        paths[name] = str(out_path)
+    return paths
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SERVICE — queueing, concurrency limit, coalescing
+# ═══════════════════════════════════════════════════════════════════════════
+
+class ServiceBusy(Exception):
+    """Raised when the queue is full; the request should be retried later."""
+
+
+class RenderService:
+    """Warm process pool with a bounded queue and in-flight coalescing.
+
+    At most *workers* decks render at once and at most *max_queue* more wait
+    behind them; further submissions raise ServiceBusy. A submission whose
+    deck, themes, backend and return mode match a job still in flight gets
+    that job's future instead of a new render.
+    """
+
+    def __init__(self, workers: int = None, max_queue: int = DEFAULT_MAX_QUEUE,
+                 out_dir=None, cache_dir=None, cache_bytes: int = None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.out_dir = Path(out_dir) if out_dir else None
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker,
+            initargs=(cache_dir, cache_bytes),
+        )
+        self._slots = threading.BoundedSemaphore(self.workers + max_queue)
+        self._inflight = {}   # request key -> Future
+        self._lock = threading.Lock()
+        self.counters = dict(submitted=0, coalesced=0, rejected=0,
+                             completed=0, failed=0)
+
+    def warm(self) -> int:
+        """Start every worker now instead of on first use; return how many
+        distinct worker processes answered."""
+        futures = [self._pool.submit(_ping) for _ in range(self.workers)]
+        return len({f.result() for f in futures})
+
+    @staticmethod
+    def key(deck, theme_names, backend, to_path) -> str:
+        payload = json.dumps([deck, theme_names, backend, to_path],
+                             sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def submit(self, deck: dict, theme_names, backend="xml", to_path=False):
+        """Queue a render and return its Future (shared if coalesced)."""
+        theme_names = list(theme_names)
+        key = self.key(deck, theme_names, backend, to_path)
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.counters["coalesced"] += 1
+                return fut
+            if not self._slots.acquire(blocking=False):
+                self.counters["rejected"] += 1
+                raise ServiceBusy(f"{self.workers} rendering and "
+                                  f"{self.max_queue} queued")
+            out_dir = (self.out_dir or _default_out_dir()) if to_path else None
+            fut = self._pool.submit(_render_job, deck, theme_names, backend,
+                                    out_dir)
+            self._inflight[key] = fut
+            self.counters["submitted"] += 1
+        fut.add_done_callback(lambda f: self._finished(key, f))
+        return fut
+
+    def _finished(self, key, fut):
+        with self._lock:
+            self._inflight.pop(key, None)
+            failed = fut.cancelled() or fut.exception() is not None
+            self.counters["failed" if failed else "completed"] += 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            inflight = len(self._inflight)
+            return dict(self.counters, workers=self.workers,
+                        max_queue=self.max_queue, inflight=inflight,
+                        queued=max(0, inflight - self.workers))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _default_out_dir() -> Path:
+    import generate_deck
+    return generate_deck.OUTPUT_DIR
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# HTTP
+# ═══════════════════════════════════════════════════════════════════════════
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _data_paths(deck: dict):
+    """(slide number, path) of each image and table-source file in *deck*."""
+    from utils.table_sources import SOURCE_KINDS
+    for i, slide in enumerate(deck["slides"], 1):
+        if slide.get("layout") == "image":
+            yield i, slide["image"]
+        source = slide.get("source")
+        if source:
+            yield i, next(source[kind] for kind in SOURCE_KINDS
+                          if kind in source)
+
+
+def parse_request(body: bytes, data_root=None) -> dict:
+    """Validate a /render request body; raise RequestError(400, ...) if bad.
+
+    Image and table-source paths are read from *data_root* (default: the
+    working directory); absolute paths and paths leading out of it are
+    refused, and a "base_dir" in the deck is ignored.
+    """
+    from generate_deck import BACKENDS, THEMES, validate_deck
+
+    try:
+        req = json.loads(body)
+    except ValueError as exc:
+        raise RequestError(400, f"invalid JSON: {exc}")
+    if not isinstance(req, dict) or "deck" not in req:
+        raise RequestError(400, "body must be an object with a 'deck'")
+
+    deck = req["deck"]
+    problems = validate_deck(deck)
+    if problems:
+        raise RequestError(400, "; ".join(problems))
+
+    # the client picks file names, not where on this machine they are read
+    root = Path(data_root or os.getcwd()).resolve()
+    for i, path in _data_paths(deck):
+        if Path(path).is_absolute() or \
+                not (root / path).resolve().is_relative_to(root):
+            raise RequestError(400, f"slide {i}: '{path}' is not a relative "
+                                    f"path inside the server's data "
+                                    f"directory")
+    deck = dict(deck, base_dir=str(root))
+
+    themes = req.get("theme", "dark")
+    themes = [themes] if isinstance(themes, str) else list(themes)
+    unknown = [t for t in themes if t not in THEMES]
+    if not themes or unknown:
+        raise RequestError(400, f"unknown theme(s): {', '.join(unknown)}; "
+                                f"choose from {', '.join(sorted(THEMES))}")
+
+    backend = req.get("backend", "xml")
+    if backend not in BACKENDS:
+        raise RequestError(400, f"backend must be one of {', '.join(BACKENDS)}")
+
+    mode = req.get("return", "bytes")
+    if mode not in ("bytes", "path"):
+        raise RequestError(400, "return must be 'bytes' or 'path'")
+    if mode == "bytes" and len(themes) > 1:
+        raise RequestError(400, "several themes need \"return\": \"path\"")
+
+    return {"deck": deck, "themes": themes, "backend": backend,
+            "to_path": mode == "path"}
+
+
+def content_disposition(filename: str) -> str:
+    """An attachment header for *filename*: an ASCII fallback in quotes,
+    plus the exact name RFC 5987-encoded for clients that read it."""
+    fallback = "".join(ch if " " <= ch <= "~" and ch not in '"\\' else "_"
+                       for ch in filename)
+    return (f'attachment; filename="{fallback}"; '
+            f"filename*=UTF-8''{quote(filename, safe='')}")
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = "SlideRender/1"
+    protocol_version = "HTTP/1.1"
+
+    def _host_refused(self) -> bool:
+        """Answer 403 unless the Host header names this server, so a web
+        page whose DNS name is rebound to 127.0.0.1 can't reach it."""
+        hosts = self.server.hosts
+        if hosts is None or self.headers.get("Host", "").lower() in hosts:
+            return False
+        self._send_json(403, {"error": "unexpected Host header"})
+        return True
+
+    def do_GET(self):
+        if self._host_refused():
+            return
+        if self.path == "/health":
+            self._send_json(200, self.server.service.stats())
+        else:
+            self._send_json(404, {"error": f"no route {self.path}"})
+
+    def do_POST(self):
+        if self._host_refused():
+            return
+        if self.path != "/render":
+            self._send_json(404, {"error": f"no route {self.path}"})
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        # a JSON content type can't be sent cross-site without a CORS
+        # preflight, so a web page can't post renders to a local server
+        if self.headers.get_content_type() != "application/json":
+            self._send_json(415, {"error": "Content-Type must be "
+                                           "application/json"})
+            return
+        try:
+            job = parse_request(body, self.server.data_root)
+            fut = self.server.service.submit(job["deck"], job["themes"],
+                                             job["backend"], job["to_path"])
+            result = fut.result(timeout=self.server.timeout_s)
+        except RequestError as exc:
+            self._send_json(exc.status, {"error": str(exc)})
+            return
+        except ServiceBusy as exc:
+            self._send_json(503, {"error": f"busy: {exc}"},
+                            {"Retry-After": "1"})
+            return
+        except TimeoutError:
+            self._send_json(504, {"error": "render timed out"})
+            return
+        except Exception as exc:  # failure inside the worker
+            self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+
+        if job["to_path"]:
+            self._send_json(200, {"paths": result})
+            return
+        [(theme, data)] = result.items()
+        filename = f"{job['deck'].get('filename', 'deck')}_{theme}.pptx"
+        self._send(200, data, PPTX_CONTENT_TYPE,
+                   {"Content-Disposition": content_disposition(filename)})
+
+    def _send_json(self, status, obj, headers=None):
+        self._send(status, json.dumps(obj).encode("utf-8"),
+                   "application/json", headers)
+
+    def _send(self, status, data: bytes, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service: RenderService, socket_path=None, host="127.0.0.1",
+                port=DEFAULT_PORT, timeout_s=DEFAULT_TIMEOUT, quiet=False,
+                data_root=None):
+    """Bind an HTTP server for *service* on a Unix socket or host:port.
+
+    Decks may only name files under *data_root* (see parse_request()).
+    """
+    if socket_path:
+        socket_path = str(socket_path)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # stale socket from a previous run
+        server = _UnixHTTPServer(socket_path, RenderHandler)
+        server.hosts = None   # no browser reaches a Unix socket
+    else:
+        server = ThreadingHTTPServer((host, port), RenderHandler)
+        server.daemon_threads = True
+        port = server.server_address[1]
+        server.hosts = {f"{name}:{port}" for name in
+                        (f"[{host}]" if ":" in host else host, "localhost")}
+    server.service = service
+    server.timeout_s = timeout_s
+    server.quiet = quiet
+    server.data_root = Path(data_root or os.getcwd()).resolve()
+    return server
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CLIENT
+# ═══════════════════════════════════════════════════════════════════════════
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+def render_remote(deck: dict, theme="dark", *, socket_path=None,
+                  host="127.0.0.1", port=DEFAULT_PORT, backend="xml",
+                  return_path=False, timeout=DEFAULT_TIMEOUT):
+    """Render *deck* on a running server.
+
+    Returns the .pptx bytes, or {theme: path} with *return_path* (required
+    for several themes). Raises RuntimeError with the server's message on
+    any non-200 response.
+    """
+    if socket_path:
+        conn = _UnixHTTPConnection(str(socket_path), timeout=timeout)
+    else:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    body = json.dumps({"deck": deck, "theme": theme, "backend": backend,
+                       "return": "path" if return_path else "bytes"})
+    try:
+        conn.request("POST", "/render", body,
+                     {"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        data = resp.read()
+    finally:
+        conn.close()
+    if resp.status != 200:
+        try:
+            message = json.loads(data)["error"]
+        except (ValueError, KeyError):
+            message = data.decode("utf-8", "replace")
+        raise RuntimeError(f"render failed ({resp.status}): {message}")
+    return json.loads(data)["paths"] if return_path else data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve deck renders from a pool of warm workers"
+    )
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument(
+        "--socket", type=Path, default=None, metavar="PATH",
+        help="Listen on this Unix socket",
+    )
+    where.add_argument(
+        "--port", type=int, default=DEFAULT_PORT,
+        help="Listen on 127.0.0.1:PORT (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes, i.e. concurrent renders (default: CPU count)",
+    )
+    parser.add_argument(
+        "--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+        help="Requests allowed to wait for a worker before the server "
+             "answers 503 (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=DEFAULT_TIMEOUT,
+        help="Seconds a request may wait for its render (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--out", type=Path, default=None,
+        help='Directory for "return": "path" requests (default: output/)',
+    )
+    parser.add_argument(
+        "--cache", nargs="?", type=Path, const=True, default=None,
+        metavar="DIR",
+        help="Share an on-disk slide cache between workers "
+             "(default dir: .cache/slides)",
+    )
+    parser.add_argument(
+        "--data-root", type=Path, default=None, metavar="DIR",
+        help="Directory image and table-source paths in posted decks are "
+             "read from; others are refused (default: working directory)",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="Don't log each request",
+    )
+    args = parser.parse_args()
+
+    cache_dir = cache_bytes = None
+    if args.cache:
+        import generate_deck
+        from utils.slide_cache import DEFAULT_MAX_BYTES
+        cache_dir = generate_deck.CACHE_DIR if args.cache is True else args.cache
+        cache_bytes = DEFAULT_MAX_BYTES
+
+    service = RenderService(args.workers, args.max_queue, args.out,
+                            cache_dir, cache_bytes)
+    service.warm()
+    server = make_server(service, args.socket, port=args.port,
+                         timeout_s=args.timeout, quiet=args.quiet,
+                         data_root=args.data_root)
+    where = args.socket or f"http://127.0.0.1:{args.port}"
+    print(f"Rendering on {where} with {service.workers} workers "
+          f"(queue {service.max_queue}); Ctrl-C to stop", file=sys.stderr)
+    # `kill` shuts down as cleanly as Ctrl-C (pool stopped, socket removed)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if args.socket and args.socket.exists():
+            args.socket.unlink()
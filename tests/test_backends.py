@@ -0,0 +1,50 @@
+import pytest
+
+import generate_deck
+
+# every C0 control character but newline, which starts a paragraph
+CONTROL = "".join(chr(c) for c in range(32) if c != 10)
+
+
+def test_example_deck_backends_agree():
+    assert generate_deck.verify_backends(generate_deck.DECK, "dark") == []
+
+
+@pytest.mark.parametrize("theme", ["dark", "light"])
+def test_control_characters_backends_agree(theme):
+    deck = {"slides": [
+        {"layout": "title", "title": "T\x01itle\x0cpage",
+         "subtitle": "a\rb\x00c\td"},
+        {"layout": "content", "title": "Native" + CONTROL, "mode": "native",
+         "bullets": ["x\x07y", "soft\vbreak" + CONTROL]},
+        {"layout": "content", "title": "Shapes", "bullets": ["x\x07y"]},
+        {"layout": "table", "title": "Table", "headers": ["h\x01", "h2"],
+         "rows": [["a\x1fb", "c\nd\x02"]]},
+        {"layout": "metrics", "title": "Metrics",
+         "metrics": [{"label": "l\x03", "value": "v\x04", "detail": "d\x05"}]},
+    ]}
+    assert generate_deck.verify_backends(deck, theme) == []
+
+
+def test_control_characters_escaped_as_python_pptx_does():
+    from utils.pptx_xml import runs
+    assert runs("a\x01b\tc\vd") == ("<a:r><a:t>a_x0001_b\tc</a:t></a:r>"
+                                    "<a:br/><a:r><a:t>d</a:t></a:r>")
+
+
+def test_numeric_metrics_and_headers_render_as_text(tmp_path):
+    deck = {"slides": [
+        {"layout": "metrics", "title": "Metrics",
+         "metrics": [{"label": 3, "value": 200, "detail": 1.5}]},
+        {"layout": "table", "title": "Table", "headers": [2025, 2026],
+         "rows": [[1, 2]]},
+    ]}
+    assert generate_deck.validate_deck(deck) == []
+    assert generate_deck.verify_backends(deck, "dark") == []
+    prs = generate_deck.render_deck(deck, "dark", backend="xml")
+    text = [shape.text_frame.text for shape in prs.slides[0].shapes
+            if shape.has_text_frame]
+    assert {"200", "3", "1.5"} <= set(text)
+    table = next(sh for sh in prs.slides[1].shapes if sh.has_table).table
+    assert [cell.text for cell in table.rows[0].cells] == ["2025", "2026"]
+    assert generate_deck.write_html(deck, tmp_path / "deck.html") == 2
@@ -0,0 +1,121 @@
+import math
+from datetime import date, datetime
+
+import pytest
+
+import generate_deck
+from utils import chart_series
+
+
+def _wave(n, spike=None):
+    ys = [math.sin(i / 40) for i in range(n)]
+    if spike is not None:
+        ys[spike] = 25.0
+    return [float(i) for i in range(n)], ys
+
+
+def test_lttb_keeps_the_budget_the_ends_and_spikes():
+    xs, ys = _wave(10_000, spike=4_321)
+    ys[7_000] = -25.0
+    keep = chart_series.lttb(xs, ys, 200)
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == 9_999
+    assert keep == sorted(set(keep))
+    assert 4_321 in keep and 7_000 in keep
+
+
+def test_lttb_picks_the_largest_triangle_in_each_bucket():
+    xs = [0.0, 1.0, 2.0, 3.0, 4.0]
+    ys = [0.0, 0.1, 5.0, 0.2, 0.0]
+    assert chart_series.lttb(xs, ys, 3) == [0, 2, 4]
+
+
+@pytest.mark.parametrize("budget", [0, 2, 50, 51])
+def test_lttb_keeps_everything_outside_its_range(budget):
+    xs, ys = _wave(50)
+    assert chart_series.lttb(xs, ys, budget) == list(range(50))
+
+
+def test_downsample_keeps_each_series_spikes():
+    xs, high = _wave(5_000, spike=1_234)
+    _, low = _wave(5_000)
+    low[3_210] = -25.0
+    keep = chart_series.downsample(xs, [high, low], 100)
+    assert len(keep) <= 100 and keep == sorted(keep)
+    assert {0, 1_234, 3_210, 4_999} <= set(keep)
+    assert chart_series.downsample(xs[:80], [high[:80]], 100) == \
+        list(range(80))
+
+
+def test_x_values_parses_numbers_dates_and_labels():
+    assert chart_series.x_values(None, 3) == ("number", [0.0, 1.0, 2.0])
+    assert chart_series.x_values([1, 2.5], 2) == ("number", [1.0, 2.5])
+    # Excel serial days, 1900 date system
+    assert chart_series.x_values(["2026-01-01", "2026-01-01T12:00"], 2) == \
+        ("date", [46023.0, 46023.5])
+    assert chart_series.x_values([date(2026, 1, 1), "2 Jan 2026"], 2) == \
+        ("date", [46023.0, 46024.0])
+    assert chart_series.x_values([datetime(2026, 1, 1, 6)], 1) == \
+        ("date", [46023.25])
+    assert chart_series.x_values(["Q1", 2, True], 3) == \
+        ("label", ["Q1", "2", "True"])
+    with pytest.raises(ValueError, match="2 x values for 3 points"):
+        chart_series.x_values([1, 2], 3)
+
+
+@pytest.mark.parametrize("span, formats", [
+    (1.5, ("h:mm", "%H:%M")),
+    (90, ("d mmm", "%d %b")),
+    (400, ("mmm yyyy", "%b %Y")),
+])
+def test_date_format_follows_the_span(span, formats):
+    assert chart_series.date_format(span) == formats
+
+
+def test_buckets_and_aggregate():
+    spans = chart_series.buckets(10, 4)
+    assert spans == [(0, 2), (2, 5), (5, 7), (7, 10)]
+    assert chart_series.buckets(3, 60) == [(0, 1), (1, 2), (2, 3)]
+    values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert chart_series.aggregate(values, spans) == [1.5, 4.0, 6.5, 9.0]
+    assert chart_series.aggregate(values, spans, "sum") == [3, 12, 13, 27]
+    assert chart_series.aggregate(values, spans, "min") == [1, 3, 6, 8]
+    assert chart_series.aggregate(values, spans, "max") == [2, 5, 7, 10]
+
+
+@pytest.mark.parametrize("low, high, axis", [
+    (3, 97, (0.0, 100.0)),
+    (1000, 1010, (1000.0, 1010.0)),
+    (-40, -3, (-40.0, 0.0)),
+    (5, 5, (4.0, 6.0)),
+    (0, 0, (-1.0, 1.0)),
+])
+def test_value_range_starts_at_zero_unless_the_band_is_narrow(low, high,
+                                                               axis):
+    assert chart_series.value_range(low, high) == pytest.approx(axis)
+
+
+def test_line_slide_plots_the_downsampled_points():
+    xs, ys = _wave(20_000, spike=12_345)
+    slide = {"layout": "line", "title": "Load", "points": 150,
+             "series": [{"name": "cpu", "values": ys}]}
+    prs = generate_deck.render_deck({"slides": [slide]}, "dark")
+    chart = next(sh for sh in prs.slides[0].shapes if sh.has_chart).chart
+    plotted = chart.plots[0].series[0].values
+    assert len(plotted) == 150
+    assert plotted[0] == ys[0] and plotted[-1] == ys[-1]
+    assert max(plotted) == 25.0
+
+
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_values_are_a_validation_error(bad):
+    line = {"layout": "line", "title": "Load",
+            "series": [{"name": "cpu", "values": [1.0, bad, 3.0]}]}
+    metrics = {"layout": "metrics", "title": "KPIs", "metrics": [
+        {"label": "Users", "value": "1k", "trend": [1, 2, bad]}]}
+    for slide in (line, metrics):
+        [problem] = generate_deck.validate_slide(slide)
+        assert "item 2" in problem or "item 3" in problem
+        assert f"expected a number, got {bad!r}" in problem
+    line["series"][0]["values"][1] = 2.0
+    assert generate_deck.validate_slide(line) == []
@@ -0,0 +1,110 @@
+from datetime import date, datetime
+
+import pytest
+
+import generate_deck
+from utils import gantt_layout
+
+
+def _task(start, end, milestone=False):
+    return ("Build", "Task", start, end, milestone, None)
+
+
+def _geometry(axis, tasks):
+    return gantt_layout.bar_geometry(
+        axis, tasks, left=1.0, top=2.0, width=7.0, row_h=0.4, bar_h=0.2,
+        bar_pad=0.03, min_bar_w=0.25, milestone=0.18)
+
+
+@pytest.mark.parametrize("value", [
+    "2026-02-15", "15 Feb 2026", "15 February 2026", " 2026-02-15 ",
+    date(2026, 2, 15), datetime(2026, 2, 15, 9, 30),
+])
+def test_to_date_accepts_each_form(value):
+    assert gantt_layout.to_date(value) == date(2026, 2, 15)
+
+
+@pytest.mark.parametrize("value", ["Feb 2026", "2026-02-30", 3, None])
+def test_to_date_rejects_non_dates(value):
+    with pytest.raises(ValueError):
+        gantt_layout.to_date(value)
+
+
+def test_date_axis_months_grouped_into_calendar_quarters():
+    axis = gantt_layout.date_axis("2026-02-10", "2026-08-20")
+    assert axis.scale == "month"
+    assert axis.labels == ["Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug"]
+    assert axis.groups == [("Q1 2026", 0, 1), ("Q2 2026", 2, 4),
+                           ("Q3 2026", 5, 6)]
+    assert axis.edges[0] == date(2026, 2, 1).toordinal()
+    assert axis.edges[-1] == date(2026, 9, 1).toordinal()
+
+
+@pytest.mark.parametrize("first, last, scale, columns", [
+    ("2026-03-02", "2026-03-29", "week", 4),
+    ("2026-01-01", "2026-12-31", "month", 12),
+    ("2026-01-01", "2027-12-31", "quarter", 8),
+])
+def test_date_axis_picks_finest_scale_that_fits(first, last, scale, columns):
+    axis = gantt_layout.date_axis(first, last)
+    assert axis.scale == scale
+    assert len(axis.labels) == columns <= gantt_layout.MAX_COLUMNS
+
+
+def test_date_axis_rejects_reversed_window_and_unknown_scale():
+    with pytest.raises(ValueError):
+        gantt_layout.date_axis("2026-03-01", "2026-02-01")
+    with pytest.raises(ValueError):
+        gantt_layout.date_axis("2026-02-01", "2026-03-01", "day")
+
+
+def test_whole_month_dates_match_index_geometry():
+    months = ["Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug"]
+    indexed = [_task(0, 1), _task(2, 6), _task(4, 4)]
+    dated = [_task("2026-02-01", "2026-03-31"),
+             _task("2026-04-01", "2026-08-31"),
+             _task("2026-06-01", "2026-06-30")]
+    by_index = _geometry(gantt_layout.index_axis(months, []), indexed)
+    by_date = _geometry(gantt_layout.resolve_axis({}, dated), dated)
+    assert by_date == pytest.approx(by_index)
+
+
+def test_dates_place_bars_and_milestones_by_day():
+    tasks = [_task("2026-02-15", "2026-02-28"),
+             _task("2026-03-01", "2026-03-01", milestone=True)]
+    axis = gantt_layout.date_axis("2026-02-01", "2026-03-31", "month")
+    (_, bar_left, _, bar_w, _, _), (prst, ms_left, _, ms_w, _, _) = \
+        _geometry(axis, tasks)
+    col_w = 7.0 / 2
+    assert bar_left == pytest.approx(1.0 + 14 / 28 * col_w + 0.03)
+    assert bar_w == pytest.approx(14 / 28 * col_w - 0.06)
+    assert prst == "diamond"
+    assert ms_left + ms_w / 2 == pytest.approx(1.0 + (1 + 0.5 / 31) * col_w)
+
+
+def test_pinned_window_is_shared_and_clamps():
+    data = {"tasks": [_task("2026-01-10", "2026-06-20")]}
+    pinned = gantt_layout.pin_axis(data, data["tasks"])
+    assert pinned == {"start": "2026-01-01", "end": "2026-06-30",
+                      "scale": "month"}
+    axis = gantt_layout.resolve_axis(
+        dict(pinned), [_task("2025-12-01", "2026-02-15")])
+    assert axis.labels == ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
+    left = _geometry(axis, [_task("2025-12-01", "2026-02-15")])[0][1]
+    assert left == pytest.approx(1.0 + 0.03)
+
+
+def test_mixed_index_and_date_tasks_are_a_validation_error():
+    slide = {"layout": "gantt", "title": "Roadmap",
+             "tasks": [_task(0, 1), _task("2026-02-01", "2026-03-31")]}
+    problems = generate_deck.validate_slide(slide)
+    assert len(problems) == 1 and "mix month indices and dates" in problems[0]
+    with pytest.raises(ValueError, match="mix month indices and dates"):
+        gantt_layout.resolve_axis(slide)
+
+
+def test_span_problem_reports_bad_bounds():
+    assert gantt_layout.span_problem(0, 2) is None
+    assert gantt_layout.span_problem("2026-02-01", "1 Mar 2026") is None
+    assert "before" in gantt_layout.span_problem("2026-03-01", "2026-02-01")
+    assert "both" in gantt_layout.span_problem(0, "2026-02-01")
@@ -0,0 +1,75 @@
+import gc
+import json
+import zipfile
+
+import pytest
+from pptx import Presentation
+
+import generate_deck
+from utils import deck_spec
+from utils.image_cache import ImageCache
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def images(tmp_path):
+    cache = ImageCache(tmp_path / "image-cache")
+    generate_deck.set_image_cache(cache)
+    yield cache
+    cache.close()
+    generate_deck.set_image_cache(None)
+
+
+@pytest.mark.parametrize("backend", ["pptx", "xml"])
+def test_spec_image_paths_are_relative_to_the_spec(tmp_path, monkeypatch,
+                                                   images, backend):
+    decks = tmp_path / "decks"
+    (decks / "img").mkdir(parents=True)
+    Image.new("RGB", (64, 48), (200, 30, 30)).save(decks / "img" / "red.png")
+    spec = decks / "shots.json"
+    spec.write_text(json.dumps({"slides": [
+        {"layout": "image", "title": "Shot", "image": "img/red.png"}]}))
+    monkeypatch.chdir(tmp_path)
+
+    prs = generate_deck.render_deck(deck_spec.load_spec(spec), "dark",
+                                    backend=backend)
+    [picture] = [shape for shape in prs.slides[0].shapes
+                 if shape.shape_type == 13]   # MSO_SHAPE_TYPE.PICTURE
+    assert picture.image.size == (64, 48)
+
+
+def _png(path, color):
+    Image.new("RGB", (40, 30), color).save(path)
+    return str(path)
+
+
+def test_streamed_deck_writes_each_image_once(tmp_path, images):
+    red = _png(tmp_path / "red.png", (200, 30, 30))
+    blue = _png(tmp_path / "blue.png", (30, 30, 200))
+    deck = {"slides": [{"layout": "image", "image": (red, blue)[i % 2]}
+                       for i in range(12)]}
+    out = tmp_path / "shots.pptx"
+    assert generate_deck.stream_deck(deck, out, backend="xml") == 12
+
+    with zipfile.ZipFile(out) as z:
+        media = [n for n in z.namelist() if n.startswith("ppt/media/")]
+    assert len(media) == 2
+    prs = Presentation(out)
+    assert all(shape.image.blob for slide in prs.slides
+               for shape in slide.shapes if shape.shape_type == 13)
+
+
+def test_image_table_does_not_keep_unused_parts(tmp_path, images):
+    prs = generate_deck.new_presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    prepared = images.get(images.source(_png(tmp_path / "red.png",
+                                             (200, 30, 30))), 1, 1)
+    part, rid = generate_deck._image_part(slide.part, prepared)
+    table = prs.part.package._images_by_sha1
+    assert list(table.values()) == [part]
+
+    slide.part.drop_rel(rid)
+    del part
+    gc.collect()
+    assert len(table) == 0
@@ -0,0 +1,78 @@
+import generate_deck
+from utils.text_metrics import line_count, text_width
+
+HEADERS = ["Task", "Notes"]
+LONG = " ".join(["the quick brown fox jumps over the lazy dog"] * 6)
+
+
+def _table(rows, **keys):
+    return dict({"layout": "table", "title": "Tracker", "headers": HEADERS,
+                 "rows": rows}, **keys)
+
+
+def _page_rows(slide):
+    return [len(page["rows"]) for page in generate_deck.paginate([slide])]
+
+
+def test_line_count_wraps_at_spaces_and_inside_long_words():
+    assert line_count("short", 11, 2.0) == 1
+    assert line_count("one\ntwo", 11, 2.0) == 2
+    word = "word "
+    per_line = int(2.0 / text_width(word, 11))
+    assert line_count(word * per_line * 3, 11, 2.0) in (3, 4)
+    assert line_count("x" * 200, 11, 1.0) == \
+        -(-text_width("x" * 200, 11) // 1.0)
+
+
+def test_single_line_rows_fill_the_page_capacity():
+    capacity = generate_deck.page_capacity("table") - 1
+    rows = [[f"Task {i}", "ok"] for i in range(capacity * 2 + 1)]
+    assert _page_rows(_table(rows)) == [capacity, capacity, 1]
+    assert _page_rows(_table(rows[:capacity])) == [capacity]
+
+
+def test_wrapped_rows_end_pages_early():
+    capacity = generate_deck.page_capacity("table") - 1
+    rows = [[f"Task {i}", LONG] for i in range(capacity)]
+    pages = _page_rows(_table(rows))
+    assert sum(pages) == capacity and len(pages) > 1
+
+    # every page's rows, at their wrapped height, fit above PAGE_BOTTOM
+    widths = generate_deck.table_col_widths(HEADERS, rows)
+    inner = [w - 2 * generate_deck.TEXT_INSET for w in widths]
+    header_size, body_size = generate_deck.TABLE_TEXT_SIZES
+    top, _, _ = generate_deck.LIST_GEOMETRY["table"]
+    for page in generate_deck.paginate([_table(rows)]):
+        bottom = top + generate_deck._row_height(HEADERS, inner, header_size,
+                                                 bold=True)
+        bottom += sum(generate_deck._row_height(row, inner, body_size)
+                      for row in page["rows"])
+        assert bottom <= generate_deck.PAGE_BOTTOM + 1e-9
+
+
+def test_given_col_widths_are_used_to_measure_rows():
+    rows = [[f"Task {i}", "a few words of notes"] for i in range(8)]
+    assert _page_rows(_table(rows)) == [8]
+    narrow = _page_rows(_table(rows, col_widths=[8.0, 0.6]))
+    assert len(narrow) > 1 and sum(narrow) == 8
+
+
+def test_streamed_rows_are_measured_too():
+    capacity = generate_deck.page_capacity("table") - 1
+    rows = [[f"Task {i}", LONG] for i in range(capacity)]
+    streamed = _page_rows(_table(iter(rows)))
+    assert streamed == _page_rows(_table(rows))
+
+
+def test_unpaginated_generator_rows_render_whole(tmp_path):
+    from utils.slide_cache import SlideCache
+    cache = SlideCache(tmp_path / "cache")
+    for backend in ("pptx", "xml"):
+        for first in (0, 10):
+            rows = ([f"Task {i}", "ok"] for i in range(first, first + 3))
+            deck = {"slides": [_table(rows, paginate=False)]}
+            prs = generate_deck.render_deck(deck, "dark", cache, backend)
+            table = next(sh for sh in prs.slides[0].shapes
+                         if sh.has_table).table
+            assert [row.cells[0].text for row in table.rows] == \
+                ["Task"] + [f"Task {i}" for i in range(first, first + 3)]
@@ -0,0 +1,64 @@
+import zipfile
+
+import pytest
+from pptx import Presentation
+
+import generate_deck
+from utils.pptx_stream import PptxStreamWriter
+
+
+def _bar_slide(i):
+    return {"layout": "bar", "title": f"Chart {i}", "x": ["a", "b", "c"],
+            "series": [{"name": "Count", "values": [i, i + 1, i + 2]}]}
+
+
+def test_streamed_charts_get_distinct_part_names(tmp_path):
+    path = tmp_path / "charts.pptx"
+    deck = {"slides": [_bar_slide(i) for i in range(30)]}
+    assert generate_deck.stream_deck(deck, path, backend="xml") == 30
+
+    with zipfile.ZipFile(path) as z:
+        names = z.namelist()
+    charts = [n for n in names if n.startswith("ppt/charts/chart")]
+    assert len(charts) == len(set(charts)) == 30
+    assert len(names) == len(set(names))
+    prs = Presentation(path)
+    values = [next(sh for sh in slide.shapes if sh.has_chart)
+              .chart.plots[0].series[0].values[0] for slide in prs.slides]
+    assert values == [float(i) for i in range(30)]
+
+
+def test_free_name_numbers_each_pattern_from_where_it_left_off(tmp_path):
+    prs = generate_deck.new_presentation()
+    with PptxStreamWriter(tmp_path / "names.pptx", prs) as writer:
+        names = [writer._free_name("/ppt/charts/chart1.xml")
+                 for _ in range(5)]
+        names.append(writer._free_name("/ppt/embeddings/sheet1.xlsx"))
+        names.append(writer._free_name("/ppt/charts/chart9.xml"))
+        names.append(writer._free_name("/ppt/charts/chart9.xml"))
+    assert names == [
+        "/ppt/charts/chart1.xml", "/ppt/charts/chart2.xml",
+        "/ppt/charts/chart3.xml", "/ppt/charts/chart4.xml",
+        "/ppt/charts/chart5.xml", "/ppt/embeddings/sheet1.xlsx",
+        "/ppt/charts/chart9.xml", "/ppt/charts/chart6.xml",
+    ]
+    assert writer._next_free[("/ppt/charts/chart", ".xml")] == 7
+
+
+def test_failed_stream_leaves_no_partial_file(tmp_path):
+    path = tmp_path / "charts.pptx"
+
+    def slides():
+        yield _bar_slide(1)
+        raise RuntimeError("spec went bad")
+
+    with pytest.raises(RuntimeError):
+        generate_deck.stream_deck({"slides": slides()}, path, backend="xml")
+    assert list(tmp_path.iterdir()) == []
+
+    generate_deck.stream_deck({"slides": [_bar_slide(1)]}, path)
+    before = path.read_bytes()
+    with pytest.raises(RuntimeError):
+        generate_deck.stream_deck({"slides": slides()}, path, backend="xml")
+    assert list(tmp_path.iterdir()) == [path]
+    assert path.read_bytes() == before
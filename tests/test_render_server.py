@@ -0,0 +1,112 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+import generate_deck
+import render_server
+
+
+def _deck(filename):
+    return {"filename": filename,
+            "slides": [{"layout": "title", "title": "Hi"}]}
+
+
+@pytest.mark.parametrize("name", ["../escaped", "a/b", "a\\b", "..",
+                                  "deck\x00", "deck\n", ""])
+def test_unsafe_filenames_are_rejected(name, tmp_path):
+    assert generate_deck.validate_deck(_deck(name))
+    with pytest.raises(ValueError):
+        generate_deck.output_path(_deck(name), "dark", tmp_path)
+    body = json.dumps({"deck": _deck(name), "return": "path"}).encode()
+    with pytest.raises(render_server.RequestError) as exc:
+        render_server.parse_request(body)
+    assert exc.value.status == 400
+
+
+def test_plain_filenames_are_kept(tmp_path):
+    assert generate_deck.validate_deck(_deck("Q3 Review é")) == []
+    path = generate_deck.output_path(_deck("Q3 Review"), "dark", tmp_path)
+    assert path == tmp_path / "Q3 Review_dark.pptx"
+
+
+def test_content_disposition_is_quoted():
+    header = render_server.content_disposition('a"b é.pptx')
+    assert header == ('attachment; filename="a_b _.pptx"; '
+                      "filename*=UTF-8''a%22b%20%C3%A9.pptx")
+
+
+class _NoService:
+    def submit(self, *args):
+        raise AssertionError("request should have been refused")
+
+    def stats(self):
+        return {}
+
+
+@pytest.fixture
+def server():
+    server = render_server.make_server(_NoService(), port=0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("content_type", [
+    None, "text/plain", "application/x-www-form-urlencoded"])
+def test_non_json_posts_get_415(server, content_type):
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    headers = {"Content-Type": content_type} if content_type else {}
+    conn.request("POST", "/render", json.dumps({"deck": _deck("x")}), headers)
+    resp = conn.getresponse()
+    resp.read()
+    conn.close()
+    assert resp.status == 415
+
+
+def _request(server, host=None):
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    conn.putrequest("GET", "/health", skip_host=host is not None)
+    if host is not None:
+        conn.putheader("Host", host)
+    conn.endheaders()
+    resp = conn.getresponse()
+    resp.read()
+    conn.close()
+    return resp.status
+
+
+def test_own_host_is_served(server):
+    port = server.server_address[1]
+    assert _request(server) == 200   # http.client sends 127.0.0.1:port
+    assert _request(server, f"localhost:{port}") == 200
+
+
+def test_foreign_host_headers_get_403(server):
+    port = server.server_address[1]
+    for host in ("evil.example", f"evil.example:{port}", "127.0.0.1:1"):
+        assert _request(server, host) == 403
+
+
+def _image_deck(path, **keys):
+    return dict({"slides": [{"layout": "image", "image": path}]}, **keys)
+
+
+@pytest.mark.parametrize("path", ["/etc/passwd", "../secret.png",
+                                  "img/../../secret.png"])
+def test_paths_outside_the_data_root_are_refused(path, tmp_path):
+    for deck in (_image_deck(path), {"slides": [
+            {"layout": "table", "title": "T", "source": {"csv": path}}]}):
+        body = json.dumps({"deck": deck}).encode()
+        with pytest.raises(render_server.RequestError, match="slide 1"):
+            render_server.parse_request(body, tmp_path)
+
+
+def test_client_base_dir_is_replaced_by_the_data_root(tmp_path):
+    body = json.dumps({"deck": _image_deck("img/a.png",
+                                           base_dir="/etc")}).encode()
+    job = render_server.parse_request(body, tmp_path)
+    assert job["deck"]["base_dir"] == str(tmp_path.resolve())
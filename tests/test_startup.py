@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import pytest
+
+from utils import startup_report
+
+ROOT = startup_report.ROOT
+
+# modules that only rendering or writing a deck needs
+RENDER_ONLY = ("pptx", "lxml", "zipfile", "utils.pptx_xml",
+               "utils.display_list", "utils.chart_series")
+
+
+def test_check_loads_no_rendering_modules():
+    code = ("import sys, runpy; sys.argv = ['generate_deck.py', '--check']\n"
+            "try:\n"
+            "    runpy.run_path('generate_deck.py', run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            f"print(sorted(set(sys.modules) & set({RENDER_ONLY!r})))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    assert out.splitlines()[-1] == "[]"
+
+
+# Import time is wall-clock and machine dependent, so the budget is checked
+# by running utils/startup_report.py, not here; which modules load is not.
+@pytest.mark.parametrize("argv", startup_report.COMMANDS,
+                         ids=" ".join)
+def test_cli_paths_load_no_heavy_modules(argv):
+    result = startup_report.measure(argv, set(), repeat=1)
+    assert result["heavy_modules"] == [], result["command"]
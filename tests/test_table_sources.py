@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+import generate_deck
+from utils import deck_spec
+from utils.slide_cache import SlideCache
+
+
+def _table_text(prs):
+    return [[cell.text for cell in row.cells]
+            for slide in prs.slides for shape in slide.shapes
+            if shape.has_table for row in shape.table.rows]
+
+
+@pytest.mark.parametrize("backend", ["pptx", "xml"])
+@pytest.mark.parametrize("paginate", [True, False])
+def test_cached_source_table_sees_edited_file(tmp_path, backend, paginate):
+    data = tmp_path / "tasks.csv"
+    deck = {"slides": [{"layout": "table", "title": "Tasks",
+                        "source": {"csv": str(data)}, "paginate": paginate}]}
+    cache = SlideCache(tmp_path / "cache")
+
+    data.write_text("name,owner\nSpec,Ann\n")
+    first = _table_text(generate_deck.render_deck(deck, "dark", cache, backend))
+    data.write_text("name,owner\nSpec,Bo\nBuild,Cy\n")
+    second = _table_text(generate_deck.render_deck(deck, "dark", cache, backend))
+
+    assert first == [["name", "owner"], ["Spec", "Ann"]]
+    assert second == [["name", "owner"], ["Spec", "Bo"], ["Build", "Cy"]]
+
+
+def test_spec_source_paths_are_relative_to_the_spec(tmp_path, monkeypatch):
+    decks = tmp_path / "decks"
+    (decks / "data").mkdir(parents=True)
+    (decks / "data" / "tasks.csv").write_text("name,owner\nSpec,Ann\n")
+    spec = decks / "tasks.json"
+    spec.write_text(json.dumps({"slides": [
+        {"layout": "table", "title": "Tasks",
+         "source": {"csv": "data/tasks.csv"}}]}))
+    monkeypatch.chdir(tmp_path)
+
+    deck = deck_spec.load_spec(spec)
+    assert deck["base_dir"] == str(decks)
+    prs = generate_deck.render_deck(deck, "dark")
+    assert _table_text(prs) == [["name", "owner"], ["Spec", "Ann"]]
+
+
+def test_table_with_rows_and_source_is_rejected():
+    slide = {"layout": "table", "title": "Tasks", "rows": [["a"]],
+             "source": {"csv": "tasks.csv"}}
+    problems = generate_deck.validate_slide(slide)
+    assert problems == ["slide 1 (table): give either 'rows' or a 'source', "
+                        "not both"]
+
+
+def test_sqlite_queries_can_only_read(tmp_path):
+    import sqlite3
+    from utils import table_sources
+    path = tmp_path / "app.db"
+    with sqlite3.connect(path) as db:
+        db.execute("CREATE TABLE tasks (name, owner)")
+        db.execute("INSERT INTO tasks VALUES ('Spec', 'Ann')")
+    db.close()
+    headers, rows = table_sources.open_source(
+        {"sqlite": str(path), "query": "SELECT upper(name) AS n FROM tasks"})
+    assert (headers, list(rows)) == (["n"], [["SPEC"]])
+    for query in (f"ATTACH DATABASE '{tmp_path / 'other.db'}' AS other",
+                  f"VACUUM INTO '{tmp_path / 'copy.db'}'"):
+        with pytest.raises(ValueError):
+            table_sources.open_source({"sqlite": str(path), "query": query})
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["app.db"]
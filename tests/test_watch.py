@@ -0,0 +1,27 @@
+import json
+import zipfile
+
+import generate_deck
+from utils import file_watch
+
+
+class _OneShot(file_watch.FileWatcher):
+    """A watcher whose first wait() stops watch() after the initial build."""
+
+    def wait(self, timeout=None):
+        raise KeyboardInterrupt
+
+
+def test_watch_applies_output_options_on_each_save(tmp_path, monkeypatch):
+    spec = tmp_path / "deck.json"
+    spec.write_text(json.dumps({"filename": "Watched", "slides": [
+        {"layout": "title", "title": "Hello"}]}))
+    monkeypatch.setattr(generate_deck, "OUTPUT_DIR", tmp_path / "out")
+    monkeypatch.setattr(file_watch, "FileWatcher", _OneShot)
+
+    generate_deck.watch(spec, ["dark"], compression="stored", optimize=True,
+                        formats=("pptx", "html"))
+    pptx = tmp_path / "out" / "Watched_dark.pptx"
+    with zipfile.ZipFile(pptx) as z:
+        assert {i.compress_type for i in z.infolist()} == {zipfile.ZIP_STORED}
+    assert pptx.with_suffix(".html").is_file()
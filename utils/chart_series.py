@@ -0,0 +1,189 @@
+"""
+Series data for chart slides: x values, downsampling and axis ranges.
+
+A line chart slide may carry a year of per-minute samples, over half a
+million points, when a few hundred show the same shape at slide size. The
+layouts in generate_deck.py reduce every series to a fixed point budget
+before it reaches a chart part:
+
+- lines keep the points picked by largest-triangle-three-buckets (LTTB):
+  one point per bucket, the one making the largest triangle with the point
+  kept before it and the average of the next bucket, so spikes and dips
+  survive where plain striding or averaging would flatten them;
+- bars are bucketed and aggregated (mean, sum, min or max), as a bar
+  stands for an amount rather than a sample.
+
+x values are numbers, dates and datetimes (or ISO strings of either, as
+JSON specs give them), which become Excel serial day numbers so they can
+be plotted to scale, or text labels, which are plotted evenly spaced.
+No python-pptx here.
+"""
+import math
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple
+
+from utils.gantt_layout import to_date
+
+AGGREGATES = ("mean", "sum", "min", "max")
+_EPOCH = datetime(1899, 12, 30)   # Excel's day 0 (1900 date system)
+_DAY = timedelta(days=1)
+
+
+class XValues(NamedTuple):
+    """Parsed x values: *kind* is "number", "date" or "label"; *values*
+    are floats (Excel serial days for dates) or, for labels, strings."""
+    kind: str
+    values: list
+
+
+def _to_datetime(value):
+    """*value* as a naive datetime, or None if it isn't a date of any kind."""
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, date):
+        return datetime.combine(value, time())
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.strip()).replace(tzinfo=None)
+        except ValueError:
+            pass
+        try:
+            return datetime.combine(to_date(value), time())
+        except ValueError:
+            return None
+    return None
+
+
+def _serials(x):
+    """Excel serial days of *x*, or None if any value isn't a date."""
+    try:
+        # the common cases in one pass: naive datetimes, or ISO strings
+        # as a JSON spec gives them
+        if not isinstance(x[0], datetime):
+            x = list(map(datetime.fromisoformat, x))
+        return [(stamp - _EPOCH) / _DAY for stamp in x]
+    except (TypeError, ValueError):
+        pass
+    stamps = [_to_datetime(v) for v in x]
+    if any(stamp is None for stamp in stamps):
+        return None
+    return [(stamp - _EPOCH) / _DAY for stamp in stamps]
+
+
+def x_values(x, n: int) -> XValues:
+    """Parse a slide's *x* list (or None: 0 .. n-1) for *n* points.
+
+    Raises ValueError if the lengths differ or the values are mixed.
+    """
+    if x is None:
+        return XValues("number", [float(i) for i in range(n)])
+    x = list(x)
+    if len(x) != n:
+        raise ValueError(f"{len(x)} x values for {n} points")
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool)
+           for v in x):
+        return XValues("number", [float(v) for v in x])
+    serials = _serials(x) if x else None
+    if serials is not None:
+        return XValues("date", serials)
+    return XValues("label", [str(v) for v in x])
+
+
+def lttb(xs, ys, budget: int) -> list:
+    """Indices of the *budget* points of (xs, ys) that LTTB keeps.
+
+    The first and last points are always kept; with *budget* below 3 or
+    at least len(ys), every index is returned.
+    """
+    n = len(ys)
+    if budget >= n or budget < 3:
+        return list(range(n))
+    every = (n - 2) / (budget - 2)
+    keep = [0]
+    a = 0
+    for i in range(budget - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        nxt = min(int((i + 2) * every) + 1, n)
+        avg_x = sum(xs[hi:nxt]) / (nxt - hi)
+        avg_y = sum(ys[hi:nxt]) / (nxt - hi)
+        # twice the triangle's area is |dx * y + dy * x + c|, linear in
+        # the candidate point, so each bucket is one pass
+        ax, ay = xs[a], ys[a]
+        dx, dy = ax - avg_x, avg_y - ay
+        c = -dx * ay - dy * ax
+        areas = [abs(dx * y + dy * x + c)
+                 for x, y in zip(xs[lo:hi], ys[lo:hi])]
+        a = lo + areas.index(max(areas))
+        keep.append(a)
+    keep.append(n - 1)
+    return keep
+
+
+def downsample(xs, series, budget: int) -> list:
+    """Indices to keep for several *series* sharing *xs*: the union of
+    each series' LTTB points at an equal share of *budget*."""
+    if not series or len(xs) <= budget:
+        return list(range(len(xs)))
+    share = max(3, budget // len(series))
+    keep = set()
+    for values in series:
+        keep.update(lttb(xs, values, share))
+    return sorted(keep)
+
+
+def buckets(n: int, budget: int) -> list:
+    """(start, end) index ranges splitting *n* points into at most
+    *budget* consecutive buckets of near-equal size."""
+    count = min(n, budget)
+    return [(i * n // count, (i + 1) * n // count) for i in range(count)]
+
+
+def aggregate(values, spans, how: str = "mean") -> list:
+    """One value per (start, end) span of *values*, combined by *how*."""
+    if how == "mean":
+        return [sum(values[s:e]) / (e - s) for s, e in spans]
+    combine = {"sum": sum, "min": min, "max": max}[how]
+    return [combine(values[s:e]) for s, e in spans]
+
+
+def date_format(span: float) -> tuple:
+    """(Excel number format, strftime format) for dates *span* days apart."""
+    if span <= 2:
+        return "h:mm", "%H:%M"
+    if span <= 180:
+        return "d mmm", "%d %b"
+    return "mmm yyyy", "%b %Y"
+
+
+def date_label(serial: float, fmt: str) -> str:
+    """An Excel serial day as text, formatted by strftime *fmt*."""
+    return (_EPOCH + timedelta(days=serial)).strftime(fmt).lstrip("0")
+
+
+def nice_step(span: float, steps: int = 6) -> float:
+    """A round step (1, 2, 2.5 or 5 times a power of ten) dividing *span*
+    into at most *steps* intervals."""
+    if span <= 0:
+        return 1.0
+    step = 10.0 ** math.floor(math.log10(span / steps))
+    for factor in (1, 2, 2.5, 5, 10):
+        if span / (step * factor) <= steps:
+            return step * factor
+    return step * 10
+
+
+def value_range(low: float, high: float) -> tuple:
+    """A (minimum, maximum) value axis for data from *low* to *high*.
+
+    Like Excel's automatic axis, it starts at zero unless the data sit
+    in a narrow band well above (or below) it, and ends on round steps.
+    """
+    if low >= 0 and (high == 0 or (high - low) / high > 1 / 6):
+        low = 0.0
+    elif high <= 0 and (low == 0 or (high - low) / -low > 1 / 6):
+        high = 0.0
+    if high == low:
+        high, low = high + 1, low - 1
+    step = nice_step(high - low)
+    return (math.floor(low / step) * step, math.ceil(high / step) * step)
@@ -0,0 +1,189 @@
+"""
+Per-slide profiling for deck generation.
+
+DeckProfiler records, for every slide, the wall time spent rendering it (or
+splicing it from the slide cache), the layout that produced it, the shapes
+and table cells it ended up with, and the size of its XML. Saving, streaming
+writes and theme re-skinning are recorded as separate spans, so render time
+and save time can be told apart.
+
+Results can be exported as a Chrome trace (open in chrome://tracing or
+https://ui.perfetto.dev) and summarized as a table of the most expensive
+slides plus per-renderer totals. Optionally, cProfile runs around a single
+renderer only, so its hot spots aren't drowned out by the rest of the deck.
+
+Used by generate_deck.py via --profile.
+"""
+import contextlib
+import json
+import os
+import time
+
+_NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+
+class DeckProfiler:
+    def __init__(self, cprofile_layout: str = None):
+        self.cprofile_layout = cprofile_layout
+        self.slides = []      # one dict per slide, in render order
+        self.spans = []       # (name, start, seconds, args) for save, reskin...
+        self._origin = time.perf_counter()
+        self._cprofile = None
+        self._pid = os.getpid()
+
+    # ── recording ────────────────────────────────────────────────────────
+
+    @contextlib.contextmanager
+    def slide(self, index: int, layout: str):
+        """Time one slide; the caller fills in record["slide"] when done."""
+        record = {"index": index, "layout": layout, "source": "render",
+                  "slide": None}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["start"] = start - self._origin
+            record["seconds"] = time.perf_counter() - start
+            record.update(self._measure(record.pop("slide")))
+            self.slides.append(record)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args):
+        """Time a non-slide step such as "save" or "reskin"."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, start - self._origin,
+                               time.perf_counter() - start, args))
+
+    def wrap(self, layout: str, renderer):
+        """Return *renderer*, run under cProfile if it's the layout to profile."""
+        if layout != self.cprofile_layout:
+            return renderer
+        if self._cprofile is None:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+
+        def profiled(*args, **kwargs):
+            self._cprofile.enable()
+            try:
+                return renderer(*args, **kwargs)
+            finally:
+                self._cprofile.disable()
+        return profiled
+
+    @staticmethod
+    def _measure(slide) -> dict:
+        """Shapes, table cells and XML bytes of a finished slide."""
+        if slide is None:
+            return {"shapes": 0, "cells": 0, "xml_bytes": 0}
+        element = slide.element
+        return {
+            "shapes": len(slide.shapes),
+            "cells": sum(1 for _ in element.iter(f"{{{_NS_A}}}tc")),
+            "xml_bytes": len(slide.part.blob),
+        }
+
+    # ── reporting ────────────────────────────────────────────────────────
+
+    def totals(self) -> dict:
+        """Seconds spent per step: "render" for slides, plus each span name."""
+        totals = {"render": sum(s["seconds"] for s in self.slides)}
+        for name, _, seconds, _ in self.spans:
+            totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def by_renderer(self) -> dict:
+        """Aggregate slide records per layout, most expensive layout first."""
+        groups = {}
+        for s in self.slides:
+            g = groups.setdefault(s["layout"], {
+                "slides": 0, "cached": 0, "seconds": 0.0, "max_seconds": 0.0,
+                "shapes": 0, "cells": 0, "xml_bytes": 0,
+            })
+            g["slides"] += 1
+            g["cached"] += s["source"] == "cache"
+            g["seconds"] += s["seconds"]
+            g["max_seconds"] = max(g["max_seconds"], s["seconds"])
+            for key in ("shapes", "cells", "xml_bytes"):
+                g[key] += s[key]
+        return dict(sorted(groups.items(), key=lambda kv: -kv[1]["seconds"]))
+
+    def trace_events(self) -> list:
+        """Chrome trace "complete" events, timestamps in microseconds."""
+        events = [{
+            "name": "process_name", "ph": "M", "pid": self._pid, "tid": 0,
+            "args": {"name": "generate_deck"},
+        }]
+        for s in self.slides:
+            events.append({
+                "name": f"slide {s['index'] + 1}: {s['layout']}",
+                "cat": s["source"], "ph": "X", "pid": self._pid, "tid": 0,
+                "ts": round(s["start"] * 1e6, 1),
+                "dur": round(s["seconds"] * 1e6, 1),
+                "args": {k: s[k] for k in ("layout", "shapes", "cells",
+                                           "xml_bytes")},
+            })
+        for name, start, seconds, args in self.spans:
+            events.append({
+                "name": name, "cat": name, "ph": "X", "pid": self._pid,
+                "tid": 0, "ts": round(start * 1e6, 1),
+                "dur": round(seconds * 1e6, 1),
+                "args": {k: str(v) for k, v in args.items()},
+            })
+        return events
+
+    def write_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(),
+                       "displayTimeUnit": "ms"}, f)
+
+    def write_cprofile(self, path) -> bool:
+        """Dump the scoped cProfile stats; False if the renderer never ran."""
+        if self._cprofile is None:
+            return False
+        self._cprofile.dump_stats(str(path))
+        return True
+
+    def summary(self, top: int = 10) -> str:
+        lines = []
+        totals = self.totals()
+        steps = ", ".join(f"{name} {seconds * 1000:.1f} ms"
+                          for name, seconds in totals.items())
+        lines.append(f"Profile: {len(self.slides)} slides — {steps}")
+
+        lines.append("")
+        lines.append(f"Slowest {min(top, len(self.slides))} slides:")
+        lines.append(f"{'Slide':>6}  {'Layout':<12} {'ms':>9} {'Shapes':>7} "
+                     f"{'Cells':>7} {'XML bytes':>10}  Source")
+        slowest = sorted(self.slides, key=lambda s: -s["seconds"])[:top]
+        for s in slowest:
+            lines.append(f"{s['index'] + 1:>6}  {s['layout']:<12} "
+                         f"{s['seconds'] * 1000:>9.2f} {s['shapes']:>7} "
+                         f"{s['cells']:>7} {s['xml_bytes']:>10,}  {s['source']}")
+
+        lines.append("")
+        lines.append("Per renderer:")
+        lines.append(f"{'Layout':<12} {'Slides':>6} {'Cached':>6} "
+                     f"{'Total ms':>9} {'Mean ms':>8} {'Max ms':>8} "
+                     f"{'Shapes':>7} {'Cells':>7} {'XML bytes':>10}")
+        for layout, g in self.by_renderer().items():
+            lines.append(
+                f"{layout:<12} {g['slides']:>6} {g['cached']:>6} "
+                f"{g['seconds'] * 1000:>9.2f} "
+                f"{g['seconds'] * 1000 / g['slides']:>8.2f} "
+                f"{g['max_seconds'] * 1000:>8.2f} {g['shapes']:>7} "
+                f"{g['cells']:>7} {g['xml_bytes']:>10,}"
+            )
+        return "\n".join(lines)
+
+    def cprofile_summary(self, limit: int = 20) -> str:
+        if self._cprofile is None:
+            return ""
+        import io
+        import pstats
+        out = io.StringIO()
+        stats = pstats.Stats(self._cprofile, stream=out)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
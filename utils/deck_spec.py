@@ -0,0 +1,313 @@
+"""
+Deck spec files and slide schemas.
+
+A deck spec is a DECK dict kept outside the code: a ``.json``, ``.yaml`` /
+``.yml`` or ``.toml`` file, or a ``.py`` file that defines ``DECK``.
+load_spec() reads any of them; read_data(), which theme files also go
+through, reads a whole .json / .yaml / .toml file. JSON specs are decoded incrementally:
+top-level keys before ``"slides"`` are read up front, and the slides come
+back as a generator that decodes one slide at a time, so a huge generated
+spec streams into rendering without ever being held in memory whole.
+
+Slide schemas are plain data, one dict per layout mapping each key to its
+type:
+
+    "text"   a string            "number"  an int or finite float
+    "bool"   True / False        "scalar"  text, number, bool, date or None
+    "date"   a date or date string, as gantt_layout.to_date() reads it
+    [spec]   a list of spec      {...}     a dict with those keys
+    (a, b)   one of the values a, b
+
+A trailing "!" marks a key as required ("text!"). Other type names can be
+supplied to compile_schema() as checks. compile_schema() turns a schema
+into a validator once; validating a slide then runs the pre-built checks.
+
+Used by generate_deck.py (--spec, validate_deck) and generate_batch.py.
+"""
+import json
+import re
+from datetime import date
+from math import isfinite
+from pathlib import Path
+
+SPEC_SUFFIXES = (".json", ".yaml", ".yml", ".toml", ".py")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LOADING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def read_data(path):
+    """The data in a .json, .yaml / .yml or .toml file, read whole."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML files need PyYAML (pip install pyyaml)") from None
+        with open(path, encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    if suffix == ".toml":
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    raise ValueError(f"unsupported file type '{path.suffix}'")
+
+
+def load_spec(path) -> dict:
+    """Load a DECK dict from a spec file.
+
+    ``filename`` defaults to the file's stem, and ``base_dir`` to its
+    directory, so data files the slides name are found beside the spec.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        deck = stream_json_deck(path)
+    elif suffix == ".py":
+        import runpy
+        deck = runpy.run_path(str(path)).get("DECK")
+    elif suffix in SPEC_SUFFIXES:
+        deck = read_data(path)
+    else:
+        raise ValueError(f"unsupported spec type '{path.suffix}'")
+    if not isinstance(deck, dict) or "slides" not in deck:
+        raise ValueError("spec does not define a DECK with 'slides'")
+    deck.setdefault("filename", path.stem)
+    deck.setdefault("base_dir", str(path.resolve().parent))
+    return deck
+
+
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+class _JsonReader:
+    """Decodes JSON values one at a time from a text file.
+
+    The buffer holds only the value being decoded. A value cut off by the
+    end of the buffer is retried after reading more, with the read size
+    doubling each time, so even a single huge slide decodes in linear time.
+    """
+
+    def __init__(self, f, chunk=1 << 16):
+        self._f = f
+        self._chunk = chunk
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size):
+        data = self._f.read(size)
+        if not data:
+            self._eof = True
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or '' at the end of the file."""
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or self._eof:
+                return self._buf[self._pos:self._pos + 1]
+            self._fill(self._chunk)
+
+    def expect(self, chars: str) -> str:
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"malformed JSON spec: expected one of {chars!r}, "
+                             f"got {ch or 'end of file'!r}")
+        self._pos += 1
+        return ch
+
+    def value(self):
+        self.peek()
+        size = self._chunk
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # a number at the end of the buffer may continue past it
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+
+def stream_json_deck(path) -> dict:
+    """Read a JSON deck, leaving ``slides`` as a generator of slide dicts.
+
+    Keys after ``"slides"`` (json.dump puts them in DECK order, so normally
+    there are none) are added to the deck once the slides run out.
+    """
+    f = open(path, encoding="utf-8")
+    try:
+        reader = _JsonReader(f)
+        reader.expect("{")
+        deck = {}
+        if reader.peek() == "}":
+            f.close()
+            return deck
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == "slides":
+                deck["slides"] = _stream_slides(reader, f, deck)
+                return deck
+            deck[key] = reader.value()
+            if reader.expect(",}") == "}":
+                f.close()
+                return deck
+    except BaseException:
+        f.close()
+        raise
+
+
+def _stream_slides(reader, f, deck):
+    with f:
+        reader.expect("[")
+        if reader.peek() != "]":
+            while True:
+                yield reader.value()
+                if reader.expect(",]") == "]":
+                    break
+        else:
+            reader.expect("]")
+        while reader.expect(",}") == ",":
+            key = reader.value()
+            reader.expect(":")
+            deck[key] = reader.value()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SCHEMAS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _is_text(value):
+    return isinstance(value, str)
+
+
+def _is_number(value):
+    # NaN and infinities can't be plotted or written to a chart's workbook
+    if isinstance(value, float):
+        return isfinite(value)
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_bool(value):
+    return isinstance(value, bool)
+
+
+def _is_scalar(value):
+    return value is None or isinstance(value, (str, int, float, date))
+
+
+def _is_date(value):
+    from utils.gantt_layout import to_date
+    try:
+        to_date(value)
+    except ValueError:
+        return False
+    return True
+
+
+_TYPES = {
+    "text": (_is_text, "text"),
+    "number": (_is_number, "a number"),
+    "bool": (_is_bool, "true or false"),
+    "scalar": (_is_scalar, "text, a number or a date"),
+    "date": (_is_date, "a date"),
+    "any": (lambda value: True, "anything"),
+}
+
+
+def _type_name(value) -> str:
+    if isinstance(value, float) and not isfinite(value):
+        return repr(value)   # nan, inf or -inf
+    return "null" if value is None else type(value).__name__
+
+
+def _compile(spec, checks):
+    """Return check(value) -> problem or None for one schema *spec*."""
+    if isinstance(spec, str):
+        name = spec.rstrip("!")
+        if name in checks:
+            return checks[name]
+        test, expected = _TYPES[name]
+
+        def check(value):
+            if not test(value):
+                return f"expected {expected}, got {_type_name(value)}"
+        return check
+
+    if isinstance(spec, tuple):
+        def check(value):
+            if value not in spec:
+                return (f"'{value}' is not one of "
+                        f"{', '.join(map(str, spec))}")
+        return check
+
+    if isinstance(spec, list):
+        item = _compile(spec[0], checks)
+        # lists of a built-in type (chart series run to millions of
+        # values) are tested in one pass; items are only walked one by
+        # one to report a failure
+        name = spec[0].rstrip("!") if isinstance(spec[0], str) else None
+        test = _TYPES[name][0] if name in _TYPES and name not in checks \
+            else None
+
+        def check(value):
+            if isinstance(value, (str, bytes, dict)) or \
+                    not hasattr(value, "__iter__"):
+                return f"expected a list, got {_type_name(value)}"
+            if not isinstance(value, (list, tuple)):
+                return None   # a generator: items are checked as they render
+            if test is not None and all(map(test, value)):
+                return None
+            for i, v in enumerate(value, 1):
+                problem = item(v)
+                if problem:
+                    return f"item {i}: {problem}"
+        return check
+
+    record = compile_schema(spec, checks)
+
+    def check(value):
+        if not isinstance(value, dict):
+            return f"expected a dict, got {_type_name(value)}"
+        problems = record(value)
+        return problems[0] if problems else None
+    return check
+
+
+def compile_schema(schema: dict, checks: dict = None):
+    """Compile a schema dict into ``validate(dict) -> [problem, ...]``.
+
+    *checks* maps extra type names to ``check(value) -> problem or None``.
+    Keys not in *schema* are reported, so misspelt keys don't pass
+    silently.
+    """
+    checks = checks or {}
+    required = [key for key, spec in schema.items()
+                if isinstance(spec, str) and spec.endswith("!")]
+    fields = {key: _compile(spec, checks) for key, spec in schema.items()}
+
+    def validate(data):
+        problems = [f"missing '{key}'" for key in required if key not in data]
+        for key, value in data.items():
+            check = fields.get(key)
+            if check is None:
+                problems.append(f"unknown key '{key}'")
+                continue
+            problem = check(value)
+            if problem:
+                problems.append(f"'{key}': {problem}")
+        return problems
+    return validate
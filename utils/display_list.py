@@ -0,0 +1,140 @@
+"""
+Display lists: a slide's layout as positioned primitives, apart from any
+output format.
+
+The layout functions (the ``_render_*`` functions in generate_deck.py)
+draw through the drawing helpers, ``_set_bg``, ``_add_text`` and the rest,
+which accept a DisplayList wherever they accept a slide. Drawing into one
+records each primitive with its final geometry and style (autoshrunk font
+sizes already applied) and touches neither python-pptx nor lxml.
+generate_deck.emit() replays a list into a python-pptx slide or a
+SlideXml builder; other outputs can walk the primitives directly.
+
+Storage is flat: one opcode byte and four doubles (left, top, width,
+height, in inches) per primitive in two arrays, with the remaining
+arguments in a parallel list. Iterating yields Primitive tuples. digest()
+hashes the content, so equal layouts can be recognised and layout results
+compared or memoized without rendering anything.
+
+Used by generate_deck.py (layout_slide, layout_deck, emit) and
+utils/html_export.py.
+"""
+import hashlib
+import json
+from array import array
+from functools import partial
+from typing import NamedTuple
+
+# Opcodes, one per primitive kind
+RECT, ROUND_RECT, OVAL, DIAMOND, TEXT, BULLETS, TABLE, CHART, PICTURE = range(9)
+OP_NAMES = ("rect", "roundRect", "ellipse", "diamond", "text", "bullets",
+            "table", "chart", "picture")
+# prstGeom name -> opcode, for the autoshapes _add_shape draws
+SHAPE_OPS = {"rect": RECT, "roundRect": ROUND_RECT, "ellipse": OVAL,
+             "diamond": DIAMOND}
+
+
+class Primitive(NamedTuple):
+    """One recorded primitive; *args* depends on *op* (see DisplayList)."""
+    op: int
+    left: float
+    top: float
+    width: float
+    height: float
+    args: tuple
+
+
+class DisplayList:
+    """The background and primitives of one laid-out slide.
+
+    *args* per opcode:
+
+    - RECT, ROUND_RECT, OVAL, DIAMOND: ``(fill, line, line_width)``
+    - TEXT: ``(text, size, bold, color, align)``
+    - BULLETS: ``(items, size, color, bullet_color, indent, hanging, pitch)``
+    - TABLE: ``(col_widths, rows, merges, style)``, as _add_table takes them
+    - CHART: ``(chart_type, categories, series, colors, min_value,
+      max_value, label_width, axes, style)``, as _add_chart takes them
+    - PICTURE: ``(source,)``, an image_cache.ImageSource
+    """
+
+    __slots__ = ("background", "_ops", "_boxes", "_args")
+
+    def __init__(self):
+        self.background = None
+        self._ops = bytearray()
+        self._boxes = array("d")
+        self._args = []
+
+    def _add(self, op, left, top, width, height, args):
+        self._ops.append(op)
+        self._boxes.extend((left, top, width, height))
+        self._args.append(args)
+
+    # ── recording (called by the generate_deck drawing helpers) ──────────
+
+    def set_bg(self, color):
+        self.background = color
+
+    def add_text(self, left, top, width, height, text, *,
+                 size=12, bold=False, color=None, align="l"):
+        self._add(TEXT, left, top, width, height,
+                  (text, size, bold, color, align))
+
+    def add_bullets(self, left, top, width, height, items, *, size, color,
+                    bullet_color, indent, hanging, pitch):
+        self._add(BULLETS, left, top, width, height,
+                  (tuple(items), size, color, bullet_color, indent, hanging,
+                   pitch))
+
+    def add_shape(self, prst, left, top, width, height, *,
+                  fill, line=None, line_width=None):
+        self._add(SHAPE_OPS[prst], left, top, width, height,
+                  (fill, line, line_width))
+
+    def add_table(self, left, top, width, height, col_widths, rows,
+                  merges=(), style="table"):
+        # rows are kept as given: shared fmt dicts stay shared on replay
+        self._add(TABLE, left, top, width, height,
+                  (tuple(col_widths), rows, tuple(merges), style))
+
+    def add_chart(self, left, top, width, height, chart_type, categories,
+                  series, colors=None, min_value=None, max_value=None,
+                  label_width=None, axes=True, style=None):
+        self._add(CHART, left, top, width, height,
+                  (chart_type, tuple(categories), tuple(series),
+                   None if colors is None else tuple(colors), min_value,
+                   max_value, label_width, axes, style))
+
+    def add_picture(self, left, top, width, height, source):
+        self._add(PICTURE, left, top, width, height, (source,))
+
+    # ── reading ──────────────────────────────────────────────────────────
+
+    def __len__(self):
+        return len(self._ops)
+
+    def __iter__(self):
+        boxes = self._boxes
+        for i, (op, args) in enumerate(zip(self._ops, self._args)):
+            yield Primitive(op, *boxes[4 * i:4 * i + 4], args)
+
+    def digest(self) -> str:
+        """Hex hash of the background and every primitive."""
+        h = hashlib.sha256()
+        h.update(json.dumps(self.background).encode("utf-8"))
+        h.update(bytes(self._ops))
+        h.update(self._boxes.tobytes())
+        h.update(json.dumps(self._args, default=_canonical,
+                            separators=(",", ":")).encode("utf-8"))
+        return h.hexdigest()
+
+
+def _canonical(value):
+    """JSON stand-in for what json can't encode (chart style callbacks)."""
+    if isinstance(value, partial):
+        return [_canonical(value.func), value.args,
+                sorted(value.keywords.items())]
+    if callable(value):
+        return f"{value.__module__}.{value.__qualname__}"
+    return repr(value)
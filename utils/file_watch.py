@@ -0,0 +1,154 @@
+"""
+Wait for files to change.
+
+FileWatcher blocks until one of a set of files is written, then returns
+the changed paths. On Linux it uses inotify (through ctypes, no extra
+packages) on the files' directories, so editors that save by writing a
+temporary file and renaming it over the original are seen too. Elsewhere,
+or if inotify is unavailable, it polls modification times.
+
+Bursts of events (an editor truncating, writing and renaming) are merged:
+wait() returns once the files have been quiet for *settle* seconds.
+
+Used by generate_deck.py --watch.
+"""
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+# inotify event masks (linux/inotify.h)
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENT = struct.Struct("iIII")
+
+POLL_INTERVAL = 0.2
+
+
+def _inotify():
+    """The libc inotify functions, or None where they are unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        return libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    def __init__(self, paths, settle: float = 0.05):
+        self.paths = {Path(p).resolve() for p in paths}
+        self.settle = settle
+        self._fd = None
+        self._dirs = {}   # watch descriptor -> directory
+        functions = _inotify()
+        if functions is not None:
+            self._start_inotify(*functions)
+        if self._fd is None:
+            self._stamps = {p: self._stamp(p) for p in self.paths}
+
+    @property
+    def method(self) -> str:
+        return "inotify" if self._fd is not None else "polling"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    # ── inotify ──────────────────────────────────────────────────────────
+
+    def _start_inotify(self, init, add_watch):
+        fd = init(os.O_CLOEXEC | os.O_NONBLOCK)
+        if fd < 0:
+            return
+        for directory in {p.parent for p in self.paths}:
+            wd = add_watch(fd, os.fsencode(directory), _IN_MASK)
+            if wd < 0:
+                os.close(fd)
+                self._dirs.clear()
+                return
+            self._dirs[wd] = directory
+        self._fd = fd
+
+    def _read_events(self) -> set:
+        """Watched paths named by the pending inotify events."""
+        changed = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name and wd in self._dirs:
+                path = self._dirs[wd] / os.fsdecode(name)
+                if path in self.paths:
+                    changed.add(path)
+        return changed
+
+    def _wait_inotify(self, timeout) -> set:
+        changed = set()
+        while True:
+            ready, _, _ = select.select([self._fd], [], [],
+                                        self.settle if changed else timeout)
+            if not ready:
+                return changed
+            changed |= self._read_events()
+
+    # ── polling ──────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _poll(self) -> set:
+        changed = set()
+        for path in self.paths:
+            stamp = self._stamp(path)
+            if stamp != self._stamps[path]:
+                self._stamps[path] = stamp
+                changed.add(path)
+        return changed
+
+    def _wait_polling(self, timeout) -> set:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._poll()
+            if changed:
+                time.sleep(self.settle)
+                return changed | self._poll()
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            time.sleep(POLL_INTERVAL)
+
+    # ── waiting ──────────────────────────────────────────────────────────
+
+    def wait(self, timeout: float = None) -> set:
+        """Block until a watched file changes; return the changed paths.
+
+        Returns an empty set if *timeout* seconds pass with no change.
+        """
+        if self._fd is None:
+            return self._wait_polling(timeout)
+        return self._wait_inotify(timeout)
@@ -0,0 +1,312 @@
+"""
+Date-based layout for Gantt roadmaps.
+
+Works out the time axis of a gantt slide and the geometry of its bars and
+milestones. Tasks give their start and end either as dates (``date``,
+``datetime``, ``"2026-02-15"`` or ``"15 Feb 2026"``) or, as before, as
+0-based indices into the slide's ``months`` list.
+
+For dated tasks the axis is derived from the earliest start and latest end:
+the finest of week, month or quarter columns that fits in MAX_COLUMNS, with
+a grouping row above (months over weeks, quarters over months, years over
+quarters). A slide may pin the window and scale with ``start``, ``end`` and
+``scale`` keys; generate_deck's paginator does this so every page of a long
+roadmap shares one axis.
+
+Geometry is computed column-wise, not task by task: dates become day
+ordinals in one pass, a per-day position table is built once for the axis,
+and bar edges are gathered from it for every task at once. A 5,000-task
+portfolio lays out in milliseconds. No python-pptx here.
+"""
+from datetime import date, datetime, timedelta
+from itertools import groupby
+
+SCALES = ("week", "month", "quarter")
+MAX_COLUMNS = 16
+
+_DATE_FORMATS = ("%d %b %Y", "%d %B %Y")
+
+
+def to_date(value) -> date:
+    """A task date as a ``datetime.date``.
+
+    Accepts dates, datetimes, ISO strings ("2026-02-15") and written dates
+    ("15 Feb 2026", "15 February 2026"); raises ValueError otherwise.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return date.fromisoformat(text)
+        except ValueError:
+            pass
+        for fmt in _DATE_FORMATS:
+            try:
+                return datetime.strptime(text, fmt).date()
+            except ValueError:
+                pass
+    raise ValueError(f"not a date: {value!r}")
+
+
+def is_index(value) -> bool:
+    """True for a month-index task bound (an int, but not a bool)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def format_date(d: date) -> str:
+    """"1 Mar 2026", the format the Due Date column uses."""
+    return f"{d.day} {d:%b %Y}"
+
+
+def span_problem(start, end):
+    """Why (*start*, *end*) can't bound a task, or None if it can."""
+    if is_index(start) and is_index(end):
+        return None
+    if is_index(start) or is_index(end):
+        return "start and end must both be month indices or both be dates"
+    try:
+        if to_date(end) < to_date(start):
+            return "end date is before start date"
+    except ValueError as exc:
+        return str(exc)
+    return None
+
+
+def tasks_problem(tasks):
+    """Why *tasks* can't share one axis, or None if they can.
+
+    Each task's bounds may be valid on their own (see span_problem) while
+    the slide mixes index-based and dated tasks, which no axis can place.
+    """
+    kinds = {is_index(t[2]) for t in tasks}
+    if len(kinds) > 1:
+        return "tasks mix month indices and dates; use one or the other"
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# AXIS
+# ═══════════════════════════════════════════════════════════════════════════
+
+class Axis:
+    """The columns of a Gantt chart.
+
+    *labels* has one entry per column and *groups* is a list of
+    ``(label, first, last)`` column ranges for the header row above them.
+    *edges* holds the day ordinal of every column boundary
+    (``len(labels) + 1`` values); it is None for an index axis, where task
+    bounds are column numbers already.
+    """
+
+    def __init__(self, labels, groups, edges=None, scale=None):
+        self.labels = list(labels)
+        self.groups = list(groups)
+        self.edges = edges
+        self.scale = scale
+        self._table = None
+
+    @property
+    def dated(self) -> bool:
+        return self.edges is not None
+
+    def ordinals(self, values) -> list:
+        """Task bounds as numbers on this axis: day ordinals or indices."""
+        if not self.dated:
+            return list(values)
+        return [to_date(v).toordinal() for v in values]
+
+    def positions(self, ordinals) -> list:
+        """Column positions (0 .. len(labels)) of the start of each ordinal.
+
+        Positions within a column are proportional to the day, so months
+        of different lengths each fill exactly one column. Dates outside a
+        pinned window are clamped to its edges.
+        """
+        if not self.dated:
+            return [float(o) for o in ordinals]
+        table = self._day_table()
+        origin, last = self.edges[0], len(table) - 1
+        return [table[min(max(o - origin, 0), last)] for o in ordinals]
+
+    def _day_table(self) -> list:
+        """Position of every day from the first edge to the last, built once."""
+        if self._table is None:
+            table = []
+            for col, (lo, hi) in enumerate(zip(self.edges, self.edges[1:])):
+                days = hi - lo
+                table.extend(col + d / days for d in range(days))
+            table.append(float(len(self.edges) - 1))
+            self._table = table
+        return self._table
+
+
+def index_axis(months, quarters) -> Axis:
+    """The axis of an index-based slide: *months* grouped into *quarters*.
+
+    Quarters split the months evenly, as the gantt layout always has.
+    """
+    months = list(months)
+    per_quarter = len(months) // len(quarters) if quarters else len(months)
+    groups = [
+        (q, i * per_quarter, min((i + 1) * per_quarter - 1, len(months) - 1))
+        for i, q in enumerate(quarters)
+    ]
+    return Axis(months, groups)
+
+
+def _quarter(d: date) -> int:
+    return (d.month - 1) // 3 + 1
+
+
+def _step(d: date, scale: str) -> date:
+    """The start of the column after the one starting on *d*."""
+    if scale == "week":
+        return d + timedelta(days=7)
+    months = 1 if scale == "month" else 3
+    year, month = divmod(d.month - 1 + months, 12)
+    return date(d.year + year, month + 1, 1)
+
+
+def _floor(d: date, scale: str) -> date:
+    """The start of the *scale* column containing *d*."""
+    if scale == "week":
+        return d - timedelta(days=d.weekday())
+    if scale == "month":
+        return d.replace(day=1)
+    return date(d.year, 3 * (_quarter(d) - 1) + 1, 1)
+
+
+def _column_starts(first: date, last: date, scale: str) -> list:
+    starts = [_floor(first, scale)]
+    while starts[-1] <= last:
+        starts.append(_step(starts[-1], scale))
+    return starts   # one more than the columns: the last is the end edge
+
+
+def _column_label(d: date, scale: str) -> str:
+    if scale == "week":
+        return f"{d.day} {d:%b}"
+    if scale == "month":
+        return f"{d:%b}"
+    return f"Q{_quarter(d)}"
+
+
+def _group_label(d: date, scale: str) -> str:
+    if scale == "week":
+        return f"{d:%b %Y}"
+    if scale == "month":
+        return f"Q{_quarter(d)} {d.year}"
+    return str(d.year)
+
+
+def date_axis(first, last, scale=None) -> Axis:
+    """Axis covering the dates *first* .. *last* inclusive.
+
+    *scale* is one of SCALES, or None to pick the finest scale that needs
+    no more than MAX_COLUMNS columns (quarters if none does).
+    """
+    first, last = to_date(first), to_date(last)
+    if last < first:
+        raise ValueError(f"axis ends ({last}) before it starts ({first})")
+    if scale is None:
+        for scale in SCALES:
+            if len(_column_starts(first, last, scale)) - 1 <= MAX_COLUMNS:
+                break
+    elif scale not in SCALES:
+        raise ValueError(f"unknown gantt scale {scale!r}; use one of {SCALES}")
+
+    starts = _column_starts(first, last, scale)
+    columns = starts[:-1]
+    groups = []
+    col = 0
+    for label, members in groupby(columns, lambda d: _group_label(d, scale)):
+        n = len(list(members))
+        groups.append((label, col, col + n - 1))
+        col += n
+    return Axis([_column_label(d, scale) for d in columns], groups,
+                [d.toordinal() for d in starts], scale)
+
+
+def resolve_axis(data: dict, tasks=None) -> Axis:
+    """The axis for a gantt slide dict.
+
+    Index-based slides use their ``months`` and ``quarters``. Dated slides
+    span their ``start`` .. ``end`` keys when given, otherwise the earliest
+    task start and latest task end, at their ``scale`` (default: auto).
+    Raises ValueError if the tasks mix month indices and dates.
+    """
+    tasks = data.get("tasks", []) if tasks is None else tasks
+    problem = tasks_problem(tasks)
+    if problem:
+        raise ValueError(problem)
+    if (is_index(tasks[0][2]) if tasks else "start" not in data):
+        return index_axis(data.get("months", []), data.get("quarters", []))
+    first = data.get("start")
+    last = data.get("end")
+    if first is None:
+        first = min(map(to_date, (t[2] for t in tasks)))
+    if last is None:
+        last = max(map(to_date, (t[3] for t in tasks)))
+    return date_axis(first, last, data.get("scale"))
+
+
+def pin_axis(data: dict, tasks) -> dict:
+    """Keys that fix a slide's axis to the one *tasks* give it.
+
+    Empty for index-based slides, whose axis never depends on the tasks.
+    """
+    axis = resolve_axis(data, tasks)
+    if not axis.dated:
+        return {}
+    return {"start": date.fromordinal(axis.edges[0]).isoformat(),
+            "end": date.fromordinal(axis.edges[-1] - 1).isoformat(),
+            "scale": axis.scale}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BAR GEOMETRY
+# ═══════════════════════════════════════════════════════════════════════════
+
+def bar_geometry(axis: Axis, tasks, *, left, top, width, row_h, bar_h,
+                 bar_pad, min_bar_w, milestone) -> list:
+    """Shapes for *tasks* as ``(prst, left, top, width, height, phase)``.
+
+    Task i sits in the row starting ``top + i * row_h``; the chart's
+    columns span *width* inches from *left*. A bar runs from the start of
+    its start column (or day) to the end of its end column (or day), inset
+    by *bar_pad* and at least *min_bar_w* wide. Milestones are *milestone*
+    inch diamonds centred on their start.
+    """
+    n_cols = len(axis.labels)
+    col_w = width / n_cols if n_cols else 1
+    starts = axis.ordinals(t[2] for t in tasks)
+    ends = axis.ordinals(t[3] for t in tasks)
+    lefts = axis.positions(starts)
+    rights = axis.positions([e + 1 for e in ends])
+    nexts = axis.positions([s + 1 for s in starts])
+
+    shapes = []
+    for i, task in enumerate(tasks):
+        row_top = top + i * row_h
+        if task[4]:
+            cx = left + (lefts[i] + nexts[i]) / 2 * col_w
+            cy = row_top + row_h / 2
+            shapes.append(("diamond", cx - milestone / 2, cy - milestone / 2,
+                           milestone, milestone, task[0]))
+        else:
+            bw = max(min_bar_w, (rights[i] - lefts[i]) * col_w - 2 * bar_pad)
+            shapes.append(("roundRect", left + lefts[i] * col_w + bar_pad,
+                           row_top + (row_h - bar_h) / 2, bw, bar_h, task[0]))
+    return shapes
+
+
+def due_text(value):
+    """Due Date cell text for a task's due value (date, string or None)."""
+    if not value:
+        return None
+    if isinstance(value, (date, datetime)):
+        return format_date(to_date(value))
+    return str(value)
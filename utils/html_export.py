@@ -0,0 +1,395 @@
+"""
+Decks as one self-contained HTML page, each slide an inline SVG.
+
+write_html() draws laid-out slides (utils/display_list.py DisplayLists,
+from generate_deck.layout_deck) straight to SVG: the background,
+rectangles, rounded rectangles, ovals and diamonds, text boxes, bulleted
+lists, tables in their table-style colours, pictures, and bar, line and
+XY line charts (sparklines included). The page embeds everything
+(pictures as data URIs), so it opens in any browser with no office suite,
+converter or network access, and takes about a millisecond per slide.
+
+Coordinates are in points (72 per inch), so font sizes carry over as they
+are. Text boxes don't wrap, as in the deck; table cells wrap at word
+boundaries using the Calibri metrics in utils/text_metrics.py. Glyphs come
+from the browser's Calibri, or Carlito, else its sans-serif font.
+
+Used by generate_deck.py --format html.
+"""
+import base64
+import math
+from html import escape
+
+from utils.display_list import (
+    BULLETS, CHART, DIAMOND, OVAL, PICTURE, ROUND_RECT, TABLE, TEXT,
+)
+from utils.text_metrics import TEXT_INSET, text_width
+
+PT = 72                      # SVG units per inch
+LINE_HEIGHT = 1.2            # single line spacing, as a multiple of the size
+INSET_Y = 0.05               # top and bottom inset of text boxes and cells
+ROUND_RECT_RADIUS = 0.16667  # roundRect corner, as a share of the short side
+BULLET_SCALE = 1.5           # bullet size relative to the text (buSzPct)
+DEFAULT_TEXT = (0, 0, 0)     # text with no colour set (the template's tx1)
+TABLE_BORDER = (255, 255, 255)   # table style borders (the template's lt1)
+DEFAULT_CELL_SIZE = 18
+CHART_TEXT_SIZE = 10
+
+FONT_FAMILY = "Calibri, Carlito, 'Segoe UI', Arial, sans-serif"
+
+_ANCHORS = {"l": "start", "ctr": "middle", "r": "end"}
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>%(title)s</title>
+<style>
+body { margin: 0; padding: 24px; background: #e5e7eb; font-family: %(font)s; }
+h1 { margin: 0 auto 16px; max-width: 1100px; font-size: 18px; color: #334155; }
+section { margin: 0 auto 24px; max-width: 1100px; }
+svg { display: block; width: 100%%; height: auto; box-shadow: 0 2px 8px rgba(0, 0, 0, .25); }
+svg text { white-space: pre; }
+.n { margin-top: 4px; font-size: 12px; color: #64748b; text-align: right; }
+</style>
+</head>
+<body>
+<h1>%(title)s</h1>
+"""
+
+
+def _hex(color) -> str:
+    return "#%02X%02X%02X" % tuple(color)
+
+
+def _num(value: float) -> str:
+    """A coordinate in points, to two decimals without trailing zeros."""
+    return ("%.2f" % value).rstrip("0").rstrip(".")
+
+
+def _text(x, baseline, text, size, color, *, bold=False, anchor="start"):
+    return ('<text x="%s" y="%s" font-size="%s"%s fill="%s"%s>%s</text>' % (
+        _num(x), _num(baseline), _num(size),
+        ' font-weight="bold"' if bold else "", _hex(color or DEFAULT_TEXT),
+        "" if anchor == "start" else ' text-anchor="%s"' % anchor,
+        escape(text, quote=False)))
+
+
+def _baseline(top_pt: float, size: float) -> float:
+    """Baseline of a line of *size* text whose line box starts at *top_pt*."""
+    return top_pt + size * (LINE_HEIGHT + 0.75) / 2
+
+
+def _aligned_x(left, width, align) -> float:
+    """x of *align*-aligned text in a box, insets applied (inches)."""
+    if align == "ctr":
+        return (left + width / 2) * PT
+    if align == "r":
+        return (left + width - TEXT_INSET) * PT
+    return (left + TEXT_INSET) * PT
+
+
+def _wrap(text: str, width: float, size: float, bold: bool) -> list:
+    """Split *text* into lines no wider than *width* inches."""
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if line and text_width(candidate, size, bold) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PRIMITIVES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _shape(op, left, top, width, height, fill, line, line_width) -> str:
+    x, y, w, h = left * PT, top * PT, width * PT, height * PT
+    paint = 'fill="%s"' % _hex(fill)
+    if line is not None:
+        paint += ' stroke="%s" stroke-width="%s"' % (
+            _hex(line), _num(line_width or 0.75))
+    if op == OVAL:
+        return '<ellipse cx="%s" cy="%s" rx="%s" ry="%s" %s/>' % (
+            _num(x + w / 2), _num(y + h / 2), _num(w / 2), _num(h / 2), paint)
+    if op == DIAMOND:
+        points = ((x + w / 2, y), (x + w, y + h / 2), (x + w / 2, y + h),
+                  (x, y + h / 2))
+        return '<polygon points="%s" %s/>' % (
+            " ".join(f"{_num(px)},{_num(py)}" for px, py in points), paint)
+    radius = ' rx="%s"' % _num(ROUND_RECT_RADIUS * min(w, h)) \
+        if op == ROUND_RECT else ""
+    return '<rect x="%s" y="%s" width="%s" height="%s"%s %s/>' % (
+        _num(x), _num(y), _num(w), _num(h), radius, paint)
+
+
+def _text_box(left, top, width, height, text, size, bold, color, align):
+    return _text(_aligned_x(left, width, align),
+                 _baseline((top + INSET_Y) * PT, size), text, size, color,
+                 bold=bold, anchor=_ANCHORS.get(align, "start"))
+
+
+def _bullets(left, top, width, height, items, size, color, bullet_color,
+             indent, hanging, pitch):
+    out = []
+    x = (left + TEXT_INSET + indent) * PT
+    line_top = (top + INSET_Y) * PT
+    for item in items:
+        baseline = _baseline(line_top, size)
+        # a bullet larger than its text sits on the text's midline
+        out.append(_text(x - hanging * PT,
+                         baseline + (BULLET_SCALE - 1) * size * 0.3,
+                         "•", size * BULLET_SCALE, bullet_color))
+        out.append(_text(x, baseline, item, size, color))
+        line_top += pitch * PT
+    return out
+
+
+def _table(left, top, width, height, col_widths, rows, merges, colors):
+    """A table as _add_table draws it, coloured like its table style."""
+    xs = [left]
+    for w in col_widths:
+        xs.append(xs[-1] + w)
+    row_h = height / len(rows)
+    spans, covered = {}, set()
+    for (r0, c0), (r1, c1) in merges:
+        spans[r0, c0] = (r1 + 1, c1 + 1)
+        covered.update((r, c) for r in range(r0, r1 + 1)
+                       for c in range(c0, c1 + 1) if (r, c) != (r0, c0))
+
+    fills, borders, texts = [], [], []
+    for r, row in enumerate(rows):
+        header = r == 0
+        band = colors["header_fill"] if header else colors["bands"][(r - 1) % 2]
+        for c, (text, fmt) in enumerate(row):
+            if (r, c) in covered:
+                continue
+            r1, c1 = spans.get((r, c), (r + 1, c + 1))
+            x, y = xs[c], top + r * row_h
+            w, h = xs[c1] - x, (r1 - r) * row_h
+            fill = fmt.get("fill") or band
+            fills.append('<rect x="%s" y="%s" width="%s" height="%s" fill="%s"/>'
+                         % (_num(x * PT), _num(y * PT), _num(w * PT),
+                            _num(h * PT), _hex(fill)))
+            borders.append('<rect x="%s" y="%s" width="%s" height="%s"/>' % (
+                _num(x * PT), _num(y * PT), _num(w * PT), _num(h * PT)))
+            if not text:
+                continue
+            size = fmt.get("size") or DEFAULT_CELL_SIZE
+            bold = fmt.get("bold")
+            bold = header if bold is None else bold
+            color = fmt.get("color") or \
+                colors["header_text" if header else "body_text"]
+            align = fmt.get("align") or "l"
+            line_top = (y + INSET_Y) * PT
+            for line in _wrap(str(text), w - 2 * TEXT_INSET, size, bold):
+                texts.append(_text(_aligned_x(x, w, align),
+                                   _baseline(line_top, size), line, size,
+                                   color, bold=bold,
+                                   anchor=_ANCHORS.get(align, "start")))
+                line_top += size * LINE_HEIGHT
+    header_rule = '<line x1="%s" y1="%s" x2="%s" y2="%s" stroke-width="3"/>' % (
+        _num(xs[0] * PT), _num((top + row_h) * PT), _num(xs[-1] * PT),
+        _num((top + row_h) * PT))
+    return fills + [
+        '<g fill="none" stroke="%s" stroke-width="1">' % _hex(TABLE_BORDER),
+        *borders, header_rule, "</g>",
+    ] + texts
+
+
+def _picture(left, top, width, height, source, picture):
+    image = picture(source, width, height)
+    mime = "image/png" if image.ext == "png" else "image/jpeg"
+    return ('<image x="%s" y="%s" width="%s" height="%s" '
+            'preserveAspectRatio="none" href="data:%s;base64,%s"/>' % (
+                _num(left * PT), _num(top * PT), _num(width * PT),
+                _num(height * PT), mime,
+                base64.b64encode(image.data).decode("ascii")))
+
+
+def _tick_step(top: float) -> float:
+    """A round gridline step giving at most a dozen steps up to *top*
+    (whole units once *top* reaches 1)."""
+    if top <= 0:
+        return 1.0
+    step = 1.0 if top >= 1 else 10.0 ** math.floor(math.log10(top))
+    while True:
+        for factor in (1, 2, 2.5, 5):
+            if top / (step * factor) <= 12:
+                return step * factor
+        step *= 10
+
+
+def _chart(left, top, width, height, chart_type, categories, series,
+           colors, min_value, max_value, label_width, axes, theme):
+    """Bar, column, line and XY line charts from _add_chart's series and
+    options.
+
+    Bars run top to bottom in category order; XY charts are drawn to scale
+    between their smallest and largest x. Value tick labels and legends
+    are not drawn.
+    """
+    palette = theme.get("bar_palette") or [theme["accent"]]
+    if colors is None:
+        colors = [palette[i % len(palette)] for i in range(len(series))]
+    stacked = "STACKED" in chart_type
+    horizontal = chart_type.startswith("BAR")
+    xy = chart_type.startswith("XY_")
+    values = [[v or 0 for v in vals] for _, vals in series]
+    low = min_value or 0
+    if max_value is None:
+        totals = [sum(col) for col in zip(*values)] if stacked else \
+            [max(vals, default=0) for vals in values]
+        max_value = max(totals, default=0) or 1
+    high = max_value if max_value > low else low + 1
+    n = max(len(categories), 1)
+    text_color = theme["body_text"]
+    out = []
+
+    if not axes:
+        px, py, pw, ph = left, top, width, height
+    elif horizontal:
+        label_w = width * (0.25 if label_width is None else label_width)
+        px, py, pw, ph = left + label_w, top, width - label_w, height
+    else:
+        label_h = 0.3
+        px, py, pw, ph = left, top, width, height - label_h
+    px, py, pw, ph = px * PT, py * PT, pw * PT, ph * PT
+    scale = (pw if horizontal else ph) / (high - low)
+
+    def at(v):
+        """Position of value *v* along the value axis."""
+        v = min(max(v, low), high)
+        return px + (v - low) * scale if horizontal else \
+            py + ph - (v - low) * scale
+
+    if axes:
+        step = _tick_step(high - low)
+        tick = math.ceil(low / step - 1e-9) * step
+        out.append('<g stroke="%s" stroke-width="0.75">'
+                   % _hex(theme["divider"]))
+        while tick <= high + 1e-9:
+            if horizontal:
+                out.append('<line x1="%s" y1="%s" x2="%s" y2="%s"/>' % (
+                    _num(at(tick)), _num(py), _num(at(tick)), _num(py + ph)))
+            else:
+                out.append('<line x1="%s" y1="%s" x2="%s" y2="%s"/>' % (
+                    _num(px), _num(at(tick)), _num(px + pw), _num(at(tick))))
+            tick += step
+        out.append("</g>")
+
+    band = (ph if horizontal else pw) / n
+    bar = band * (0.5 if stacked or chart_type.startswith("LINE") else
+                  0.7 / max(len(series), 1))
+    for i, category in enumerate(categories if axes and not xy else ()):
+        mid = (py if horizontal else px) + band * (i + 0.5)
+        if horizontal:
+            out.append(_text(px - 0.08 * PT, mid + CHART_TEXT_SIZE * 0.35,
+                             str(category), CHART_TEXT_SIZE, text_color,
+                             anchor="end"))
+        else:
+            out.append(_text(mid, py + ph + CHART_TEXT_SIZE * 1.3,
+                             str(category), CHART_TEXT_SIZE, text_color,
+                             anchor="middle"))
+
+    if chart_type.startswith(("LINE", "XY_")):
+        if xy:
+            x0 = min(categories, default=0)
+            x_scale = pw / ((max(categories, default=0) - x0) or 1)
+            xs = [px + (x - x0) * x_scale for x in categories]
+        else:
+            xs = [px + band * (i + 0.5) for i in range(len(categories))]
+        for vals, color in zip(values, colors):
+            if color is None:
+                continue
+            points = " ".join("%s,%s" % (_num(x), _num(at(v)))
+                              for x, v in zip(xs, vals))
+            out.append('<polyline points="%s" fill="none" stroke="%s" '
+                       'stroke-width="2" stroke-linejoin="round"/>' % (
+                           points, _hex(color)))
+        return out
+
+    offsets = [0.0] * len(categories)
+    for k, (vals, color) in enumerate(zip(values, colors)):
+        for i, v in enumerate(vals):
+            base = offsets[i] if stacked else 0.0
+            if stacked:
+                offsets[i] += v
+            if color is None or not v:
+                continue
+            start = (py if horizontal else px) + band * i + (band - (
+                bar if stacked else bar * len(values))) / 2
+            if not stacked:
+                start += bar * k
+            a, b = sorted((at(base), at(base + v)))
+            if horizontal:
+                rect = (a, start, b - a, bar)
+            else:
+                rect = (start, a, bar, b - a)
+            out.append('<rect x="%s" y="%s" width="%s" height="%s" fill="%s"/>'
+                       % (*map(_num, rect), _hex(color)))
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SLIDES AND PAGES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def slide_svg(display, theme: dict, table_styles: dict, size=(10, 7.5),
+              picture=None) -> str:
+    """One laid-out slide as an SVG element.
+
+    *theme* supplies chart colours; *table_styles* maps each table style
+    key to its colours (generate_deck.table_style_colors()); *size* is the
+    slide's width and height in inches. *picture* is called as
+    ``picture(source, width, height)`` for the image_cache.PreparedImage
+    of each picture.
+    """
+    w, h = size[0] * PT, size[1] * PT
+    out = ['<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 %s %s" '
+           'font-family="%s">' % (_num(w), _num(h), FONT_FAMILY)]
+    if display.background is not None:
+        out.append('<rect width="%s" height="%s" fill="%s"/>' % (
+            _num(w), _num(h), _hex(display.background)))
+    for op, left, top, width, height, args in display:
+        if op == TEXT:
+            out.append(_text_box(left, top, width, height, *args))
+        elif op == BULLETS:
+            out.extend(_bullets(left, top, width, height, *args))
+        elif op == TABLE:
+            col_widths, rows, merges, style = args
+            out.extend(_table(left, top, width, height, col_widths, rows,
+                              merges, table_styles[style]))
+        elif op == CHART:
+            out.extend(_chart(left, top, width, height, *args[:-1], theme))
+        elif op == PICTURE:
+            out.append(_picture(left, top, width, height, *args, picture))
+        else:
+            out.append(_shape(op, left, top, width, height, *args))
+    out.append("</svg>")
+    return "\n".join(out)
+
+
+def write_html(displays, path, theme: dict, table_styles: dict, *,
+               title: str = "Deck", size=(10, 7.5), picture=None) -> int:
+    """Write *displays* (any iterable of DisplayLists) as one HTML page.
+
+    Slides are written as they come, so a generator is never held whole.
+    Returns the number of slides written.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_PAGE % {"title": escape(title), "font": FONT_FAMILY})
+        for count, display in enumerate(displays, 1):
+            f.write('<section id="slide-%d">\n' % count)
+            f.write(slide_svg(display, theme, table_styles, size, picture))
+            f.write('\n<div class="n">%d</div>\n</section>\n' % count)
+        f.write("</body>\n</html>\n")
+    return count
@@ -0,0 +1,235 @@
+"""
+Pictures for image slides: downscaled, recompressed and cached on disk.
+
+A screenshot pasted at full resolution can be several megabytes; placed
+on a slide it needs only enough pixels for its size there. ImageCache
+decodes each source image, downscales it to its placed size at DPI
+pixels per inch (never upscaling), and re-encodes it: PNG if it has
+transparency or at most 256 colours (diagrams, most flat screenshots),
+otherwise JPEG at QUALITY. If the result isn't smaller than the source,
+the source bytes are used as they are.
+
+Results are keyed by (hash of the source bytes, target pixel size,
+quality), so the same image placed on many slides, or in many decks, is
+prepared once; files on disk are content-addressed like the slide cache
+and capped in bytes, least recently used first out. Decoding and
+encoding run on a thread pool (Pillow releases the GIL while it works):
+submit() starts preparing an image ahead of the slide that needs it, and
+get() waits for the result.
+
+Used by generate_deck.py for the "image" layout.
+"""
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DPI = 150            # pixels per inch of placed size
+QUALITY = 85         # JPEG quality
+MAX_COLORS = 256     # up to this many colours, PNG with a palette
+MAX_IN_MEMORY = 64   # finished pictures kept in memory for reuse
+_EXTS = ("png", "jpg")
+
+
+class ImageSource(NamedTuple):
+    """A source image: its path, content hash and upright pixel size."""
+    path: str
+    digest: str
+    width: int
+    height: int
+
+
+class PreparedImage(NamedTuple):
+    data: bytes
+    ext: str      # "png" or "jpg"
+
+
+def _prepare(path: str, size: tuple, quality: int) -> PreparedImage:
+    """Decode *path*, fit it within *size* pixels and re-encode it."""
+    from PIL import Image, ImageOps
+
+    with open(path, "rb") as f:
+        original = f.read()
+    with Image.open(io.BytesIO(original)) as image:
+        source_format = image.format
+        # JPEG: decode at a reduced scale (square, as the EXIF rotation
+        # hasn't been applied yet)
+        image.draft("RGB", (max(size), max(size)))
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or \
+            (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    if image.width > size[0] or image.height > size[1]:
+        image.thumbnail(size, Image.LANCZOS)
+
+    out = io.BytesIO()
+    colors = None if has_alpha else image.getcolors(MAX_COLORS)
+    if colors is not None:
+        # few colours: a palette of exactly those, so nothing is lost
+        palette = Image.new("P", (1, 1))
+        palette.putpalette([c for _, rgb in colors for c in rgb])
+        image = image.quantize(palette=palette, dither=Image.Dither.NONE)
+    if has_alpha or colors is not None:
+        image.save(out, "PNG", optimize=True)
+        ext = "png"
+    else:
+        image.save(out, "JPEG", quality=quality, optimize=True)
+        ext = "jpg"
+    if len(original) <= out.tell() and source_format in ("PNG", "JPEG"):
+        return PreparedImage(original, "png" if source_format == "PNG" else "jpg")
+    return PreparedImage(out.getvalue(), ext)
+
+
+class ImageCache:
+    def __init__(self, root=None, max_bytes: int = DEFAULT_MAX_BYTES, *,
+                 dpi: int = DPI, quality: int = QUALITY, workers: int = None):
+        self.root = Path(root) if root is not None else None
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.dpi = dpi
+        self.quality = quality
+        self.hits = 0
+        self.misses = 0
+        self._workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._lock = threading.Lock()
+        self._sources = {}   # (path, mtime, size) -> ImageSource
+        self._pending = OrderedDict()   # key -> Future of PreparedImage
+        self._size = None
+
+    # ── sources and keys ─────────────────────────────────────────────────
+
+    def source(self, path) -> ImageSource:
+        """Hash *path* and read its pixel size (from the header only)."""
+        from PIL import Image, UnidentifiedImageError
+
+        path = str(path)
+        try:
+            stat = os.stat(path)
+            stamp = (path, stat.st_mtime_ns, stat.st_size)
+            if stamp in self._sources:
+                return self._sources[stamp]
+            with open(path, "rb") as f:
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+                f.seek(0)
+                with Image.open(f) as image:
+                    width, height = image.size
+                    # EXIF orientations 5-8 are rotated a quarter turn. A
+                    # PNG's getexif() decodes the whole image to find an
+                    # eXIf chunk after the pixels; only look before them.
+                    exif = image.getexif() if image.format != "PNG" \
+                        or "exif" in image.info else {}
+                    if exif.get(0x0112, 1) in (5, 6, 7, 8):
+                        width, height = height, width
+        except (OSError, UnidentifiedImageError) as exc:
+            raise ValueError(f"image '{path}': {exc}") from None
+        source = self._sources[stamp] = ImageSource(path, digest, width, height)
+        return source
+
+    def pixels(self, width: float, height: float) -> tuple:
+        """Target pixel size for a picture placed *width* x *height* inches."""
+        return (max(1, round(width * self.dpi)), max(1, round(height * self.dpi)))
+
+    def _key(self, source: ImageSource, size: tuple) -> str:
+        return f"{source.digest}-{size[0]}x{size[1]}-q{self.quality}"
+
+    def _path(self, key: str, ext: str) -> Path:
+        return self.root / key[:2] / f"{key}.{ext}"
+
+    # ── preparing ────────────────────────────────────────────────────────
+
+    def submit(self, source: ImageSource, width: float, height: float):
+        """Start preparing *source* for a *width* x *height* inch picture."""
+        size = self.pixels(width, height)
+        key = self._key(source, size)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                self._pending.move_to_end(key)
+                return future
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    self._workers, thread_name_prefix="image")
+            future = self._pending[key] = self._pool.submit(
+                self._load, key, source.path, size)
+            # forget the oldest finished pictures (the disk cache keeps them)
+            for old in list(self._pending)[:-MAX_IN_MEMORY]:
+                if self._pending[old].done():
+                    del self._pending[old]
+        return future
+
+    def get(self, source: ImageSource, width: float,
+            height: float) -> PreparedImage:
+        """The prepared picture, waiting for it if it is still in progress."""
+        return self.submit(source, width, height).result()
+
+    def _load(self, key: str, path: str, size: tuple) -> PreparedImage:
+        if self.root is not None:
+            for ext in _EXTS:
+                cached = self._path(key, ext)
+                try:
+                    data = cached.read_bytes()
+                    os.utime(cached)  # mark as recently used
+                except FileNotFoundError:
+                    continue
+                with self._lock:
+                    self.hits += 1
+                return PreparedImage(data, ext)
+        with self._lock:
+            self.misses += 1
+        try:
+            image = _prepare(path, size, self.quality)
+        except OSError as exc:
+            raise ValueError(f"image '{path}': {exc}") from None
+        if self.root is not None:
+            self._store(key, image)
+        return image
+
+    def _store(self, key: str, image: PreparedImage):
+        path = self._path(key, image.ext)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(image.data)
+        os.replace(tmp, path)  # atomic, so concurrent readers never see a partial file
+        with self._lock:
+            if self._size is None:
+                self._size = sum(e.stat().st_size for e in self._entries())
+            else:
+                self._size += len(image.data)
+            if self._size > self.max_bytes:
+                self.evict()
+
+    def _entries(self):
+        for sub in self.root.iterdir():
+            if sub.is_dir():
+                yield from (e for e in os.scandir(sub)
+                            if e.name.endswith((".png", ".jpg")))
+
+    def evict(self):
+        """Delete least recently used entries until under 90% of the cap."""
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        self._size = sum(e.stat().st_size for e in entries)
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if self._size <= target:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def summary(self) -> str:
+        return f"Image cache: {self.hits} hits, {self.misses} prepared"
@@ -0,0 +1,378 @@
+"""
+Size optimization for generated .pptx and .docx files.
+
+optimize_package() rewrites an Office package in one pass:
+
+- Unused parts are dropped. Slide layouts that no slide uses are removed
+  from their master, a master left with no used layouts goes too, and
+  any part no longer reachable from the package relationships is deleted
+  along with its content-type entry. The base template carries eleven
+  layouts; a generated deck uses one.
+- XML is compacted. Empty elements and attributes that only restate the
+  schema default (``<a:lstStyle/>``, ``<a:avLst/>``, ``<a:tcPr/>``,
+  ``rtlCol="0"``) are stripped. In Word documents, the revision-session
+  ``w:rsid*`` attributes and ``w:proofErr`` marks are removed. Adjacent
+  runs with identical formatting are merged into one, in both formats.
+- The zip is written at the chosen COMPRESSION: "stored" for the fastest
+  local writes, "max" for archival.
+
+It returns a report dict with the size before and after and the time
+taken; format_report() turns that into one line. The rewritten file opens
+exactly as before: only markup with no effect on rendering is removed.
+
+Used by generate_deck.py and generate_report.py (--optimize,
+--compression).
+"""
+import io
+import posixpath
+import re
+import time
+
+# zipfile.ZIP_STORED and ZIP_DEFLATED, spelt out so that importing this
+# module (for the --compression choices, say) doesn't load zipfile
+_ZIP_STORED, _ZIP_DEFLATED = 0, 8
+
+# name -> (zipfile compression, compresslevel)
+COMPRESSION = {
+    "stored": (_ZIP_STORED, None),
+    "fast": (_ZIP_DEFLATED, 1),
+    "deflate": (_ZIP_DEFLATED, 6),
+    "max": (_ZIP_DEFLATED, 9),
+}
+
+_NS_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+_NS_CT = "http://schemas.openxmlformats.org/package/2006/content-types"
+_NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+_NS_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+_RT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+_RT_LAYOUT = _RT + "slideLayout"
+_RT_MASTER = _RT + "slideMaster"
+
+# Elements that may be dropped when empty: every one is optional and an
+# empty one means the same as none at all.
+_EMPTY_DEFAULTS = {f"{{{_NS_A}}}lstStyle", f"{{{_NS_A}}}avLst",
+                   f"{{{_NS_A}}}tcPr"}
+# (attribute, schema default) pairs that may be dropped on any element
+_DEFAULT_ATTRS = (("rtlCol", "0"),)
+
+_RSID = re.compile(rf"{{{re.escape(_NS_W)}}}rsid")
+_XML_PART = re.compile(r"\.(xml|rels)$")
+
+
+def _rels_name(name: str) -> str:
+    directory, base = posixpath.split(name)
+    return posixpath.join(directory, "_rels", base + ".rels")
+
+
+def _resolve(source: str, target: str) -> str:
+    if target.startswith("/"):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source), target))
+
+
+def _serialize(root) -> bytes:
+    from lxml import etree
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8",
+                          standalone=True)
+
+
+class _Package:
+    """The parts of a zip package, with their relationships parsed on demand."""
+
+    def __init__(self, zin):
+        self.names = zin.namelist()
+        self.blobs = {name: zin.read(name) for name in self.names}
+        self._trees = {}
+        self.changed = set()
+
+    def tree(self, name):
+        if name not in self._trees:
+            from lxml import etree
+            self._trees[name] = etree.fromstring(self.blobs[name])
+        return self._trees[name]
+
+    def rels(self, name: str) -> list:
+        """``(element, rId, type, target part)`` for the relationships of *name*."""
+        rels_name = "_rels/.rels" if name == "" else _rels_name(name)
+        if rels_name not in self.blobs:
+            return []
+        out = []
+        for rel in self.tree(rels_name):
+            if rel.get("TargetMode") == "External":
+                continue
+            out.append((rel, rel.get("Id"), rel.get("Type"),
+                        _resolve(name, rel.get("Target"))))
+        return out
+
+    def drop_rel(self, name: str, rel):
+        rel.getparent().remove(rel)
+        self.changed.add(_rels_name(name))
+
+    def reachable(self) -> set:
+        seen, stack = set(), [""]
+        while stack:
+            name = stack.pop()
+            for _, _, _, target in self.rels(name):
+                if target not in seen and target in self.blobs:
+                    seen.add(target)
+                    stack.append(target)
+        return seen
+
+    def delete(self, name: str):
+        for key in (name, _rels_name(name)):
+            if key in self.blobs:
+                del self.blobs[key]
+                self._trees.pop(key, None)
+                self.changed.discard(key)
+
+    def serialize_changed(self):
+        for name in self.changed:
+            self.blobs[name] = _serialize(self._trees[name])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PRUNING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _prune_layouts(pkg: _Package) -> None:
+    """Remove slide layouts no slide uses, and masters left with none."""
+    presentation = "ppt/presentation.xml"
+    if presentation not in pkg.blobs:
+        return
+    used = set()
+    masters = []
+    for name in pkg.blobs:
+        if not name.endswith(".xml") or "/_rels/" in name:
+            continue
+        if name.startswith("ppt/slideMasters/"):
+            masters.append(name)
+            continue
+        used.update(t for _, _, kind, t in pkg.rels(name) if kind == _RT_LAYOUT)
+    if not used:   # no slides: keep the template intact
+        return
+
+    kept_masters = []
+    for master in masters:
+        stale = {rid: rel for rel, rid, kind, target in pkg.rels(master)
+                 if kind == _RT_LAYOUT and target not in used}
+        if not stale:
+            kept_masters.append(master)
+            continue
+        layout_ids = pkg.tree(master).find(f"{{{_NS_P}}}sldLayoutIdLst")
+        for entry in list(layout_ids if layout_ids is not None else ()):
+            if entry.get(f"{{{_NS_R}}}id") in stale:
+                layout_ids.remove(entry)
+        for rel in stale.values():
+            pkg.drop_rel(master, rel)
+        pkg.changed.add(master)
+        if layout_ids is not None and len(layout_ids):
+            kept_masters.append(master)
+
+    if not kept_masters:
+        return
+    master_ids = pkg.tree(presentation).find(f"{{{_NS_P}}}sldMasterIdLst")
+    for rel, rid, kind, target in pkg.rels(presentation):
+        if kind == _RT_MASTER and target not in kept_masters:
+            for entry in list(master_ids):
+                if entry.get(f"{{{_NS_R}}}id") == rid:
+                    master_ids.remove(entry)
+            pkg.drop_rel(presentation, rel)
+            pkg.changed.add(presentation)
+
+
+def _prune_unreachable(pkg: _Package) -> int:
+    keep = pkg.reachable()
+    removed = 0
+    for name in list(pkg.blobs):
+        if name == "[Content_Types].xml" or name.endswith(".rels"):
+            continue
+        if name not in keep:
+            pkg.delete(name)
+            removed += 1
+    types = pkg.tree("[Content_Types].xml")
+    for override in types.findall(f"{{{_NS_CT}}}Override"):
+        if override.get("PartName").lstrip("/") not in pkg.blobs:
+            types.remove(override)
+            pkg.changed.add("[Content_Types].xml")
+    return removed
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# COMPACTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _same_format(a, b, rpr_tag) -> bool:
+    from lxml import etree
+    pa, pb = a.find(rpr_tag), b.find(rpr_tag)
+    if pa is None or pb is None:
+        return pa is None and pb is None
+    return etree.tostring(pa, method="c14n") == etree.tostring(pb, method="c14n")
+
+
+def _text_only(run, rpr_tag, t_tag) -> bool:
+    return all(child.tag in (rpr_tag, t_tag) for child in run) and \
+        sum(child.tag == t_tag for child in run) == 1
+
+
+def _merge_runs(root, run_tag, rpr_tag, t_tag) -> int:
+    """Merge adjacent text-only runs with identical formatting."""
+    merged = 0
+    for run in list(root.iter(run_tag)):
+        if run.getparent() is None or not _text_only(run, rpr_tag, t_tag):
+            continue
+        nxt = run.getnext()
+        while nxt is not None and nxt.tag == run_tag and \
+                _text_only(nxt, rpr_tag, t_tag) and _same_format(run, nxt, rpr_tag):
+            t, nt = run.find(t_tag), nxt.find(t_tag)
+            t.text = (t.text or "") + (nt.text or "")
+            run.getparent().remove(nxt)
+            merged += 1
+            nxt = run.getnext()
+        if t_tag == f"{{{_NS_W}}}t":
+            text = run.find(t_tag).text or ""
+            if text != text.strip():
+                run.find(t_tag).set(
+                    "{http://www.w3.org/XML/1998/namespace}space", "preserve")
+    return merged
+
+
+def _compact_drawingml(root) -> bool:
+    changed = False
+    for el in list(root.iter(*_EMPTY_DEFAULTS)):
+        if len(el) == 0 and not el.attrib and el.getparent() is not None:
+            el.getparent().remove(el)
+            changed = True
+    for attr, default in _DEFAULT_ATTRS:
+        for el in root.xpath(f"//*[@{attr}='{default}']"):
+            del el.attrib[attr]
+            changed = True
+    if _merge_runs(root, f"{{{_NS_A}}}r", f"{{{_NS_A}}}rPr", f"{{{_NS_A}}}t"):
+        changed = True
+    return changed
+
+
+def _compact_wordml(root) -> bool:
+    changed = False
+    for el in root.iter():
+        for attr in [a for a in el.attrib if _RSID.match(a)]:
+            del el.attrib[attr]
+            changed = True
+    for el in list(root.iter(f"{{{_NS_W}}}proofErr")):
+        el.getparent().remove(el)
+        changed = True
+    if _merge_runs(root, f"{{{_NS_W}}}r", f"{{{_NS_W}}}rPr", f"{{{_NS_W}}}t"):
+        changed = True
+    return changed
+
+
+def _compact(pkg: _Package) -> None:
+    for name in list(pkg.blobs):
+        if not _XML_PART.search(name) or name.endswith(".rels"):
+            continue
+        blob = pkg.blobs[name]
+        if name.startswith("word/"):
+            if b"w:rsid" not in blob and b"proofErr" not in blob and \
+                    b"<w:r>" not in blob and b"<w:r " not in blob:
+                continue
+            if _compact_wordml(pkg.tree(name)):
+                pkg.changed.add(name)
+        elif name.startswith("ppt/"):
+            if b"<a:" not in blob:
+                continue
+            if _compact_drawingml(pkg.tree(name)):
+                pkg.changed.add(name)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ENTRY POINTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _size(src) -> int:
+    if isinstance(src, (bytes, bytearray)):
+        return len(src)
+    if hasattr(src, "getbuffer"):
+        return src.getbuffer().nbytes
+    import os
+    return os.path.getsize(src)
+
+
+def optimize_package(src, dst=None, *, compression: str = "deflate",
+                     prune: bool = True, compact: bool = True) -> dict:
+    """Rewrite the .pptx / .docx *src* into *dst* (default: in place).
+
+    *src* may be a path, bytes or a binary file object. With *prune* and
+    *compact* off, only the compression changes.
+    """
+    import zipfile
+    start = time.perf_counter()
+    method, level = COMPRESSION[compression]
+    before = _size(src)
+    if isinstance(src, (bytes, bytearray)):
+        src = io.BytesIO(src)
+    with zipfile.ZipFile(src) as zin:
+        pkg = _Package(zin)
+    dst = dst if dst is not None else src
+
+    removed = 0
+    if prune:
+        _prune_layouts(pkg)
+        removed = _prune_unreachable(pkg)
+    if compact:
+        _compact(pkg)
+    pkg.serialize_changed()
+
+    if hasattr(dst, "seek"):
+        dst.seek(0)
+        dst.truncate()
+    with zipfile.ZipFile(dst, "w", method, compresslevel=level) as zout:
+        for name in pkg.names:
+            if name in pkg.blobs:
+                zout.writestr(name, pkg.blobs[name])
+    return {
+        "path": str(dst) if not hasattr(dst, "seek") else None,
+        "bytes_before": before,
+        "bytes_after": _size(dst),
+        "parts_removed": removed,
+        "compression": compression,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def save_presentation(prs, path, compression: str = "deflate"):
+    """prs.save(), but writing the zip at *compression*.
+
+    python-pptx always deflates at zlib's default level; this writes the
+    same parts in the same order with the compression chosen instead.
+    """
+    if compression == "deflate":
+        prs.save(str(path) if not hasattr(path, "write") else path)
+        return
+    import zipfile
+    from pptx.opc.oxml import serialize_part_xml
+    from pptx.opc.serialized import _ContentTypesItem
+
+    method, level = COMPRESSION[compression]
+    package = prs.part.package
+    parts = list(package.iter_parts())
+    with zipfile.ZipFile(path, "w", method, compresslevel=level) as zout:
+        zout.writestr("[Content_Types].xml",
+                      serialize_part_xml(_ContentTypesItem.xml_for(parts)))
+        zout.writestr("_rels/.rels", package._rels.xml)
+        for part in parts:
+            zout.writestr(part.partname.membername, part.blob)
+            if part._rels:
+                zout.writestr(part.partname.rels_uri.membername, part.rels.xml)
+
+
+def format_report(report: dict) -> str:
+    before, after = report["bytes_before"], report["bytes_after"]
+    change = 100 * (before - after) / before if before else 0.0
+    change = (f"{change:.1f}% smaller" if change >= 0
+              else f"{-change:.1f}% larger")
+    removed = (f", {report['parts_removed']} unused parts removed"
+               if report["parts_removed"] else "")
+    return (f"{before:,} -> {after:,} bytes ({change}, "
+            f"{report['compression']}{removed}) in {report['seconds']:.3f}s")
@@ -0,0 +1,238 @@
+"""
+Streaming .pptx writer that keeps one slide in memory at a time.
+
+python-pptx keeps every slide in memory until ``prs.save()``. PptxStreamWriter
+instead serializes each slide (and any media or chart parts it references)
+into the output zip as soon as it has been rendered, then detaches it from
+the presentation so it can be garbage collected. The presentation skeleton
+(masters, layouts, theme, presentation.xml with the slide list) is written
+last, once every slide's part name is known.
+
+Memory use is not quite flat: the slide list, the part names and content
+types for [Content_Types].xml, a hash per distinct picture and the zip's
+own directory entries grow by about 2 KB a slide (some 3.5 MB at 1,600
+slides), a small fraction of what python-pptx holds for the same deck.
+
+The zip is written beside the destination under a temporary name and
+moved into place by close(), so a run that fails part-way leaves no
+half-written .pptx (and an earlier file at the path untouched).
+
+Usage:
+    prs = new_presentation()
+    with PptxStreamWriter(path, prs) as writer:
+        for slide_data in slides:
+            slide = prs.slides.add_slide(prs.slide_layouts[6])
+            render(slide, slide_data)
+            writer.write_slide(slide)
+"""
+import hashlib
+import os
+import re
+import zipfile
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+
+_CT_RELS = "application/vnd.openxmlformats-package.relationships+xml"
+_CT_XML = "application/xml"
+_NS_CT = "http://schemas.openxmlformats.org/package/2006/content-types"
+_NS_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PML = "http://schemas.openxmlformats.org/presentationml/2006/main"
+
+_NUMBERED = re.compile(r"^(.*?)(\d*)(\.\w+)$")
+
+# Parts shared with the skeleton; a slide's relationship to them is kept,
+# but they are written once at close().
+_SKELETON_RELTYPES = {RT.SLIDE_LAYOUT, RT.SLIDE_MASTER, RT.NOTES_MASTER}
+
+
+def _rels_name(partname: str) -> str:
+    directory, _, name = partname.rpartition("/")
+    return f"{directory}/_rels/{name}.rels"
+
+
+class PptxStreamWriter:
+    def __init__(self, path, prs, compression=zipfile.ZIP_DEFLATED,
+                 compresslevel=None):
+        self._prs = prs
+        self._path = os.fspath(path)
+        directory, name = os.path.split(self._path)
+        self._tmp_path = os.path.join(directory, f".{name}.tmp")
+        self._zip = zipfile.ZipFile(self._tmp_path, "w", compression,
+                                    compresslevel=compresslevel)
+        self._content_types = {}      # partname -> content type, as written
+        # skeleton part names are written last but must never be reused
+        self._reserved = {p.partname for p in prs.part.package.iter_parts()}
+        self._media = {}              # sha1 of blob -> written partname
+        self._claimed = set()         # partnames given out by _free_name
+        self._next_free = {}          # (prefix, ext) -> next number to try
+        self._slides = []             # (sldId id, partname)
+        self._next_sld_id = 256
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    @property
+    def slide_count(self) -> int:
+        return len(self._slides)
+
+    # ── per slide ────────────────────────────────────────────────────────
+
+    def write_slide(self, slide):
+        """Write *slide* and its private parts, then drop it from the deck."""
+        slide_part = slide.part
+        partname = f"/ppt/slides/slide{len(self._slides) + 1}.xml"
+        slide_part.partname = PackURI(partname)
+
+        # Name every reachable private part before serializing, since
+        # relationship targets are computed from part names.
+        pending = []
+        self._claim_parts(slide_part, pending, seen=set())
+        for part in pending:
+            self._write_part(part)
+
+        self._slides.append((self._next_sld_id, partname))
+        self._next_sld_id += 1
+        self._detach(slide_part)
+
+    def _claim_parts(self, part, pending, seen):
+        if id(part) in seen:
+            return
+        seen.add(id(part))
+        pending.append(part)
+        for rel in part.rels.values():
+            if rel.is_external or rel.reltype in _SKELETON_RELTYPES:
+                continue
+            child = rel.target_part
+            if child.content_type.startswith("image/"):
+                digest = hashlib.sha1(child.blob).hexdigest()
+                if digest in self._media:
+                    # identical media already in the zip: point at it
+                    child.partname = PackURI(self._media[digest])
+                    seen.add(id(child))
+                    continue
+                child.partname = PackURI(self._free_name(child.partname))
+                self._media[digest] = child.partname
+            else:
+                child.partname = PackURI(self._free_name(child.partname))
+            self._claim_parts(child, pending, seen)
+
+    def _free_name(self, partname: str) -> str:
+        """An unused ``<prefix><n><ext>`` name in the zip for this pattern.
+
+        Each pattern keeps a counter, so numbering resumes where the last
+        name left off instead of rescanning from 1 for every part.
+        """
+        def taken(name):
+            return (name in self._claimed or name in self._content_types
+                    or name in self._reserved)
+
+        if not taken(partname):
+            self._claimed.add(partname)
+            return partname
+        prefix, _, ext = _NUMBERED.match(partname).groups()
+        n = self._next_free.get((prefix, ext), 1)
+        while taken(f"{prefix}{n}{ext}"):
+            n += 1
+        self._next_free[prefix, ext] = n + 1
+        name = f"{prefix}{n}{ext}"
+        self._claimed.add(name)
+        return name
+
+    def _write_part(self, part, rels_xml: bytes = None):
+        self._zip.writestr(part.partname[1:], part.blob)
+        self._content_types[part.partname] = part.content_type
+        if rels_xml is None and len(part.rels):
+            rels_xml = part.rels.xml
+        if rels_xml:
+            self._zip.writestr(_rels_name(part.partname)[1:], rels_xml)
+
+    def _detach(self, slide_part):
+        prs_part = self._prs.part
+        sld_id_lst = self._prs.element.sldIdLst
+        for sld_id in list(sld_id_lst):
+            if prs_part.related_part(sld_id.rId) is slide_part:
+                sld_id_lst.remove(sld_id)
+                prs_part.drop_rel(sld_id.rId)
+
+    # ── skeleton ─────────────────────────────────────────────────────────
+
+    def close(self):
+        """Write the skeleton and move the finished .pptx into place."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._write_skeleton()
+        except BaseException:
+            self.abort()
+            raise
+        os.replace(self._tmp_path, self._path)
+
+    def abort(self):
+        """Stop writing and delete the partial file."""
+        self._closed = True
+        try:
+            self._zip.close()
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.unlink(self._tmp_path)
+
+    def _write_skeleton(self):
+        prs_part = self._prs.part
+        package = prs_part.package
+
+        # presentation.xml: the slide list, with rIds that don't collide
+        # with the skeleton's own relationships
+        used = set(prs_part.rels.keys())
+        rels_root = etree.fromstring(prs_part.rels.xml)
+        sld_id_lst = self._prs.element.get_or_add_sldIdLst()
+        n = 1
+        for sld_id, partname in self._slides:
+            while f"rId{n}" in used:
+                n += 1
+            rid = f"rId{n}"
+            used.add(rid)
+            etree.SubElement(sld_id_lst, f"{{{_NS_PML}}}sldId",
+                             {"id": str(sld_id), f"{{{_NS_R}}}id": rid})
+            etree.SubElement(rels_root, f"{{{_NS_RELS}}}Relationship", {
+                "Id": rid, "Type": RT.SLIDE,
+                "Target": partname[len("/ppt/"):],
+            })
+        self._write_part(prs_part, etree.tostring(
+            rels_root, xml_declaration=True, encoding="UTF-8", standalone=True,
+        ))
+        for sld_id in list(sld_id_lst):
+            sld_id_lst.remove(sld_id)
+
+        for part in package.iter_parts():
+            if part is not prs_part:
+                self._write_part(part)
+        self._zip.writestr("_rels/.rels", package._rels.xml)
+
+        self._zip.writestr("[Content_Types].xml", self._content_types_xml())
+        self._zip.close()
+
+    def _content_types_xml(self) -> bytes:
+        root = etree.Element(f"{{{_NS_CT}}}Types", nsmap={None: _NS_CT})
+        etree.SubElement(root, f"{{{_NS_CT}}}Default",
+                         {"Extension": "rels", "ContentType": _CT_RELS})
+        etree.SubElement(root, f"{{{_NS_CT}}}Default",
+                         {"Extension": "xml", "ContentType": _CT_XML})
+        for partname, content_type in self._content_types.items():
+            etree.SubElement(root, f"{{{_NS_CT}}}Override", {
+                "PartName": partname, "ContentType": content_type,
+            })
+        return etree.tostring(root, xml_declaration=True, encoding="UTF-8",
+                              standalone=True)
+
@@ -0,0 +1,463 @@
+"""
+Direct OOXML emission for slide shapes.
+
+SlideXml is a drop-in target for the generate_deck.py renderers: instead of
+building each textbox, autoshape, table, chart frame and picture through
+python-pptx proxy objects, it formats pre-built ``p:sp`` / ``p:graphicFrame``
+/ ``p:pic`` string templates
+and attaches the whole shape tree to the slide with a single XML parse.
+
+The fragments reproduce python-pptx's own output (shape ids and names,
+EMU rounding, table row/column division), so a slide rendered through
+SlideXml is identical to one rendered through the object model —
+``generate_deck.py --verify-backend`` checks this slide by slide.
+"""
+import re
+
+from utils.themes import Color
+
+NSDECLS = (
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+
+EMU_PER_INCH = 914400
+EMU_PER_PT = 12700
+EMU_PER_CENTIPOINT = 127
+
+# prst geometry -> python-pptx shape basename (used for the shape name)
+SHAPE_NAMES = {
+    "rect": "Rectangle",
+    "roundRect": "Rounded Rectangle",
+    "ellipse": "Oval",
+    "diamond": "Diamond",
+}
+
+TABLE_STYLE_ID = "{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}"
+
+
+def emu(inches) -> int:
+    """Inches -> EMU, truncating exactly like pptx.util.Inches."""
+    return int(inches * EMU_PER_INCH)
+
+
+def font_sz(points) -> int:
+    """Points -> centipoints as stored in ``sz``, matching pptx.util.Pt."""
+    return int(points * EMU_PER_PT) // EMU_PER_CENTIPOINT
+
+
+def hex_color(color) -> str:
+    if isinstance(color, Color):
+        return color.hex
+    return "%02X%02X%02X" % tuple(color)
+
+
+def solid_fill(color) -> str:
+    """``a:solidFill`` of *color*; theme colours carry theirs prebuilt."""
+    if isinstance(color, Color):
+        return color.fill
+    return '<a:solidFill><a:srgbClr val="%s"/></a:solidFill>' % hex_color(color)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FRAGMENT TEMPLATES
+# ═══════════════════════════════════════════════════════════════════════════
+
+_XFRM = '<a:xfrm><a:off x="%d" y="%d"/><a:ext cx="%d" cy="%d"/></a:xfrm>'
+
+_TEXTBOX = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="%d" name="TextBox %d"/>'
+    '<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr>' + _XFRM + '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>'
+    '<a:noFill/></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="none"><a:spAutoFit/></a:bodyPr><a:lstStyle/>'
+    '<a:p>%s%s</a:p></p:txBody></p:sp>'
+)
+
+_AUTOSHAPE = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="%d" name="%s %d"/><p:cNvSpPr/><p:nvPr/>'
+    '</p:nvSpPr><p:spPr>' + _XFRM + '<a:prstGeom prst="%s"><a:avLst/>'
+    '</a:prstGeom>%s%s</p:spPr>'
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+    '<p:txBody><a:bodyPr rtlCol="0" anchor="ctr"/><a:lstStyle/>'
+    '<a:p><a:pPr algn="ctr"/></a:p></p:txBody></p:sp>'
+)
+
+_NO_LINE = '<a:ln><a:noFill/></a:ln>'
+
+_TABLE = (
+    '<p:graphicFrame><p:nvGraphicFramePr><p:cNvPr id="%d" name="Table %d"/>'
+    '<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr>'
+    '<p:nvPr/></p:nvGraphicFramePr>'
+    '<p:xfrm><a:off x="%d" y="%d"/><a:ext cx="%d" cy="%d"/></p:xfrm>'
+    '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table">'
+    '<a:tbl><a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>%s</a:tableStyleId>'
+    '</a:tblPr><a:tblGrid>%s</a:tblGrid>%s</a:tbl></a:graphicData></a:graphic>'
+    '</p:graphicFrame>'
+)
+
+_CHART = (
+    '<p:graphicFrame><p:nvGraphicFramePr><p:cNvPr id="%d" name="Chart %d"/>'
+    '<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr>'
+    '<p:nvPr/></p:nvGraphicFramePr>'
+    '<p:xfrm><a:off x="%d" y="%d"/><a:ext cx="%d" cy="%d"/></p:xfrm>'
+    '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/chart">'
+    '<c:chart xmlns:c="http://schemas.openxmlformats.org/drawingml/2006/chart" '
+    'r:id="%s"/></a:graphicData></a:graphic></p:graphicFrame>'
+)
+
+_PICTURE = (
+    '<p:pic><p:nvPicPr><p:cNvPr id="%d" name="Picture %d" descr="%s"/>'
+    '<p:cNvPicPr><a:picLocks noChangeAspect="1"/></p:cNvPicPr><p:nvPr/>'
+    '</p:nvPicPr><p:blipFill><a:blip r:embed="%s"/><a:stretch><a:fillRect/>'
+    '</a:stretch></p:blipFill><p:spPr>' + _XFRM + '<a:prstGeom prst="rect">'
+    '<a:avLst/></a:prstGeom></p:spPr></p:pic>'
+)
+
+# stands in for a chart's or picture's rId until apply() has created the
+# part it refers to
+_PART_RID = "\x00rId\x00"
+
+# Custom table style: the borders of the default Medium Style 2, with the
+# header row, banding and body text coloured by the caller.
+_STYLE_LINE = ('<a:ln w="%d" cmpd="sng"><a:solidFill><a:schemeClr val="lt1"/>'
+               '</a:solidFill></a:ln>')
+_STYLE_TEXT = ('<a:tcTxStyle%s><a:fontRef idx="minor"><a:prstClr val="black"/>'
+               '</a:fontRef><a:srgbClr val="%s"/></a:tcTxStyle>')
+_STYLE_FILL = '<a:fill>%s</a:fill>'
+_TABLE_STYLE = (
+    '<a:tblStyle styleId="%s" styleName="%s">'
+    '<a:wholeTbl>%s<a:tcStyle><a:tcBdr>'
+    + "".join("<a:%s>%s</a:%s>" % (side, _STYLE_LINE % 12700, side)
+              for side in ("left", "right", "top", "bottom", "insideH", "insideV"))
+    + '</a:tcBdr>%s</a:tcStyle></a:wholeTbl>'
+    '<a:band1H><a:tcStyle><a:tcBdr/>%s</a:tcStyle></a:band1H>'
+    '<a:band2H><a:tcStyle><a:tcBdr/>%s</a:tcStyle></a:band2H>'
+    '<a:firstRow>%s<a:tcStyle><a:tcBdr><a:bottom>' + _STYLE_LINE % 38100
+    + '</a:bottom></a:tcBdr>%s</a:tcStyle></a:firstRow>'
+    '</a:tblStyle>'
+)
+
+_TABLE_STYLES_PART = "/ppt/tableStyles.xml"
+
+_BG = '<p:bg><p:bgPr>%s<a:effectLst/></p:bgPr></p:bg>'
+
+_CSLD_OPEN = re.compile(r"<p:cSld(?:\s[^>]*)?>")
+
+_LINE_BREAK = re.compile("\n|\v")
+
+# Control characters XML can't hold (tab and newline can; vertical tab is a
+# line break by the time runs are built), which python-pptx writes into run
+# text as "_xHHHH_"
+_CONTROL = re.compile("[\x00-\x08\x0b-\x1f]")
+
+
+def _escape_control(match) -> str:
+    return "_x%04X_" % ord(match.group())
+
+
+def escape(text: str) -> str:
+    """Escape &, < and > for element text (as xml.sax.saxutils.escape)."""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def runs(text: str) -> str:
+    """``a:r``/``a:br`` sequence for *text*, as _Paragraph.text would build it.
+
+    Control characters are escaped as python-pptx escapes them.
+    """
+    out = []
+    for i, part in enumerate(_LINE_BREAK.split(text)):
+        if i:
+            out.append("<a:br/>")
+        if part:
+            out.append("<a:r><a:t>%s</a:t></a:r>"
+                       % escape(_CONTROL.sub(_escape_control, part)))
+    return "".join(out)
+
+
+def paragraph_props(size=None, bold=None, color=None, align=None) -> str:
+    """``a:pPr`` carrying paragraph-default run properties, or '' if none."""
+    if size is None and bold is None and color is None and align is None:
+        return ""
+    algn = ' algn="%s"' % align if align is not None else ""
+    if size is None and bold is None and color is None:
+        return "<a:pPr%s/>" % algn
+    attrs = ""
+    if size is not None:
+        attrs += ' sz="%d"' % font_sz(size)
+    if bold is not None:
+        attrs += ' b="%d"' % bool(bold)
+    if color is None:
+        rpr = "<a:defRPr%s/>" % attrs
+    else:
+        rpr = "<a:defRPr%s>%s</a:defRPr>" % (attrs, solid_fill(color))
+    return "<a:pPr%s>%s</a:pPr>" % (algn, rpr)
+
+
+def bullet_list_style(*, size, color, bullet_color, indent, hanging,
+                      space_after, char="\u2022", bullet_scale=150) -> str:
+    """``a:lstStyle`` making every paragraph of a text body a bullet item.
+
+    The text starts *indent* inches in and the *char* bullet *hanging*
+    inches to its left, coloured *bullet_color* at *bullet_scale* percent
+    of the text size. *space_after* is in points. Setting this once per
+    text box keeps the paragraphs themselves bare.
+    """
+    return (
+        '<a:lstStyle><a:lvl1pPr marL="%d" indent="%d" algn="l">'
+        '<a:spcAft><a:spcPts val="%d"/></a:spcAft>'
+        '<a:buClr><a:srgbClr val="%s"/></a:buClr><a:buSzPct val="%d"/>'
+        '<a:buFont typeface="Arial"/><a:buChar char="%s"/>'
+        '<a:defRPr sz="%d" b="0">%s</a:defRPr></a:lvl1pPr></a:lstStyle>'
+    ) % (emu(indent), -emu(hanging), round(space_after * 100),
+         hex_color(bullet_color), bullet_scale * 1000, escape(char),
+         font_sz(size), solid_fill(color))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SLIDE BUILDER
+# ═══════════════════════════════════════════════════════════════════════════
+
+class SlideXml:
+    """Collects shape XML for one freshly added (empty) slide."""
+
+    def __init__(self):
+        self._frags = []
+        self._next_id = 2   # id 1 is the slide's own spTree group
+        self._bg = None
+        self._parts = []    # (fragment index, add_part) awaiting an rId
+
+    def _take_id(self) -> int:
+        shape_id = self._next_id
+        self._next_id += 1
+        return shape_id
+
+    def set_bg(self, color):
+        self._bg = solid_fill(color)
+
+    def add_text(self, left, top, width, height, text, *,
+                 size=12, bold=False, color=None, align="l"):
+        shape_id = self._take_id()
+        self._frags.append(_TEXTBOX % (
+            shape_id, shape_id - 1,
+            emu(left), emu(top), emu(width), emu(height),
+            paragraph_props(size, bold, color, align), runs(text),
+        ))
+
+    def add_bullets(self, left, top, width, height, items, lst_style):
+        """One textbox holding every item as a paragraph under *lst_style*."""
+        shape_id = self._take_id()
+        self._frags.append(_TEXTBOX.replace("<a:lstStyle/>", lst_style) % (
+            shape_id, shape_id - 1,
+            emu(left), emu(top), emu(width), emu(height),
+            "", "</a:p><a:p>".join(runs(item) for item in items),
+        ))
+
+    def add_shape(self, prst, left, top, width, height, *,
+                  fill, line=None, line_width=None):
+        shape_id = self._take_id()
+        if line is None:
+            ln = _NO_LINE
+        else:
+            w = ' w="%d"' % int(line_width * EMU_PER_PT) if line_width else ""
+            ln = "<a:ln%s>%s</a:ln>" % (w, solid_fill(line))
+        self._frags.append(_AUTOSHAPE % (
+            shape_id, SHAPE_NAMES[prst], shape_id - 1,
+            emu(left), emu(top), emu(width), emu(height),
+            prst, solid_fill(fill), ln,
+        ))
+
+    def add_table(self, left, top, width, height, col_widths, rows, merges=(),
+                  style_id=TABLE_STYLE_ID):
+        """Add a table; see generate_deck._add_table for the cell format."""
+        shape_id = self._take_id()
+        n_rows = len(rows)
+        total_h = emu(height)
+        row_h = total_h // n_rows
+        grid_w = [emu(w) for w in col_widths]
+
+        # merge attributes exactly as _Cell.merge() assigns them
+        spans = {}
+        for (r0, c0), (r1, c1) in merges:
+            n_r, n_c = r1 - r0 + 1, c1 - c0 + 1
+            for r in range(r0, r1 + 1):
+                for c in range(c0, c1 + 1):
+                    attrs = ""
+                    if r == r0 and n_r > 1:
+                        attrs += ' rowSpan="%d"' % n_r
+                    if c == c0 and n_c > 1:
+                        attrs += ' gridSpan="%d"' % n_c
+                    if c > c0:
+                        attrs += ' hMerge="1"'
+                    if r > r0:
+                        attrs += ' vMerge="1"'
+                    spans[(r, c)] = attrs
+
+        fmt_cache = {}
+        trs = []
+        for r, row in enumerate(rows):
+            h = row_h if r < n_rows - 1 else total_h - (n_rows - 1) * row_h
+            tcs = []
+            for c, (text, fmt) in enumerate(row):
+                key = id(fmt)
+                if key not in fmt_cache:
+                    fmt_cache[key] = _cell_format(fmt)
+                ppr, tcpr = fmt_cache[key]
+                tcs.append(
+                    "<a:tc%s><a:txBody><a:bodyPr/><a:lstStyle/>%s</a:txBody>%s</a:tc>"
+                    % (spans.get((r, c), ""), _cell_paragraphs(text, ppr), tcpr)
+                )
+            trs.append('<a:tr h="%d">%s</a:tr>' % (h, "".join(tcs)))
+
+        self._frags.append(_TABLE % (
+            shape_id, shape_id - 1,
+            emu(left), emu(top), sum(grid_w), total_h,
+            style_id,
+            "".join('<a:gridCol w="%d"/>' % w for w in grid_w),
+            "".join(trs),
+        ))
+
+    def add_chart(self, left, top, width, height, add_part):
+        """Add a chart frame; see generate_deck._add_chart.
+
+        The chart itself is a separate part, so it can only be created once
+        there is a slide part to relate it to: ``add_part(slide_part)`` is
+        called from apply() and returns the relationship id.
+        """
+        shape_id = self._take_id()
+        self._parts.append((len(self._frags), add_part))
+        self._frags.append(_CHART % (
+            shape_id, shape_id - 1,
+            emu(left), emu(top), emu(width), emu(height), _PART_RID,
+        ))
+
+    def add_picture(self, left, top, width, height, descr, add_part):
+        """Add a picture; see generate_deck._add_picture.
+
+        Like a chart, the image is a part of its own: ``add_part(slide_part)``
+        is called from apply() and returns the relationship id.
+        """
+        shape_id = self._take_id()
+        self._parts.append((len(self._frags), add_part))
+        self._frags.append(_PICTURE % (
+            shape_id, shape_id - 1, escape(descr), _PART_RID,
+            emu(left), emu(top), emu(width), emu(height),
+        ))
+
+    # ── output ───────────────────────────────────────────────────────────
+
+    def shapes_xml(self) -> str:
+        return "".join(self._frags)
+
+    def apply(self, slide):
+        """Attach the collected background and shapes to a python-pptx slide.
+
+        The slide is re-serialized with the new XML spliced in and parsed
+        once (see replace_slide_element), so use the returned slide object
+        from here on; the one passed in no longer reflects the part.
+        """
+        if self._bg is None and not self._frags:
+            return slide
+        from lxml import etree
+        for index, add_part in self._parts:
+            self._frags[index] = self._frags[index].replace(
+                _PART_RID, add_part(slide.part))
+        self._parts = []
+        csld = slide.element.cSld
+        if self._bg is not None and csld.bg is not None:
+            csld.remove(csld.bg)
+        xml = etree.tostring(slide.element, encoding="unicode")
+        if self._bg is not None:
+            xml = _CSLD_OPEN.sub(lambda m: m.group(0) + _BG % self._bg, xml,
+                                 count=1)
+        if self._frags:
+            head, sep, tail = xml.rpartition("</p:spTree>")
+            xml = head + self.shapes_xml() + sep + tail
+        return replace_slide_element(slide, etree.fromstring(xml, _parser()))
+
+
+def replace_slide_element(slide, sld):
+    """Make *sld* the root element of *slide*'s part; return the new Slide.
+
+    Swapping the root is linear in slide size. Moving a large parsed
+    subtree into the existing slide document is not: lxml re-resolves the
+    namespaces each moved node inherited, which turns quadratic on big
+    tables.
+    """
+    part = slide.part
+    part._element = sld
+    part.__dict__.pop("slide", None)   # drop the cached Slide proxy
+    return part.slide
+
+
+def table_style(style_id, name, *, header_fill, header_text, body_text,
+                bands) -> str:
+    """``a:tblStyle`` for tables with ``firstRow`` and ``bandRow`` set.
+
+    The header row gets *header_fill* and bold *header_text*; other rows
+    alternate between the two *bands* fills, starting with ``bands[0]`` on
+    the first row after the header. Cells then only need the formatting a
+    table style can't express (font size, alignment, exceptions).
+    """
+    return _TABLE_STYLE % (
+        style_id, escape(name),
+        _STYLE_TEXT % ("", hex_color(body_text)),
+        _STYLE_FILL % solid_fill(bands[0]),
+        _STYLE_FILL % solid_fill(bands[0]),
+        _STYLE_FILL % solid_fill(bands[1]),
+        _STYLE_TEXT % (' b="on"', hex_color(header_text)),
+        _STYLE_FILL % solid_fill(header_fill),
+    )
+
+
+def set_table_styles(prs, styles):
+    """Replace the custom table styles in *prs* with *styles* (table_style()).
+
+    The default style (``def``) is kept, so tables referencing a built-in
+    style id are unaffected.
+    """
+    for part in prs.part.package.iter_parts():
+        if part.partname == _TABLE_STYLES_PART:
+            break
+    else:
+        raise ValueError("presentation has no %s part" % _TABLE_STYLES_PART)
+    part._blob = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+        '<a:tblStyleLst xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+        ' def="%s">%s</a:tblStyleLst>' % (TABLE_STYLE_ID, "".join(styles))
+    ).encode("utf-8")
+
+
+def _cell_format(fmt) -> tuple:
+    """(pPr, tcPr) fragments for a cell format dict, built once per format."""
+    fmt = fmt or {}
+    ppr = paragraph_props(fmt.get("size"), fmt.get("bold"),
+                          fmt.get("color"), fmt.get("align"))
+    fill = fmt.get("fill")
+    tcpr = "<a:tcPr>%s</a:tcPr>" % solid_fill(fill) if fill is not None else "<a:tcPr/>"
+    return ppr, tcpr
+
+
+def _cell_paragraphs(text, ppr) -> str:
+    if text is None:
+        return "<a:p>%s</a:p>" % ppr
+    lines = text.split("\n")
+    first = "<a:p>%s%s</a:p>" % (ppr, runs(lines[0]))
+    return first + "".join("<a:p>%s</a:p>" % runs(t) for t in lines[1:])
+
+
+_PARSER = None
+
+
+def _parser():
+    """python-pptx's oxml parser, so attached elements get its custom classes."""
+    global _PARSER
+    if _PARSER is None:
+        from pptx.oxml import oxml_parser
+        _PARSER = oxml_parser
+    return _PARSER
@@ -0,0 +1,114 @@
+"""
+On-disk, content-addressed cache of rendered slide XML.
+
+Entries are keyed by a hash of (slide dict, theme colours, renderer version)
+so an unchanged slide can be spliced straight back into a rebuilt deck
+instead of being re-rendered. The cache is capped in bytes and evicts the
+least recently used entries (by file mtime, refreshed on every hit).
+
+Used by generate_deck.py via --cache; safe to share between processes.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _jsonable(value):
+    """Fallback for json.dumps: colours and other values hash by str()."""
+    return str(value)
+
+
+class SlideCache:
+    def __init__(self, root, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._size = sum(e.stat().st_size for e in self._entries())
+
+    # ── keys ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def key(slide_data: dict, theme: dict, version: str) -> str:
+        payload = json.dumps(
+            [slide_data, theme, version],
+            sort_keys=True, separators=(",", ":"), default=_jsonable,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.xml"
+
+    def _entries(self):
+        for sub in self.root.iterdir():
+            if sub.is_dir():
+                yield from (e for e in os.scandir(sub) if e.name.endswith(".xml"))
+
+    # ── get / put ────────────────────────────────────────────────────────
+
+    def get(self, key: str):
+        """Return cached slide XML bytes, or None on a miss."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass  # evicted by another process between read and touch
+        self.hits += 1
+        return data
+
+    def put(self, key: str, xml: bytes):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(xml)
+        os.replace(tmp, path)  # atomic, so concurrent readers never see partial XML
+        self.stores += 1
+        self._size += len(xml)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until under 90% of the cap."""
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        self._size = sum(e.stat().st_size for e in entries)
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if self._size <= target:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    # ── reporting ────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "bytes": self._size,
+        }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"Slide cache: {s['hits']} hits, {s['misses']} misses "
+                f"({s['hit_rate']:.0%} hit rate), {s['evictions']} evicted, "
+                f"{s['bytes'] / 1e6:.1f} MB on disk")
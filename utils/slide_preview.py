@@ -0,0 +1,729 @@
+"""
+Slide thumbnails and contact sheets, drawn without an office suite.
+
+render_previews() reads a saved .pptx and rasterizes every slide to a PNG
+with Pillow. It draws what the renderers emit: the solid background,
+rectangles, rounded rectangles, ovals and diamonds with their fills and
+outlines, pictures, text boxes (bullets included) and tables coloured by
+their table style. Charts are drawn as an outlined frame.
+
+Text is laid out with the Calibri metrics in utils/text_metrics.py, so
+lines break and align where PowerPoint puts them, then drawn in the
+closest font installed (Carlito, Calibri, else DejaVu Sans), narrowed to
+Calibri's width where it runs wider. Shapes are drawn at twice the
+thumbnail size and downsampled, for smooth edges.
+
+Slides are drawn on a process pool; contact_sheet() tiles the thumbnails
+into one numbered overview image, and save_previews() writes both.
+
+Used by generate_deck.py --preview. On an existing deck:
+
+    python3 -m utils.slide_preview output/Example_Deck_dark.pptx
+"""
+import io
+import os
+import posixpath
+import re
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+
+from utils.text_metrics import text_width
+
+DEFAULT_WIDTH = 480          # thumbnail width in pixels
+SUPERSAMPLE = 2              # drawn at this multiple, then downsampled
+PARALLEL_MIN_SLIDES = 8      # fewer slides are drawn in-process
+PNG_COMPRESSION = 1          # zlib level: previews favour speed over size
+
+EMU_PER_INCH = 914400
+EMU_PER_POINT = 12700
+LINE_HEIGHT = 1.2            # single line spacing, as a multiple of the size
+
+# Defaults of a:bodyPr and a:tcPr insets, in EMU
+_INSET_X = 91440
+_INSET_Y = 45720
+
+_NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+}
+_A = "{%s}" % _NS["a"]
+_P = "{%s}" % _NS["p"]
+_R_EMBED = "{%s}embed" % _NS["r"]
+_NS_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_RT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+
+# Scheme colour aliases used by the colour map of the default master
+_SCHEME_ALIASES = {"tx1": "dk1", "bg1": "lt1", "tx2": "dk2", "bg2": "lt2"}
+_PRESET_COLORS = {"black": (0, 0, 0), "white": (255, 255, 255)}
+
+_CHART_FRAME = (148, 163, 184)
+_SHEET_BG = (229, 231, 235)
+_SHEET_LABEL = (71, 85, 105)
+
+# Tried in order; Carlito has Calibri's metrics
+_FONT_FILES = {
+    False: ("Carlito-Regular.ttf", "calibri.ttf", "DejaVuSans.ttf",
+            "Arial.ttf"),
+    True: ("Carlito-Bold.ttf", "calibrib.ttf", "DejaVuSans-Bold.ttf",
+           "Arial Bold.ttf"),
+}
+
+_WORDS = re.compile(r"\S+\s*|\s+")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# READING THE PACKAGE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _rels(zin, name: str) -> dict:
+    """rId -> (type, target part name) for the part *name*."""
+    from lxml import etree
+    directory, base = posixpath.split(name)
+    rels_name = posixpath.join(directory, "_rels", base + ".rels")
+    if rels_name not in zin.namelist():
+        return {}
+    out = {}
+    for rel in etree.fromstring(zin.read(rels_name)):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target")
+        target = target[1:] if target.startswith("/") else posixpath.normpath(
+            posixpath.join(directory, target))
+        out[rel.get("Id")] = (rel.get("Type"), target)
+    return out
+
+
+def _color(el, scheme):
+    """The colour given by a colour element among *el*'s children, or None."""
+    if el is None:
+        return None
+    for child in el:
+        tag = child.tag
+        if tag == _A + "srgbClr":
+            return tuple(bytes.fromhex(child.get("val")))
+        if tag == _A + "schemeClr":
+            val = child.get("val")
+            return scheme.get(_SCHEME_ALIASES.get(val, val))
+        if tag == _A + "sysClr":
+            return tuple(bytes.fromhex(child.get("lastClr", "000000")))
+        if tag == _A + "prstClr":
+            return _PRESET_COLORS.get(child.get("val"))
+    return None
+
+
+def _fill(parent, scheme, default=None):
+    """Fill colour of a spPr / tcPr / bgPr: a colour, None for no fill, or
+    *default* when the element doesn't say."""
+    if parent is None:
+        return default
+    if parent.find(_A + "noFill") is not None:
+        return None
+    solid = parent.find(_A + "solidFill")
+    return _color(solid, scheme) if solid is not None else default
+
+
+def _line(ln, scheme, default=None):
+    """``(colour, width in EMU)`` of an a:ln (or table border), or None.
+
+    *default* is the colour of a line that names none itself.
+    """
+    if ln is None:
+        return None
+    color = _fill(ln, scheme, default=default)
+    if color is None:
+        return None
+    return color, int(ln.get("w", EMU_PER_POINT))
+
+
+def _read_scheme(zin, master: str) -> dict:
+    from lxml import etree
+    for kind, target in _rels(zin, master).values():
+        if kind == _RT + "theme":
+            scheme = etree.fromstring(zin.read(target)).find(
+                ".//a:clrScheme", _NS)
+            if scheme is None:
+                break
+            return {etree.QName(el).localname: _color(el, {}) for el in scheme}
+    return {"dk1": (0, 0, 0), "lt1": (255, 255, 255)}
+
+
+def _read_table_styles(zin, scheme) -> dict:
+    """styleId -> {part name: {"fill", "text", "bold", "borders"}}."""
+    from lxml import etree
+    if "ppt/tableStyles.xml" not in zin.namelist():
+        return {}
+    styles = {}
+    for style in etree.fromstring(zin.read("ppt/tableStyles.xml")):
+        parts = {}
+        for part in style:
+            text = part.find(_A + "tcTxStyle")
+            borders = part.find(f"{_A}tcStyle/{_A}tcBdr")
+            parts[etree.QName(part).localname] = {
+                "fill": _fill(part.find(f"{_A}tcStyle/{_A}fill"), scheme),
+                "text": _color(text, scheme),
+                "bold": text is not None and text.get("b") == "on",
+                "borders": {
+                    etree.QName(side).localname: _line(side.find(_A + "ln"),
+                                                       scheme)
+                    for side in (borders if borders is not None else ())
+                },
+            }
+        styles[style.get("styleId")] = parts
+    return styles
+
+
+def _read_deck(zin) -> tuple:
+    """``(context, slides)`` of an open .pptx zip.
+
+    *context* holds what every slide needs (slide size, colour scheme,
+    table styles); each slide is ``(xml, {rId: image bytes})``.
+    """
+    from lxml import etree
+    presentation = "ppt/presentation.xml"
+    root = etree.fromstring(zin.read(presentation))
+    size = root.find("p:sldSz", _NS)
+    rels = _rels(zin, presentation)
+    masters = [t for kind, t in rels.values() if kind == _RT + "slideMaster"]
+    scheme = _read_scheme(zin, masters[0]) if masters else {}
+    context = {
+        "size": (int(size.get("cx")), int(size.get("cy"))),
+        "scheme": scheme,
+        "table_styles": _read_table_styles(zin, scheme),
+    }
+    slides = []
+    for entry in root.iterfind("p:sldIdLst/p:sldId", _NS):
+        name = rels[entry.get("{%s}id" % _NS["r"])][1]
+        images = {rid: zin.read(target)
+                  for rid, (kind, target) in _rels(zin, name).items()
+                  if kind == _RT + "image"}
+        slides.append((zin.read(name), images))
+    return context, slides
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TEXT
+# ═══════════════════════════════════════════════════════════════════════════
+
+@lru_cache(maxsize=None)
+def _font_path(bold: bool):
+    from PIL import ImageFont
+    for name in _FONT_FILES[bold]:
+        try:
+            return ImageFont.truetype(name, 10).path
+        except OSError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=256)
+def _font(bold: bool, px: int):
+    from PIL import ImageFont
+    path = _font_path(bold)
+    if path is None:
+        return ImageFont.load_default(px)
+    return ImageFont.truetype(path, px)
+
+
+def _int(el, attr, default):
+    value = None if el is None else el.get(attr)
+    return default if value is None else int(value)
+
+
+def _run_style(rpr, levels, style):
+    """Resolve size (points), bold and colour from a run's rPr, falling back
+    through *levels* (pPr/defRPr, lstStyle/lvl1pPr/defRPr) to *style*."""
+    size, bold, color = style["size"], style["bold"], style["color"]
+    for props in reversed((rpr, *levels)):
+        if props is None:
+            continue
+        size = _int(props, "sz", size * 100) / 100
+        if props.get("b") is not None:
+            bold = props.get("b") in ("1", "true", "on")
+        color = _fill(props, style["scheme"], default=color) or color
+    return size, bold, color
+
+
+def _paragraph_lines(p, lvl1, wrap_width, style) -> tuple:
+    """Lay out one a:p; returns ``(lines, pPr, defRPr levels)``.
+
+    Each line is ``[width, height, [(text, size, bold, color, width)]]``
+    in inches (sizes in points).
+    """
+    ppr = p.find(_A + "pPr")
+    levels = (None if ppr is None else ppr.find(_A + "defRPr"),
+              None if lvl1 is None else lvl1.find(_A + "defRPr"))
+    indent = _int(ppr, "marL", _int(lvl1, "marL", 0)) / EMU_PER_INCH
+    lines = [[0.0, 0.0, []]]
+    for child in p:
+        tag = child.tag
+        if tag == _A + "br":
+            size = _run_style(child.find(_A + "rPr"), levels, style)[0]
+            lines[-1][1] = max(lines[-1][1], size)
+            lines.append([0.0, 0.0, []])
+            continue
+        if tag not in (_A + "r", _A + "fld"):
+            continue
+        size, bold, color = _run_style(child.find(_A + "rPr"), levels, style)
+        text = child.findtext(_A + "t") or ""
+        for word in _WORDS.findall(text):
+            width = text_width(word, size, bold)
+            line = lines[-1]
+            if wrap_width is not None and line[2] and \
+                    line[0] + text_width(word.rstrip(), size, bold) > \
+                    wrap_width - indent:
+                line = [0.0, 0.0, []]
+                lines.append(line)
+                if not word.strip():
+                    continue
+            line[0] += width
+            line[1] = max(line[1], size)
+            line[2].append((word, size, bold, color, width))
+    end_size = _run_style(p.find(_A + "endParaRPr"), levels, style)[0]
+    for line in lines:
+        line[1] = line[1] or end_size
+    return lines, ppr, levels
+
+
+def _spacing(ppr, lvl1, tag) -> float:
+    """a:spcBef / a:spcAft of a paragraph, in points (spcPts only)."""
+    for props in (ppr, lvl1):
+        pts = None if props is None else props.find(f"{_A}{tag}/{_A}spcPts")
+        if pts is not None:
+            return int(pts.get("val")) / 100
+    return 0.0
+
+
+def _draw_text(draw, tx_body, box, style, scale, insets=None, anchor=None,
+               wrap=None):
+    """Draw the paragraphs of a text body into *box* (EMU) on *draw*."""
+    if tx_body is None:
+        return
+    body = tx_body.find(_A + "bodyPr")
+    lvl1 = tx_body.find(f"{_A}lstStyle/{_A}lvl1pPr")
+    left, top, width, height = box
+    if insets is None:
+        insets = (_int(body, "lIns", _INSET_X), _int(body, "tIns", _INSET_Y),
+                  _int(body, "rIns", _INSET_X), _int(body, "bIns", _INSET_Y))
+    anchor = anchor or (body.get("anchor") if body is not None else None) or "t"
+    if wrap is None:
+        wrap = body is None or body.get("wrap") != "none"
+    inner_w = (width - insets[0] - insets[2]) / EMU_PER_INCH
+
+    paragraphs, total = [], 0.0
+    for p in tx_body.iterfind(_A + "p"):
+        lines, ppr, levels = _paragraph_lines(
+            p, lvl1, inner_w if wrap else None, style)
+        before, after = _spacing(ppr, lvl1, "spcBef"), _spacing(ppr, lvl1, "spcAft")
+        paragraphs.append((lines, ppr, levels, before))
+        total += before + sum(line[1] * LINE_HEIGHT for line in lines) + after
+        paragraphs[-1] += (after,)
+    if not any(seg for lines, *_ in paragraphs for line in lines
+               for seg in line[2]):
+        return
+
+    px = scale * EMU_PER_POINT        # pixels per point
+    area_top = top + insets[1]
+    area_h = height - insets[1] - insets[3]
+    y = area_top * scale
+    if anchor == "ctr":
+        y += (area_h * scale - total * px) / 2
+    elif anchor == "b":
+        y += area_h * scale - total * px
+    x0 = (left + insets[0]) * scale
+    inner_px = inner_w * EMU_PER_INCH * scale
+
+    for lines, ppr, levels, before, after in paragraphs:
+        y += before * px
+        algn = (ppr.get("algn") if ppr is not None else None) or \
+            (lvl1.get("algn") if lvl1 is not None else None) or "l"
+        mar_l = _int(ppr, "marL", _int(lvl1, "marL", 0)) * scale
+        hang = _int(ppr, "indent", _int(lvl1, "indent", 0)) * scale
+        bullet = _bullet(ppr, lvl1, style["scheme"])
+        for i, (line_w, line_size, segments) in enumerate(lines):
+            line_px = line_w * EMU_PER_INCH * scale
+            if algn == "ctr":
+                x = x0 + mar_l + (inner_px - mar_l - line_px) / 2
+            elif algn == "r":
+                x = x0 + inner_px - line_px
+            else:
+                x = x0 + mar_l
+            baseline = y + line_size * px * (LINE_HEIGHT + 0.75) / 2
+            if i == 0 and bullet is not None and segments:
+                char, pct, color = bullet
+                size, _, text_color = _run_style(None, levels, style)
+                # a bullet larger than its text sits on the text's midline
+                _draw_string(draw, x0 + mar_l + hang,
+                             baseline + (pct - 1) * size * px * 0.3, char,
+                             _font(False, max(1, round(size * pct * px))),
+                             color or text_color)
+            _draw_line(draw, x, baseline, segments, line_px, px)
+            y += line_size * LINE_HEIGHT * px
+        y += after * px
+
+
+def _bullet(ppr, lvl1, scheme):
+    """``(char, size fraction, colour or None)`` of a bulleted paragraph."""
+    if ppr is not None and ppr.find(_A + "buNone") is not None:
+        return None
+    for props in (ppr, lvl1):
+        char = None if props is None else props.find(_A + "buChar")
+        if char is not None:
+            pct = props.find(_A + "buSzPct")
+            clr = props.find(_A + "buClr")
+            return (char.get("char"),
+                    _int(pct, "val", 100000) / 100000,
+                    _color(clr, scheme))
+    return None
+
+
+def _draw_line(draw, x, baseline, segments, width_px, px):
+    """Draw one line's segments from *x*, narrowed as a whole to *width_px*
+    (its Calibri width) where the installed font sets it wider."""
+    fonts = [_font(bold, max(1, round(size * px)))
+             for _, size, bold, _, _ in segments]
+    drawn = sum(font.getlength(seg[0]) for font, seg in zip(fonts, segments))
+    if drawn > width_px * 1.02:
+        fonts = [_font(bold, max(1, int(size * px * width_px / drawn)))
+                 for _, size, bold, _, _ in segments]
+    for font, (text, _, _, color, _) in zip(fonts, segments):
+        _draw_string(draw, x, baseline, text, font, color)
+        x += font.getlength(text)
+
+
+def _draw_string(draw, x, baseline, text, font, color):
+    """Draw *text* with its baseline at *baseline*."""
+    text = text.rstrip()
+    if text:
+        draw.text((x, baseline), text, fill=color or (0, 0, 0), font=font,
+                  anchor="ls")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SHAPES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _xfrm(el, tag):
+    xfrm = el.find(tag)
+    off, ext = xfrm.find(_A + "off"), xfrm.find(_A + "ext")
+    return (int(off.get("x")), int(off.get("y")),
+            int(ext.get("cx")), int(ext.get("cy")))
+
+
+def _style_ref(sp, name, scheme):
+    """Colour of the p:style reference *name* (lnRef, fillRef, fontRef)."""
+    ref = sp.find(f"{_P}style/{_A}{name}")
+    if ref is None or ref.get("idx") == "0":
+        return None
+    return _color(ref, scheme)
+
+
+def _draw_geometry(draw, prst, rect, fill, line, scale, adj=None):
+    x0, y0, x1, y1 = rect
+    outline, width = (None, 0) if line is None else \
+        (line[0], max(1, round(line[1] * scale)))
+    if prst == "roundRect":
+        radius = (adj if adj is not None else 16667) / 100000 * \
+            min(x1 - x0, y1 - y0)
+        draw.rounded_rectangle(rect, radius=radius, fill=fill,
+                               outline=outline, width=width)
+    elif prst == "ellipse":
+        draw.ellipse(rect, fill=fill, outline=outline, width=width)
+    elif prst == "diamond":
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        draw.polygon([(cx, y0), (x1, cy), (cx, y1), (x0, cy)], fill=fill,
+                     outline=outline, width=width)
+    else:
+        draw.rectangle(rect, fill=fill, outline=outline, width=width)
+
+
+def _draw_shape(draw, sp, ctx, scale):
+    scheme = ctx["scheme"]
+    sp_pr = sp.find(_P + "spPr")
+    left, top, width, height = _xfrm(sp_pr, _A + "xfrm")
+    geom = sp_pr.find(_A + "prstGeom")
+    prst = geom.get("prst") if geom is not None else "rect"
+    adj = geom.find(f"{_A}avLst/{_A}gd") if geom is not None else None
+    adj = int(adj.get("fmla").split()[-1]) if adj is not None else None
+    fill = _fill(sp_pr, scheme, default=_style_ref(sp, "fillRef", scheme))
+    ref = _style_ref(sp, "lnRef", scheme)
+    ln = sp_pr.find(_A + "ln")
+    if ln is not None:
+        line = _line(ln, scheme, default=ref)
+    else:
+        line = (ref, EMU_PER_POINT) if ref else None
+    rect = (left * scale, top * scale,
+            (left + width) * scale - 1, (top + height) * scale - 1)
+    if fill is not None or line is not None:
+        _draw_geometry(draw, prst, rect, fill, line, scale, adj)
+    style = {"size": 18, "bold": False, "scheme": scheme,
+             "color": _style_ref(sp, "fontRef", scheme) or scheme.get("dk1")}
+    _draw_text(draw, sp.find(_P + "txBody"), (left, top, width, height),
+               style, scale)
+
+
+def _draw_picture(image, pic, images, scale):
+    from PIL import Image
+    blip = pic.find(f"{_P}blipFill/{_A}blip")
+    data = images.get(blip.get(_R_EMBED)) if blip is not None else None
+    if data is None:
+        return
+    left, top, width, height = _xfrm(pic.find(_P + "spPr"), _A + "xfrm")
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    with Image.open(io.BytesIO(data)) as src:
+        src = src.convert("RGBA")
+        src.draft("RGBA", size)
+        picture = src.resize(size, Image.LANCZOS)
+    image.paste(picture, (round(left * scale), round(top * scale)), picture)
+
+
+def _draw_chart_frame(draw, frame, scale):
+    left, top, width, height = _xfrm(frame, _P + "xfrm")
+    draw.rectangle((left * scale, top * scale, (left + width) * scale - 1,
+                    (top + height) * scale - 1),
+                   outline=_CHART_FRAME,
+                   width=max(1, round(EMU_PER_POINT * scale)))
+    draw.text(((left + width / 2) * scale, (top + height / 2) * scale),
+              "chart", fill=_CHART_FRAME, anchor="mm",
+              font=_font(False, max(1, round(12 * EMU_PER_POINT * scale))))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TABLES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _cell_style(style: dict, row: int, header: bool, banded: bool) -> tuple:
+    """``(fill, text colour, bold, borders)`` the table style gives a cell."""
+    whole = style.get("wholeTbl", {})
+    fill, text, bold = whole.get("fill"), whole.get("text"), whole.get("bold")
+    borders = dict(whole.get("borders", {}))
+    if header and row == 0 and "firstRow" in style:
+        first = style["firstRow"]
+        fill = first["fill"] or fill
+        text = first["text"] or text
+        bold = first["bold"] or bold
+        borders.update((k, v) for k, v in first["borders"].items()
+                       if v is not None)
+    elif banded:
+        band = style.get("band1H" if (row - header) % 2 == 0 else "band2H")
+        if band is not None:
+            fill = band["fill"] or fill
+    return fill, text, bold, borders
+
+
+def _draw_table(draw, frame, ctx, scale):
+    scheme = ctx["scheme"]
+    left, top, _, _ = _xfrm(frame, _P + "xfrm")
+    tbl = frame.find(f"{_A}graphic/{_A}graphicData/{_A}tbl")
+    tbl_pr = tbl.find(_A + "tblPr")
+    style = ctx["table_styles"].get(
+        tbl_pr.findtext(_A + "tableStyleId") if tbl_pr is not None else None,
+        {})
+    header = tbl_pr is not None and tbl_pr.get("firstRow") in ("1", "true")
+    banded = tbl_pr is not None and tbl_pr.get("bandRow") in ("1", "true")
+
+    xs = [left]
+    for col in tbl.iterfind(f"{_A}tblGrid/{_A}gridCol"):
+        xs.append(xs[-1] + int(col.get("w")))
+    rows = tbl.findall(_A + "tr")
+    ys = [top]
+    for tr in rows:
+        ys.append(ys[-1] + int(tr.get("h")))
+
+    cells, lines = [], []
+    for r, tr in enumerate(rows):
+        for c, tc in enumerate(tr.iterfind(_A + "tc")):
+            if tc.get("hMerge") or tc.get("vMerge"):
+                continue
+            c1 = min(c + _int(tc, "gridSpan", 1), len(xs) - 1)
+            r1 = min(r + _int(tc, "rowSpan", 1), len(ys) - 1)
+            fill, color, bold, borders = _cell_style(style, r, header, banded)
+            tc_pr = tc.find(_A + "tcPr")
+            fill = _fill(tc_pr, scheme, default=fill)
+            rect = (xs[c], ys[r], xs[c1] - xs[c], ys[r1] - ys[r])
+            if fill is not None:
+                draw.rectangle((rect[0] * scale, rect[1] * scale,
+                                (rect[0] + rect[2]) * scale - 1,
+                                (rect[1] + rect[3]) * scale - 1), fill=fill)
+            cells.append((tc, tc_pr, rect, color, bold))
+            sides = {
+                "lnL": borders.get("left" if c == 0 else "insideV"),
+                "lnR": borders.get("right" if c1 == len(xs) - 1 else "insideV"),
+                "lnT": borders.get("top" if r == 0 else "insideH"),
+                "lnB": borders.get("bottom" if r1 == len(ys) - 1 else "insideH"),
+            }
+            if header and r == 0 and "firstRow" in style:
+                sides["lnB"] = style["firstRow"]["borders"].get("bottom") \
+                    or sides["lnB"]
+            for tag, line in sides.items():
+                override = tc_pr.find(_A + tag) if tc_pr is not None else None
+                if override is not None:
+                    line = _line(override, scheme)
+                if line is not None:
+                    lines.append((tag, rect, line))
+
+    for tag, (x, y, w, h), (color, width) in lines:
+        x0, y0, x1, y1 = x * scale, y * scale, (x + w) * scale, (y + h) * scale
+        segment = {"lnL": (x0, y0, x0, y1), "lnR": (x1, y0, x1, y1),
+                   "lnT": (x0, y0, x1, y0), "lnB": (x0, y1, x1, y1)}[tag]
+        draw.line(segment, fill=color, width=max(1, round(width * scale)))
+
+    for tc, tc_pr, rect, color, bold in cells:
+        cell_style = {"size": 18, "bold": bool(bold), "scheme": scheme,
+                      "color": color or scheme.get("dk1")}
+        insets = (_int(tc_pr, "marL", _INSET_X), _int(tc_pr, "marT", _INSET_Y),
+                  _int(tc_pr, "marR", _INSET_X), _int(tc_pr, "marB", _INSET_Y))
+        _draw_text(draw, tc.find(_A + "txBody"), rect, cell_style, scale,
+                   insets=insets,
+                   anchor=tc_pr.get("anchor") if tc_pr is not None else None,
+                   wrap=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SLIDES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def draw_slide(xml: bytes, images: dict, ctx: dict,
+               width: int = DEFAULT_WIDTH) -> bytes:
+    """Rasterize one slide's XML to PNG bytes *width* pixels wide."""
+    from lxml import etree
+    from PIL import Image, ImageDraw
+
+    cx, cy = ctx["size"]
+    height = max(1, round(width * cy / cx))
+    scale = width * SUPERSAMPLE / cx          # pixels per EMU
+    root = etree.fromstring(xml)
+    csld = root.find("p:cSld", _NS)
+    bg = _fill(csld.find("p:bg/p:bgPr", _NS), ctx["scheme"],
+               default=ctx["scheme"].get("lt1")) or (255, 255, 255)
+    image = Image.new("RGB", (width * SUPERSAMPLE, height * SUPERSAMPLE), bg)
+    draw = ImageDraw.Draw(image)
+
+    for el in csld.find("p:spTree", _NS):
+        tag = el.tag
+        if tag == _P + "sp":
+            _draw_shape(draw, el, ctx, scale)
+        elif tag == _P + "pic":
+            _draw_picture(image, el, images, scale)
+        elif tag == _P + "graphicFrame":
+            data = el.find(f"{_A}graphic/{_A}graphicData")
+            if data is not None and data.find(_A + "tbl") is not None:
+                _draw_table(draw, el, ctx, scale)
+            else:
+                _draw_chart_frame(draw, el, scale)
+
+    image = image.reduce(SUPERSAMPLE)
+    out = io.BytesIO()
+    image.save(out, "PNG", compress_level=PNG_COMPRESSION)
+    return out.getvalue()
+
+
+_WORKER = {}
+
+
+def _init_worker(ctx, width):
+    _WORKER.update(ctx=ctx, width=width)
+
+
+def _draw_in_worker(slide) -> bytes:
+    xml, images = slide
+    return draw_slide(xml, images, _WORKER["ctx"], _WORKER["width"])
+
+
+def render_previews(src, width: int = DEFAULT_WIDTH,
+                    workers: int = None) -> list:
+    """PNG bytes for each slide of the .pptx *src* (a path, bytes or file).
+
+    Slides are drawn across *workers* processes (default: one per CPU);
+    decks under PARALLEL_MIN_SLIDES slides are drawn in-process, where
+    starting a pool would cost more than it saves.
+    """
+    if isinstance(src, (bytes, bytearray)):
+        src = io.BytesIO(src)
+    with zipfile.ZipFile(src) as zin:
+        ctx, slides = _read_deck(zin)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(slides) or 1))
+    if workers == 1 or len(slides) < PARALLEL_MIN_SLIDES:
+        return [draw_slide(xml, images, ctx, width) for xml, images in slides]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(ctx, width)) as pool:
+        return list(pool.map(_draw_in_worker, slides,
+                             chunksize=max(1, len(slides) // (workers * 4))))
+
+
+def contact_sheet(thumbnails, columns: int = 4, gap: int = 16):
+    """Tile PNG *thumbnails* into one numbered PIL image, *columns* across."""
+    from PIL import Image, ImageDraw
+    tiles = [Image.open(io.BytesIO(t)) for t in thumbnails]
+    if not tiles:
+        return Image.new("RGB", (gap * 2, gap * 2), _SHEET_BG)
+    tile_w = max(t.width for t in tiles)
+    tile_h = max(t.height for t in tiles)
+    label_h = max(12, tile_h // 12)
+    columns = max(1, min(columns, len(tiles)))
+    rows = -(-len(tiles) // columns)
+    sheet = Image.new("RGB", (gap + columns * (tile_w + gap),
+                              gap + rows * (tile_h + label_h + gap)), _SHEET_BG)
+    draw = ImageDraw.Draw(sheet)
+    font = _font(False, max(8, label_h * 3 // 4))
+    for i, tile in enumerate(tiles):
+        x = gap + (i % columns) * (tile_w + gap)
+        y = gap + (i // columns) * (tile_h + label_h + gap)
+        sheet.paste(tile, (x, y))
+        draw.text((x, y + tile_h + label_h - 2), str(i + 1), fill=_SHEET_LABEL,
+                  font=font, anchor="ls")
+    return sheet
+
+
+def save_previews(src, out_dir=None, width: int = DEFAULT_WIDTH,
+                  columns: int = 4, workers: int = None) -> tuple:
+    """Write ``slide001.png``, ... and ``contact.png`` for the deck at *src*.
+
+    *out_dir* defaults to ``<deck>_preview/`` beside the deck. Returns
+    ``(slide paths, contact sheet path)``.
+    """
+    src = Path(src)
+    out_dir = Path(out_dir) if out_dir else src.with_name(f"{src.stem}_preview")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    thumbnails = render_previews(src, width, workers)
+    paths = []
+    for i, png in enumerate(thumbnails, 1):
+        path = out_dir / f"slide{i:03d}.png"
+        path.write_bytes(png)
+        paths.append(path)
+    sheet = out_dir / "contact.png"
+    contact_sheet(thumbnails, columns).save(sheet,
+                                            compress_level=PNG_COMPRESSION)
+    return paths, sheet
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Draw PNG thumbnails and a contact sheet for .pptx decks"
+    )
+    parser.add_argument("decks", nargs="+", type=Path, metavar="DECK")
+    parser.add_argument("--out", type=Path, default=None, metavar="DIR",
+                        help="Output folder (default: <deck>_preview/ beside "
+                             "each deck)")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH,
+                        help="Thumbnail width in pixels (default: %(default)s)")
+    parser.add_argument("--columns", type=int, default=4,
+                        help="Contact sheet columns (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Drawing processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    for deck in args.decks:
+        start = time.perf_counter()
+        out = args.out / deck.stem if args.out and len(args.decks) > 1 \
+            else args.out
+        paths, sheet = save_previews(deck, out, args.width, args.columns,
+                                     args.workers)
+        print(f"{deck}: {len(paths)} slides -> {sheet.parent} "
+              f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Import-time report for the CLI entry points.
+
+Runs each command under ``python -X importtime`` and reports wall time and
+import time over a bare interpreter, plus the heaviest top-level imports.
+Commands that never render (``--help``, ``--check``) must not load
+python-pptx, python-docx or lxml; the report fails if one does, or if any
+command's import time exceeds the budget.
+
+Usage:
+    python3 utils/startup_report.py                  # default budget
+    python3 utils/startup_report.py --budget-ms 50 --top 10
+    python3 utils/startup_report.py --json output/startup.json
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Entry points exercised on paths that shouldn't render anything
+COMMANDS = [
+    ["generate_deck.py", "--help"],
+    ["generate_deck.py", "--check"],
+    ["generate_batch.py", "--help"],
+    ["generate_report.py", "--help"],
+    ["examples/generate_roadmap.py", "--help"],
+    ["examples/generate_dla_roadmap.py", "--help"],
+    ["examples/generate_vof_roadmap.py", "--help"],
+]
+
+HEAVY_MODULES = ("pptx", "docx", "lxml")
+
+DEFAULT_BUDGET_MS = 75
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+
+def _run(argv) -> tuple:
+    """Run one interpreter; return (wall seconds, parsed importtime rows)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            rows.append((name, len(indent) // 2, int(self_us), int(cum_us)))
+    return wall, rows
+
+
+def measure(argv, baseline: set, repeat: int = 3) -> dict:
+    """Best-of-*repeat* timings for one command, net of interpreter startup."""
+    best_wall, rows = min((_run(argv) for _ in range(repeat)),
+                          key=lambda r: r[0])
+    top = [(name, cum) for name, depth, _, cum in rows
+           if depth == 0 and name not in baseline]
+    loaded = {name.split(".")[0] for name, *_ in rows}
+    return {
+        "command": " ".join(argv),
+        "wall_ms": round(best_wall * 1000, 1),
+        "import_ms": round(sum(cum for _, cum in top) / 1000, 1),
+        "heaviest": [(name, round(cum / 1000, 1))
+                     for name, cum in sorted(top, key=lambda t: -t[1])],
+        "heavy_modules": sorted(loaded & set(HEAVY_MODULES)),
+    }
+
+
+def report(budget_ms: float = DEFAULT_BUDGET_MS, top: int = 5,
+           repeat: int = 3) -> tuple:
+    """Measure every command; return (results, ok)."""
+    base_wall, base_rows = min((_run(["-c", "pass"]) for _ in range(repeat)),
+                               key=lambda r: r[0])
+    baseline = {name for name, *_ in base_rows}
+
+    results = []
+    ok = True
+    print(f"Bare interpreter: {base_wall * 1000:.1f} ms wall "
+          f"(subtracted below)\n")
+    print(f"{'Wall':>8}  {'Imports':>8}  Command")
+    print("-" * 60)
+    for argv in COMMANDS:
+        r = measure(argv, baseline, repeat)
+        r["over_budget"] = r["import_ms"] > budget_ms
+        ok = ok and not r["over_budget"] and not r["heavy_modules"]
+        results.append(r)
+
+        net_wall = r["wall_ms"] - base_wall * 1000
+        flag = "  OVER BUDGET" if r["over_budget"] else ""
+        print(f"{net_wall:>6.1f}ms  {r['import_ms']:>6.1f}ms  "
+              f"{r['command']}{flag}")
+        if r["heavy_modules"]:
+            print(f"{'':>20}loads {', '.join(r['heavy_modules'])}")
+        for name, ms in r["heaviest"][:top]:
+            print(f"{'':>20}{ms:>6.1f}ms  {name}")
+    print("-" * 60)
+    print(f"Budget: {budget_ms:g} ms of imports per command — "
+          f"{'ok' if ok else 'FAILED'}")
+    return results, ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Report CLI import time against a cold-start budget"
+    )
+    parser.add_argument(
+        "--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+        help="Max import time per command in ms (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=5,
+        help="Heaviest imports to list per command (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Runs per command; the fastest is reported (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--json", type=Path, default=None,
+        help="Also write the results as JSON to this path",
+    )
+    args = parser.parse_args()
+
+    results, ok = report(args.budget_ms, args.top, args.repeat)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Report written to {args.json}")
+    sys.exit(0 if ok else 1)
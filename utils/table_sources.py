@@ -0,0 +1,248 @@
+"""
+Table rows read from data files instead of typed into the spec.
+
+A table slide may name a ``source`` in place of ``headers`` / ``rows``:
+
+    {"csv": "tracker.csv"}
+    {"sqlite": "app.db", "query": "SELECT name, owner, status FROM tasks"}
+    {"sqlite": "app.db", "table": "tasks"}
+    {"xlsx": "tracker.xlsx", "sheet": "Q3", "range": "A1:F5000"}
+    {"parquet": "events.parquet"}
+
+each with an optional ``columns`` list choosing which columns to show, in
+order (headers default to the column names). The first row of a CSV file
+or XLSX range is its header row.
+
+open_source() returns the headers and an iterator of rows. Rows are read
+as the iterator is consumed, a line, a fetchmany() batch or a Parquet
+record batch at a time, and only the chosen columns are kept: a SQLite
+table is queried for just those columns, and a Parquet file reads just
+their column chunks. generate_deck's paginator takes rows a page at a
+time, so memory stays flat however large the source. The file stays open
+until the iterator is used up or closed.
+
+Cells come back as display text: None is empty, whole floats lose their
+".0", and midnight datetimes show as dates.
+
+XLSX needs openpyxl and Parquet needs pyarrow. Each reader imports what
+it needs when a source of its kind is opened, so decks without sources
+load none of it. Used by generate_deck.py (table slides).
+"""
+from datetime import datetime
+from pathlib import Path
+
+SOURCE_KINDS = ("csv", "sqlite", "xlsx", "parquet")
+BATCH_ROWS = 1000    # rows per fetchmany() call or Parquet record batch
+
+# Keys each kind of source takes besides its path and "columns"
+_OPTIONS = {
+    "csv": ("delimiter",),
+    "sqlite": ("query", "table"),
+    "xlsx": ("sheet", "range"),
+    "parquet": (),
+}
+
+
+def source_problem(spec):
+    """What is wrong with a ``source`` spec, or None (a deck_spec check)."""
+    if not isinstance(spec, dict):
+        return f"expected a dict, got {type(spec).__name__}"
+    kinds = [kind for kind in SOURCE_KINDS if kind in spec]
+    if len(kinds) != 1:
+        return f"expected exactly one of {', '.join(SOURCE_KINDS)}"
+    kind = kinds[0]
+    for key, value in spec.items():
+        if key not in (kind, "columns", *_OPTIONS[kind]):
+            return f"unknown key '{key}' for a {kind} source"
+        if key == "columns":
+            if not isinstance(value, list) or \
+                    not all(isinstance(c, str) for c in value):
+                return "'columns': expected a list of column names"
+        elif not isinstance(value, str):
+            return f"'{key}': expected text, got {type(value).__name__}"
+    if kind == "sqlite" and ("query" in spec) == ("table" in spec):
+        return "a sqlite source takes one of 'query' or 'table'"
+    if kind == "csv" and len(spec.get("delimiter", ",")) != 1:
+        return "'delimiter': expected one character"
+    return None
+
+
+def open_source(spec: dict) -> tuple:
+    """(headers, rows) of a ``source`` spec; *rows* is a lazy iterator.
+
+    Raises ValueError if the file can't be read or lacks a chosen column.
+    """
+    problem = source_problem(spec)
+    if problem:
+        raise ValueError(f"table source: {problem}")
+    kind = next(kind for kind in SOURCE_KINDS if kind in spec)
+    reader = _READERS[kind](spec)
+    # each reader yields its headers first, having opened the file
+    try:
+        headers = next(reader)
+    except OSError as exc:
+        raise ValueError(f"table source '{spec[kind]}': {exc}") from None
+    return headers, _guarded(reader, spec[kind])
+
+
+def _guarded(rows, path):
+    """*rows*, with read errors part-way through reported as ValueError."""
+    try:
+        yield from rows
+    except OSError as exc:
+        raise ValueError(f"table source '{path}': {exc}") from None
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime) and value.time() == datetime.min.time():
+        return value.date().isoformat()
+    return str(value)
+
+
+def _pick(names, columns, path) -> list:
+    """Indices of *columns* (all when None) among the source's *names*."""
+    if columns is None:
+        return list(range(len(names)))
+    index = {name: i for i, name in enumerate(names)}
+    missing = [c for c in columns if c not in index]
+    if missing:
+        raise ValueError(f"table source '{path}': no column "
+                         f"'{missing[0]}' (has {', '.join(map(str, names))})")
+    return [index[c] for c in columns]
+
+
+# ── readers: generators yielding the headers, then each row ──────────────
+
+def _read_csv(spec):
+    import csv
+    path = spec["csv"]
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, delimiter=spec.get("delimiter", ","))
+        names = next(reader, [])
+        picks = _pick(names, spec.get("columns"), path)
+        yield [names[i] for i in picks]
+        for row in reader:
+            if row:
+                yield [row[i] if i < len(row) else "" for i in picks]
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _read_sqlite(spec):
+    import sqlite3
+    path = spec["sqlite"]
+    if not Path(path).is_file():
+        raise OSError(f"no such file: {path}")
+    columns = spec.get("columns")
+    if "table" in spec:
+        # only the chosen columns are read from the table
+        query = "SELECT {} FROM {}".format(
+            ", ".join(map(_quote, columns)) if columns else "*",
+            _quote(spec["table"]))
+        columns = None
+    else:
+        query = spec["query"]
+    db = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+    # only reads: ATTACH would open, and VACUUM INTO write, other files
+    reads = (sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ,
+             sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE)
+    db.set_authorizer(lambda action, *_: sqlite3.SQLITE_OK
+                      if action in reads else sqlite3.SQLITE_DENY)
+    try:
+        cursor = db.execute(query)
+        names = [d[0] for d in cursor.description]
+        picks = _pick(names, columns, path)
+        yield [names[i] for i in picks]
+        while True:
+            batch = cursor.fetchmany(BATCH_ROWS)
+            if not batch:
+                return
+            for row in batch:
+                yield [_cell(row[i]) for i in picks]
+    except sqlite3.Error as exc:
+        raise ValueError(f"table source '{path}': {exc}") from None
+    finally:
+        db.close()
+
+
+def _read_xlsx(spec):
+    path = spec["xlsx"]
+    try:
+        import openpyxl
+        from openpyxl.utils import range_boundaries
+    except ImportError:
+        raise ValueError("XLSX table sources need openpyxl "
+                         "(pip install openpyxl)") from None
+    # read-only mode streams rows from the sheet XML instead of loading it
+    try:
+        book = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    except OSError:
+        raise
+    except Exception as exc:   # not a workbook: zip and format errors
+        raise ValueError(f"table source '{path}': {exc}") from None
+    try:
+        if "sheet" in spec:
+            if spec["sheet"] not in book.sheetnames:
+                raise ValueError(f"table source '{path}': no sheet "
+                                 f"'{spec['sheet']}'")
+            sheet = book[spec["sheet"]]
+        else:
+            sheet = book.worksheets[0]
+        bounds = {}
+        if "range" in spec:
+            try:
+                min_col, min_row, max_col, max_row = \
+                    range_boundaries(spec["range"])
+            except ValueError:
+                raise ValueError(f"table source '{path}': bad range "
+                                 f"'{spec['range']}'") from None
+            bounds = dict(min_col=min_col, min_row=min_row,
+                          max_col=max_col, max_row=max_row)
+        rows = sheet.iter_rows(values_only=True, **bounds)
+        names = [_cell(v) for v in next(rows, ())]
+        picks = _pick(names, spec.get("columns"), path)
+        yield [names[i] for i in picks]
+        for row in rows:
+            if any(v is not None for v in row):
+                yield [_cell(row[i]) if i < len(row) else "" for i in picks]
+    finally:
+        book.close()
+
+
+def _read_parquet(spec):
+    path = spec["parquet"]
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet table sources need pyarrow "
+                         "(pip install pyarrow)") from None
+    try:
+        parquet = pq.ParquetFile(path)
+    except OSError:
+        raise
+    except Exception as exc:   # not a Parquet file: pyarrow's ArrowInvalid
+        raise ValueError(f"table source '{path}': {exc}") from None
+    with parquet:
+        names = parquet.schema_arrow.names
+        chosen = [names[i] for i in _pick(names, spec.get("columns"), path)]
+        yield chosen
+        # column projection: only the chosen columns' chunks are read
+        for batch in parquet.iter_batches(batch_size=BATCH_ROWS,
+                                          columns=chosen):
+            values = [batch.column(name).to_pylist() for name in chosen]
+            for row in zip(*values):
+                yield [_cell(v) for v in row]
+
+
+_READERS = {
+    "csv": _read_csv,
+    "sqlite": _read_sqlite,
+    "xlsx": _read_xlsx,
+    "parquet": _read_parquet,
+}
@@ -0,0 +1,175 @@
+"""
+Text measurement from precomputed glyph advances.
+
+Widths come from tables of Calibri's advance widths (regular and bold), in
+1000 units per em. Calibri is the theme font of the base template, so every
+text box, table cell and chart label in a generated deck uses it. Measuring
+a string is then a table lookup per character. Results are memoized, so
+repeated strings (table cells, phase names) cost a dict lookup. No font
+files or office application are needed.
+
+There is no kerning or shaping. Widths match PowerPoint to within a few
+percent for Latin text, which is enough to decide when text needs to shrink
+and how wide table columns should be. Characters missing from the tables
+count as an average glyph, or a full em for East Asian wide characters.
+
+Used by generate_deck.py for autoshrinking titles and metric text, for
+sizing table columns to their content and for counting the lines a table
+cell wraps to.
+"""
+import math
+import unicodedata
+from functools import lru_cache
+
+UNITS_PER_EM = 1000
+
+# Left and right inset of a text box or table cell, in inches (bIns/lIns
+# default 0.1in)
+TEXT_INSET = 0.1
+
+# Advance widths of U+0020 .. U+007E
+_CALIBRI = (
+    226, 326, 401, 498, 507, 715, 682, 221, 303, 303, 498, 498, 250, 306,
+    252, 386, 507, 507, 507, 507, 507, 507, 507, 507, 507, 507, 268, 268,
+    498, 498, 498, 463, 894, 579, 544, 533, 615, 488, 459, 631, 623, 252,
+    319, 520, 420, 855, 646, 662, 517, 673, 543, 459, 487, 642, 567, 890,
+    519, 487, 468, 307, 386, 307, 498, 498, 291, 479, 525, 423, 525, 498,
+    305, 471, 525, 230, 239, 455, 230, 799, 525, 527, 525, 525, 349, 391,
+    335, 525, 452, 715, 433, 453, 395, 314, 460, 314, 498,
+)
+
+_CALIBRI_BOLD = (
+    226, 326, 438, 498, 507, 729, 705, 233, 312, 312, 498, 498, 258, 306,
+    267, 430, 507, 507, 507, 507, 507, 507, 507, 507, 507, 507, 276, 276,
+    498, 498, 498, 463, 898, 606, 561, 529, 630, 488, 459, 637, 631, 267,
+    331, 547, 423, 874, 659, 676, 532, 686, 563, 473, 495, 653, 591, 906,
+    551, 520, 478, 325, 430, 325, 498, 498, 300, 494, 537, 418, 537, 503,
+    316, 474, 537, 246, 255, 480, 246, 813, 537, 538, 537, 537, 355, 399,
+    347, 537, 473, 745, 459, 474, 397, 344, 475, 344, 498,
+)
+
+# Punctuation the decks use outside ASCII; same advances in both weights
+_EXTRA = {
+    " ": 226,   # no-break space
+    "°": 342,   # degree
+    "·": 252,   # middle dot
+    "×": 498,   # multiplication sign
+    "–": 498,   # en dash
+    "—": 905,   # em dash
+    "‘": 250, "’": 250,
+    "“": 418, "”": 418,
+    "•": 498,   # bullet
+    "…": 750,   # ellipsis
+    "→": 1000,  # right arrow
+    "≤": 498, "≥": 498,
+}
+
+_AVERAGE = 500
+_WIDE = 1000
+
+FONTS = {
+    ("Calibri", False): _CALIBRI,
+    ("Calibri", True): _CALIBRI_BOLD,
+}
+DEFAULT_FONT = "Calibri"
+
+
+def _advance(ch: str, table) -> int:
+    code = ord(ch)
+    if 32 <= code <= 126:
+        return table[code - 32]
+    if ch in _EXTRA:
+        return _EXTRA[ch]
+    if unicodedata.east_asian_width(ch) in ("W", "F"):
+        return _WIDE
+    return _AVERAGE
+
+
+@lru_cache(maxsize=1 << 16)
+def em_width(text: str, bold: bool = False, font: str = DEFAULT_FONT) -> float:
+    """Width of the widest line of *text*, in ems."""
+    table = FONTS[font, bool(bold)]
+    widest = 0
+    for line in text.replace("\v", "\n").split("\n"):
+        widest = max(widest, sum(_advance(ch, table) for ch in line))
+    return widest / UNITS_PER_EM
+
+
+def text_width(text: str, size: float, bold: bool = False,
+               font: str = DEFAULT_FONT) -> float:
+    """Width of *text* at *size* points, in inches."""
+    return em_width(text, bold, font) * size / 72
+
+
+def fit_size(text: str, width: float, size: float, *, bold: bool = False,
+             min_size: float = 8, font: str = DEFAULT_FONT) -> float:
+    """Largest font size up to *size* at which *text* fits *width* inches.
+
+    Sizes step down in half points and stop at *min_size*; *size* itself
+    is returned unchanged whenever the text already fits.
+    """
+    em = em_width(text, bold, font)
+    if em * size / 72 <= width:
+        return size
+    fitted = int(width * 72 / em * 2) / 2
+    return max(min_size, min(size, fitted))
+
+
+def _line_count(text: str, width_em: float, bold: bool, font: str) -> int:
+    table = FONTS[font, bool(bold)]
+    limit = width_em * UNITS_PER_EM
+    space = _advance(" ", table)
+    lines = 0
+    for para in text.replace("\v", "\n").split("\n"):
+        lines += 1
+        used = 0
+        for word in para.rstrip(" ").split(" "):
+            w = sum(_advance(ch, table) for ch in word)
+            if used and used + space + w > limit:
+                lines += 1
+                used = 0
+            elif used:
+                used += space
+            if w > limit > 0:
+                # a word wider than the line breaks between characters
+                extra = math.ceil(w / limit) - 1
+                lines += extra
+                w -= extra * limit
+            used += w
+    return lines
+
+
+@lru_cache(maxsize=1 << 16)
+def line_count(text: str, size: float, width: float, bold: bool = False,
+               font: str = DEFAULT_FONT) -> int:
+    """Lines *text* at *size* points wraps to in *width* inches.
+
+    Lines break at spaces, as PowerPoint wraps them; a word longer than
+    the whole width breaks between characters.
+    """
+    if em_width(text, bold, font) * size / 72 <= width:
+        return text.count("\n") + text.count("\v") + 1
+    return _line_count(text, width * 72 / size, bold, font)
+
+
+def fit_columns(natural, total: float) -> list:
+    """Share *total* inches between columns wanting *natural* widths.
+
+    When everything fits, the spare width is shared in proportion to each
+    column's natural width. When it doesn't, narrow columns keep their
+    natural width and the widest ones are capped at a common width (and
+    wrap), so a single long column can't squeeze the others.
+    """
+    natural = [max(w, 1e-6) for w in natural]
+    need = sum(natural)
+    if need <= total:
+        return [w * total / need for w in natural]
+    remaining, count = total, len(natural)
+    cap = total / count
+    for w in sorted(natural):
+        if w > cap:
+            break
+        remaining -= w
+        count -= 1
+        cap = remaining / count if count else cap
+    return [min(w, cap) for w in natural]
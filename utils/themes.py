@@ -0,0 +1,172 @@
+"""
+Colour themes: loading, validation and precompiled colour fragments.
+
+A theme is a set of named colours (THEME_KEYS) plus ``bar_palette``, the
+colours that cycle across Gantt phases and metric cards. Themes live in
+``themes/`` as ``.json``, ``.toml`` or ``.yaml`` files named after the
+theme; colours are written ``"#0F172A"`` or ``[15, 23, 42]``. A theme may
+``"extends"`` another and list only the colours it changes, so a brand
+theme can be a handful of lines.
+
+Every theme is validated and compiled once, when it is loaded. Compiling
+turns each colour into a Color: still an ``(r, g, b)`` tuple, so
+renderers, python-pptx and the slide cache treat it as before, but
+carrying its hex string and its ``a:solidFill`` fragment ready-made. The
+XML backend copies those fragments into slides instead of formatting a
+fill for every shape.
+
+Used by generate_deck.py (THEMES, --theme-file) and utils/pptx_xml.py.
+"""
+import re
+from pathlib import Path
+
+THEME_KEYS = (
+    "slide_bg", "title_text", "subtitle_text", "body_text", "muted_text",
+    "header_bg", "header_text", "row_even", "row_odd", "card_bg",
+    "card_border", "accent", "divider", "bullet_color",
+)
+THEME_SUFFIXES = (".json", ".toml", ".yaml", ".yml")
+
+_HEX = re.compile(r"#?([0-9A-Fa-f]{6})")
+
+
+class Color(tuple):
+    """An ``(r, g, b)`` colour with its srgbClr hex and solid fill prebuilt."""
+
+    __slots__ = ()
+
+    def __new__(cls, r, g, b):
+        self = super().__new__(cls, (r, g, b))
+        _FRAGMENTS[self] = _fragments(self)
+        return self
+
+    @property
+    def hex(self) -> str:
+        return _FRAGMENTS[self][0]
+
+    @property
+    def fill(self) -> str:
+        """``<a:solidFill>`` of this colour."""
+        return _FRAGMENTS[self][1]
+
+
+# Color -> (hex, solidFill); tuples can't carry instance attributes, and a
+# colour shared by several theme keys is formatted once
+_FRAGMENTS = {}
+
+
+def _fragments(rgb) -> tuple:
+    cached = _FRAGMENTS.get(rgb)
+    if cached is not None:
+        return cached
+    hex_value = "%02X%02X%02X" % rgb
+    return hex_value, '<a:solidFill><a:srgbClr val="%s"/></a:solidFill>' % hex_value
+
+
+def to_color(value) -> Color:
+    """A Color from ``"#RRGGBB"``, ``"RRGGBB"`` or three 0-255 ints."""
+    if isinstance(value, Color):
+        return value
+    if isinstance(value, str):
+        match = _HEX.fullmatch(value.strip())
+        if match:
+            return Color(*bytes.fromhex(match.group(1)))
+    elif isinstance(value, (list, tuple)) and len(value) == 3 and all(
+            isinstance(v, int) and not isinstance(v, bool) and 0 <= v <= 255
+            for v in value):
+        return Color(*value)
+    raise ValueError(f"not a colour: {value!r} (use \"#RRGGBB\" or [r, g, b])")
+
+
+class Theme(dict):
+    """A validated theme: THEME_KEYS and ``bar_palette`` mapped to Colors."""
+
+    def __init__(self, name: str, colors: dict):
+        super().__init__(colors)
+        self.name = name
+
+
+def compile_theme(name: str, data: dict, base: dict = None) -> Theme:
+    """Validate *data* and compile it into a Theme.
+
+    Colours missing from *data* come from *base*, the theme it extends.
+    Raises ValueError naming every problem at once.
+    """
+    if isinstance(data, Theme) and base is None:
+        return data
+    if not isinstance(data, dict):
+        raise ValueError(f"theme '{name}': expected a dict of colours")
+    merged = dict(base or {})
+    merged.update((k, v) for k, v in data.items() if k != "extends")
+    problems = [f"missing '{k}'" for k in (*THEME_KEYS, "bar_palette")
+                if k not in merged]
+    problems += [f"unknown key '{k}'" for k in merged
+                 if k not in THEME_KEYS and k != "bar_palette"]
+    colors = {}
+    for key in THEME_KEYS:
+        if key in merged:
+            try:
+                colors[key] = to_color(merged[key])
+            except ValueError as exc:
+                problems.append(f"'{key}': {exc}")
+    palette = merged.get("bar_palette")
+    if palette is not None:
+        if isinstance(palette, (str, dict)) or not palette:
+            problems.append("'bar_palette' must be a non-empty list of colours")
+        else:
+            try:
+                colors["bar_palette"] = tuple(to_color(c) for c in palette)
+            except ValueError as exc:
+                problems.append(f"'bar_palette': {exc}")
+    if problems:
+        raise ValueError(f"theme '{name}': {'; '.join(problems)}")
+    return Theme(name, colors)
+
+
+def read_theme_file(path) -> dict:
+    """The raw colour dict in a theme file."""
+    from utils.deck_spec import read_data
+    data = read_data(path)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: a theme file holds a dict of colours")
+    return data
+
+
+def load_themes(paths, registry: dict) -> dict:
+    """Compile the theme files *paths* into *registry* (name -> Theme).
+
+    Directories are expanded to the theme files in them. A theme is named
+    by its ``"name"`` key or else its file stem, and may extend any theme
+    already in *registry* or loaded in the same call.
+    """
+    files = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files.extend(sorted(f for f in p.iterdir()
+                                if f.suffix.lower() in THEME_SUFFIXES))
+        else:
+            files.append(p)
+    pending = {}
+    for f in files:
+        data = read_theme_file(f)
+        pending[str(data.pop("name", f.stem))] = (f, data)
+
+    def resolve(name, chain=()):
+        if name in registry:
+            return registry[name]
+        if name not in pending:
+            raise ValueError(f"theme '{chain[-1]}' extends unknown theme '{name}'")
+        if name in chain:
+            raise ValueError(f"themes extend each other: {' -> '.join(chain + (name,))}")
+        path, data = pending[name]
+        base = data.get("extends")
+        base = resolve(base, chain + (name,)) if base else None
+        try:
+            registry[name] = compile_theme(name, data, base)
+        except ValueError as exc:
+            raise ValueError(f"{path}: {exc}") from None
+        return registry[name]
+
+    for name in pending:
+        resolve(name)
+    return registry